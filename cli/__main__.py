@@ -4,19 +4,36 @@ A sophisticated CLI tool for managing the Astro.js project with integrated MCP t
 """
 
 import os
+import sys
 from .ui.terminal import TerminalUI
 from .menus.main_menu import main_menu
 from .project.project_manager import ProjectManager
+from .project.sampling_profiler import SamplingProfiler, format_top
+from .headless import run_headless
 
 def main():
     """Main entry point."""
+    args = sys.argv[1:]
+    # `--profile` samples the interactive session (CPU time, so idle prompts don't count)
+    profiler = SamplingProfiler() if '--profile' in args else None
+    args = [arg for arg in args if arg != '--profile']
+    if args:
+        sys.exit(run_headless(['profile'] + args if profiler else args))
+
     ui = TerminalUI()
     project_manager = ProjectManager(os.getcwd())
+    if profiler:
+        profiler.start()
     try:
         main_menu(ui, project_manager)
     except Exception as e:
         ui.print_output(f"\n{ui.theme.COLORS['ERROR']}Error: {str(e)}{ui.theme.COLORS['ENDC']}")
     finally:
+        if profiler:
+            profiler.stop()
+            paths = profiler.save(os.getcwd(), 'session')
+            print('\n'.join(format_top(profiler)))
+            print(f"Profile written to {paths['speedscope']} and {paths['collapsed']}")
         ui.cleanup()
 
 if __name__ == "__main__":
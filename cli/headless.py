@@ -0,0 +1,52 @@
+"""Non-interactive commands, e.g. `python -m cli validate-compounds` from a git hook."""
+
+import os
+from typing import List, Optional
+
+from .project import (asset_cache, baselines, build_profiler, chunk_analyzer, compound_schema, html_auditor, load_tester,
+                      page_weight)
+from .project.sampling_profiler import SamplingProfiler, format_top
+
+
+def profile_main(argv: Optional[List[str]] = None) -> int:
+    """`profile [--wall] <command> [args...]`: run a headless command under the sampling profiler."""
+    argv = list(argv or [])
+    clock = 'cpu'
+    if argv and argv[0] == '--wall':
+        clock = 'wall'
+        argv = argv[1:]
+    command = HEADLESS_COMMANDS.get(argv[0]) if argv else None
+    if command is None or argv[0] == 'profile':
+        print(f"Usage: profile [--wall] <command> [args...]; commands: {', '.join(sorted(HEADLESS_COMMANDS))}")
+        return 2
+
+    with SamplingProfiler(clock=clock) as profiler:
+        code = command(argv[1:])
+    paths = profiler.save(os.getcwd(), argv[0])
+    print('\n'.join(format_top(profiler)))
+    print(f"Speedscope profile: {paths['speedscope']}")
+    print(f"Collapsed stacks: {paths['collapsed']}")
+    return code
+
+
+HEADLESS_COMMANDS = {
+    'validate-compounds': compound_schema.main,
+    'gc-asset-cache': asset_cache.gc_main,
+    'page-budget': page_weight.main,
+    'build-profile': build_profiler.main,
+    'code-splitting': chunk_analyzer.main,
+    'html-audit': html_auditor.main,
+    'load-test': load_tester.main,
+    'baseline': baselines.main,
+    'profile': profile_main,
+}
+
+
+def run_headless(argv) -> int:
+    """Run a headless command and return its exit code."""
+    command = HEADLESS_COMMANDS.get(argv[0])
+    if command is None:
+        print(f"Unknown command: {argv[0]}")
+        print(f"Available commands: {', '.join(sorted(HEADLESS_COMMANDS))}")
+        return 2
+    return command(argv[1:])
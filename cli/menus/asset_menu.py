@@ -61,6 +61,30 @@ class AssetMenu:
                 description="Generate optimized font variants for different browsers",
                 handler=self.optimize_fonts
             ),
+            MenuItem(
+                key="dimensions",
+                label="Image Dimensions Manifest",
+                description="Write image width/height for templates from file headers",
+                handler=self.write_dimensions_manifest
+            ),
+            MenuItem(
+                key="unused",
+                label="Find Unused Assets",
+                description="List images and fonts that no page, component or stylesheet references",
+                handler=self.find_unused_assets
+            ),
+            MenuItem(
+                key="duplicates",
+                label="Find Duplicate Images",
+                description="Cluster visually identical images by perceptual hash",
+                handler=self.find_duplicate_images
+            ),
+            MenuItem(
+                key="gc_cache",
+                label="Clean Asset Cache",
+                description="Remove stale entries and unreferenced outputs from .asset-cache",
+                handler=self.gc_cache
+            ),
             MenuItem(
                 key="analyze",
                 label="Analyze Assets",
@@ -98,15 +122,24 @@ class AssetMenu:
             return False
 
         self.ui.print_status("Optimizing images...")
-        optimized_count = 0
-        for image in assets['images']:
-            if self.asset_manager.optimize_image(image):
-                optimized_count += 1
-                self.ui.print_success(f"Optimized: {image}")
-            else:
-                self.ui.print_info(f"Skipped: {image} (already optimized)")
 
-        self.ui.print_success(f"Optimized {optimized_count} images")
+        def report(done, total, result):
+            self.ui.status_bar.set_progress(f"Optimizing images: {done}/{total}")
+
+        try:
+            summary = self.asset_manager.optimize_images_batch(assets['images'], progress=report)
+        finally:
+            self.ui.status_bar.end_progress()
+        for path, error in summary['failed']:
+            self.ui.print_error(f"Failed: {path} ({error})")
+
+        self.ui.print_success(
+            f"Optimized {summary['optimized']} images, skipped {summary['skipped']} "
+            f"({summary['cached']} already cached), "
+            f"saved {summary['bytes_saved'] / 1024:.1f}KB"
+        )
+        placeholders = sum(1 for result in summary['results'] if result.get('placeholder'))
+        self.ui.print_info(f"Placeholders for {placeholders} images written to src/data/image-placeholders.json")
         return True
 
     def convert_images(self) -> bool:
@@ -141,14 +174,13 @@ class AssetMenu:
         widths = [320, 640, 1024, 1920]  # Common responsive breakpoints
 
         self.ui.print_status("Generating responsive images...")
-        for image in assets['images']:
-            results = self.asset_manager.generate_responsive_images(image, widths)
-            if results:
-                self.ui.print_success(f"Generated variants for: {image}")
-                for width, path in results.items():
-                    self.ui.print_info(f"- {width}px: {path}")
-            else:
-                self.ui.print_error(f"Failed to generate variants for: {image}")
+        manifest = self.asset_manager.build_srcset_manifest(assets['images'], widths)
+        for source, error in manifest.pop('_errors', {}).items():
+            self.ui.print_error(f"Failed to generate variants for: {source} ({error})")
+        for source, entry in manifest.items():
+            self.ui.print_success(f"Generated variants for: {source}")
+            for format_name, srcset in entry['srcset'].items():
+                self.ui.print_info(f"- {format_name}: {srcset}")
 
         return True
 
@@ -159,16 +191,27 @@ class AssetMenu:
             self.ui.print_warning("No fonts found in project")
             return False
 
-        text = self.ui.get_input("Enter text for font subset (or leave empty for basic Latin)", required=False)
-        if not text:
-            text = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-
-        self.ui.print_status("Creating font subsets...")
-        for font in assets['fonts']:
-            if subset_path := self.asset_manager.subset_font(font, text):
-                self.ui.print_success(f"Created subset: {subset_path}")
-            else:
-                self.ui.print_error(f"Failed to create subset for: {font}")
+        text = self.ui.get_input("Enter text for font subset (or leave empty to scan site content)", required=False)
+        if text:
+            self.ui.print_status("Creating font subsets...")
+            for font in assets['fonts']:
+                if subset_path := self.asset_manager.subset_font(font, text):
+                    self.ui.print_success(f"Created subset: {subset_path}")
+                else:
+                    self.ui.print_error(f"Failed to create subset for: {font}")
+            return True
+
+        self.ui.print_status("Collecting used characters and subsetting fonts...")
+        for report in self.asset_manager.subset_fonts_for_site(assets['fonts']):
+            if report['error']:
+                self.ui.print_error(f"Failed to create subset for {report['font']}: {report['error']}")
+                continue
+            self.ui.print_success(
+                f"{report['font']}: {report['glyphs_before']} -> {report['glyphs_after']} glyphs")
+            for flavor, output in report['outputs'].items():
+                saved = 100 * (1 - output['bytes'] / report['original_bytes']) if report['original_bytes'] else 0
+                self.ui.print_info(f"- {flavor}: {report['original_bytes'] / 1024:.1f}KB -> "
+                                   f"{output['bytes'] / 1024:.1f}KB ({saved:.0f}% smaller) {output['path']}")
 
         return True
 
@@ -191,6 +234,59 @@ class AssetMenu:
 
         return True
 
+    def write_dimensions_manifest(self) -> bool:
+        """Write the image dimensions manifest."""
+        self.ui.print_status("Reading image headers...")
+        manifest = self.asset_manager.write_dimensions_manifest()
+        self.ui.print_success(f"Recorded dimensions for {len(manifest)} images")
+        return True
+
+    def find_unused_assets(self) -> bool:
+        """List assets that nothing references."""
+        self.ui.print_status("Indexing asset references...")
+        report = self.asset_manager.find_unused_assets()
+        if not report['unused']:
+            self.ui.print_success("Every image and font is referenced")
+        else:
+            self.ui.print_header("Unused Assets", f"{len(report['unused'])} files, "
+                                 f"{report['total_bytes'] / 1024:.1f}KB total")
+            for asset in report['unused']:
+                self.ui.print_info(f"- {asset['path']} ({asset['bytes'] / 1024:.1f}KB)")
+        if report['possibly_used']:
+            self.ui.print_warning(f"{len(report['possibly_used'])} assets match dynamic references and were kept:")
+            for path in report['possibly_used']:
+                self.ui.print_info(f"- {path}")
+        return True
+
+    def find_duplicate_images(self) -> bool:
+        """List clusters of near-duplicate images with a suggested copy to keep."""
+        self.ui.print_status("Hashing images...")
+        failed = []
+        clusters = self.asset_manager.find_duplicate_images(failed=failed)
+        for path, error in failed:
+            self.ui.print_error(f"Skipped unreadable image: {path} ({error})")
+        if not clusters:
+            self.ui.print_success("No duplicate images found")
+            return True
+
+        total = sum(cluster['reclaimable_bytes'] for cluster in clusters)
+        self.ui.print_header("Duplicate Images", f"{len(clusters)} groups, {total / 1024:.1f}KB reclaimable")
+        for cluster in clusters:
+            self.ui.print_success(f"Keep: {cluster['canonical']} ({cluster['width']}x{cluster['height']})")
+            for duplicate in cluster['duplicates']:
+                self.ui.print_info(f"- {duplicate['path']} ({duplicate['width']}x{duplicate['height']}, "
+                                   f"{duplicate['bytes'] / 1024:.1f}KB, distance {duplicate['distance']})")
+        return True
+
+    def gc_cache(self) -> bool:
+        """Garbage-collect the asset processing cache."""
+        stats = self.asset_manager.gc_asset_cache()
+        self.ui.print_success(
+            f"Removed {stats['entries']} cache entries and {stats['blobs']} blobs "
+            f"({stats['bytes_freed'] / 1024:.1f}KB freed)"
+        )
+        return True
+
     def analyze_assets(self) -> bool:
         """Display detailed asset metadata."""
         assets = self.asset_manager.scan_project_assets()
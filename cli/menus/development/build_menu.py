@@ -18,6 +18,13 @@ def show_build_submenu(ui) -> None:
                 icon='🏗️',
                 shortcut='b'
             ),
+            MenuItem(
+                key='profile',
+                label='Profile Build',
+                description='Build with per-phase and per-route timings, stored for trends',
+                icon='⏱️',
+                shortcut='p'
+            ),
             MenuItem(
                 key='clean',
                 label='Clean Build',
@@ -40,5 +47,7 @@ def show_build_submenu(ui) -> None:
             break
         elif choice == 'build':
             ui.project.run_npm_command('build')
+        elif choice == 'profile':
+            ui.project.profile_build()
         elif choice == 'clean':
             ui.project.run_npm_command('clean')
@@ -14,7 +14,7 @@ def show_performance_submenu(ui) -> None:
             MenuItem(
                 key='cpu',
                 label='CPU Profiling',
-                description='Profile CPU usage',
+                description='Profile the CPU hot paths of a CLI command',
                 icon='💻',
                 shortcut='c'
             ),
@@ -35,7 +35,7 @@ def show_performance_submenu(ui) -> None:
             MenuItem(
                 key='flamegraph',
                 label='Flame Graph',
-                description='Generate flame graph',
+                description='Write a speedscope/collapsed-stack flame graph of a CLI command',
                 icon='🔥',
                 shortcut='f'
             ),
@@ -62,15 +62,12 @@ def show_performance_submenu(ui) -> None:
             generate_flame_graph(ui)
 
 def run_cpu_profiling(ui) -> None:
-    """Run CPU profiling."""
-    try:
-        duration = int(ui.get_input("Profile duration (seconds)", required=True))
-        if ui.project.run_cpu_profiling(duration):
-            ui.status_bar.update("CPU profiling completed successfully", 3)
-        else:
-            ui.status_bar.update("CPU profiling failed", 3)
-    except ValueError:
-        ui.status_bar.update("Invalid duration", 3)
+    """Profile a CLI command."""
+    command = ui.get_input("Command to profile (e.g. page-budget, html-audit)", required=True)
+    if ui.project.run_cpu_profiling(command):
+        ui.status_bar.update("CPU profiling completed successfully", 3)
+    else:
+        ui.status_bar.update("CPU profiling failed", 3)
 
 def run_memory_analysis(ui) -> None:
     """Run memory usage analysis."""
@@ -91,12 +88,9 @@ def run_network_analysis(ui) -> None:
         ui.status_bar.update("Invalid duration", 3)
 
 def generate_flame_graph(ui) -> None:
-    """Generate CPU flame graph."""
-    try:
-        duration = int(ui.get_input("Profile duration (seconds)", required=True))
-        if ui.project.generate_flame_graph(duration):
-            ui.status_bar.update("Flame graph generated successfully", 3)
-        else:
-            ui.status_bar.update("Failed to generate flame graph", 3)
-    except ValueError:
-        ui.status_bar.update("Invalid duration", 3)
+    """Generate a flame graph of a CLI command."""
+    command = ui.get_input("Command to profile (e.g. page-budget, html-audit)", required=True)
+    if ui.project.generate_flame_graph(command):
+        ui.status_bar.update("Flame graph generated successfully", 3)
+    else:
+        ui.status_bar.update("Failed to generate flame graph", 3)
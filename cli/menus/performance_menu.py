@@ -2,6 +2,9 @@
 
 from typing import List
 from cli.models.menu_item import MenuItem
+from cli.project.baselines import format_comparison
+from cli.project.chunk_analyzer import format_report as format_chunk_report
+from cli.project.html_auditor import format_summary as format_audit_summary
 from cli.project.performance_manager import PerformanceManager
 
 class PerformanceMenu:
@@ -29,11 +32,26 @@ class PerformanceMenu:
                 "Detect performance regressions",
                 self._handle_regression_detection
             ),
+            MenuItem(
+                "Performance Baselines",
+                "Capture, promote and compare per-branch baselines",
+                self._handle_baselines
+            ),
             MenuItem(
                 "Image Optimization",
                 "Optimize images in the project",
                 self._handle_image_optimization
             ),
+            MenuItem(
+                "Page Weight Budgets",
+                "Check per-page transfer sizes against budgets",
+                self._handle_page_budgets
+            ),
+            MenuItem(
+                "HTML Performance Audit",
+                "Lint built pages for blocking resources, images and missing hints",
+                self._handle_html_audit
+            ),
             MenuItem(
                 "Code Splitting Analysis",
                 "Analyze and suggest code splitting opportunities",
@@ -46,7 +64,7 @@ class PerformanceMenu:
             ),
             MenuItem(
                 "CPU Profiling",
-                "Run CPU profiling for performance analysis",
+                "Sample the CLI's own hot paths while running a command",
                 self._handle_cpu_profiling
             ),
             MenuItem(
@@ -67,14 +85,30 @@ class PerformanceMenu:
         ]
 
     def _handle_real_time_monitoring(self) -> bool:
-        """Handle real-time monitoring menu item."""
-        try:
-            self.ui.status_bar.update("Starting real-time monitoring (Ctrl+C to stop)...", 1)
+        """Handle real-time monitoring menu item.
+
+        Starts the background sampler on first use; later visits show the
+        rolling statistics and offer to export or stop.
+        """
+        if not self.performance_manager.monitoring_active:
             return self.performance_manager.start_real_time_monitoring()
-        except KeyboardInterrupt:
+
+        summary = self.performance_manager.get_monitoring_summary()
+        lines = []
+        for metric, stats in summary['stats'].items():
+            unit = '%' if metric.endswith('_percent') else ' B/s'
+            lines.append(f"{metric:<15} {summary['sparklines'][metric]:<40} "
+                         f"min {stats['min']:.1f}{unit}  avg {stats['avg']:.1f}{unit}  p95 {stats['p95']:.1f}{unit}")
+        self.ui.display_list(f"Resource Usage ({summary['samples']} samples):", lines)
+
+        choice = self.ui.prompt("[e]xport CSV, [s]top monitoring, or Enter to keep running: ").strip().lower()
+        if choice == 'e':
+            path = self.ui.prompt("CSV path (default monitoring.csv): ").strip() or 'monitoring.csv'
+            return self.performance_manager.export_monitoring_csv(path) > 0
+        if choice == 's':
             self.performance_manager.stop_real_time_monitoring()
             self.ui.status_bar.update("Monitoring stopped", 1)
-            return True
+        return True
 
     def _handle_resource_tracking(self) -> bool:
         """Handle resource tracking menu item."""
@@ -84,17 +118,23 @@ class PerformanceMenu:
 
         metrics = self.performance_manager.track_resource_usage(process_name)
         if metrics:
-            self.ui.display_dict(metrics)
+            for tree in metrics['trees']:
+                self.ui.display_dict(tree)
             return True
         return False
 
     def _handle_regression_detection(self) -> bool:
         """Handle performance regression detection menu item."""
-        current_metrics = {
-            'response_time': float(self.ui.prompt("Enter current response time (ms): ")),
-            'memory_usage': float(self.ui.prompt("Enter current memory usage (MB): ")),
-            'cpu_usage': float(self.ui.prompt("Enter current CPU usage (%): "))
+        prompts = {
+            'response_time': "Enter response time samples (ms, comma-separated): ",
+            'memory_usage': "Enter memory usage samples (MB, comma-separated): ",
+            'cpu_usage': "Enter CPU usage samples (%, comma-separated): "
         }
+        current_metrics = {}
+        for metric, prompt in prompts.items():
+            values = [float(v) for v in self.ui.prompt(prompt).split(',') if v.strip()]
+            if values:
+                current_metrics[metric] = values
 
         regressions = self.performance_manager.detect_performance_regression(current_metrics)
         if regressions:
@@ -103,6 +143,32 @@ class PerformanceMenu:
             self.ui.status_bar.update("No performance regressions detected", 1)
         return True
 
+    def _handle_baselines(self) -> bool:
+        """Handle performance baselines menu item."""
+        choice = self.ui.prompt("[c]apture, [p]romote, compare [s]tored samples, [b]uild two refs side by side, "
+                                "or [m]igrate performance_baseline.json: ")
+        choice = choice.strip().lower()
+        if choice == 'c':
+            ref = self.ui.prompt("Ref to capture (blank for the working tree): ").strip()
+            result = self.performance_manager.capture_baseline(ref or None)
+            if result:
+                self.ui.display_dict({metric: f"{len(values)} runs" for metric, values in result['samples'].items()})
+            return bool(result)
+        if choice == 'p':
+            ref = self.ui.prompt("Ref to promote (default HEAD): ").strip() or 'HEAD'
+            branch = self.ui.prompt("Branch (blank for the current one): ").strip()
+            return self.performance_manager.promote_baseline(ref, branch or None)
+        if choice == 'm':
+            return self.performance_manager.migrate_legacy_baseline()
+        if choice in ('s', 'b'):
+            base = self.ui.prompt("Base ref (blank for this branch's baseline): ").strip()
+            head = self.ui.prompt("Head ref (default HEAD): ").strip() or 'HEAD'
+            comparison = self.performance_manager.compare_baselines(base or None, head, build=choice == 'b')
+            if comparison:
+                self.ui.display_list("Baseline Comparison:", format_comparison(comparison))
+            return bool(comparison)
+        return False
+
     def _handle_image_optimization(self) -> bool:
         """Handle image optimization menu item."""
         directory = self.ui.prompt("Enter directory path to optimize images: ")
@@ -114,25 +180,61 @@ class PerformanceMenu:
 
         return self.performance_manager.optimize_images(directory, quality)
 
+    def _handle_page_budgets(self) -> bool:
+        """Handle page weight budget menu item."""
+        budget = self.ui.prompt("Enter total compressed budget per page in KB (blank for configured): ")
+        budgets = {'total': float(budget)} if budget.replace('.', '', 1).isdigit() else None
+
+        report = self.performance_manager.check_page_budgets(budgets)
+        if not report:
+            return False
+
+        self.ui.display_list("Heaviest Pages:", [
+            f"{page['page']}: {page['compressed_bytes'] / 1024:.1f}KB {report['compression']}, "
+            f"{page['raw_bytes'] / 1024:.1f}KB raw, {page['requests']} requests"
+            for page in report['pages'][:10]
+        ])
+        over = [page for page in report['pages'] if page['over_budget']]
+        if over:
+            self.ui.display_list("Over Budget:", [
+                f"{page['page']}: " + ', '.join(f"{v['budget']} {v['actual_kb']}KB > {v['limit_kb']}KB"
+                                                 for v in page['over_budget'])
+                for page in over
+            ])
+        if report['changes']:
+            self.ui.display_list(f"Changes since {report['previous_commit'][:8]}:", [
+                f"{change['page']}: {change['delta'] / 1024:+.1f}KB" for change in report['changes'][:10]
+            ])
+        return True
+
+    def _handle_html_audit(self) -> bool:
+        """Handle HTML performance audit menu item."""
+        report = self.performance_manager.audit_html_performance()
+        if not report:
+            return False
+
+        self.ui.display_list("HTML Performance Audit:", format_audit_summary(report))
+        return True
+
     def _handle_code_splitting(self) -> bool:
         """Handle code splitting analysis menu item."""
-        build_stats = self.ui.prompt("Enter path to build stats file: ")
-        if not build_stats:
-            return False
+        build_stats = self.ui.prompt("Enter webpack stats file or project path (blank for the Vite build here): ")
 
-        analysis = self.performance_manager.analyze_code_splitting(build_stats)
-        if analysis:
+        analysis = self.performance_manager.analyze_code_splitting(build_stats or None)
+        if not analysis:
+            return False
+        if 'routes' not in analysis:
             self.ui.display_dict(analysis)
             return True
-        return False
+
+        self.ui.display_list("Code Splitting:", format_chunk_report(analysis))
+        return True
 
     def _handle_lazy_loading(self) -> bool:
         """Handle lazy loading suggestions menu item."""
-        source_dir = self.ui.prompt("Enter source directory path: ")
-        if not source_dir:
-            return False
+        source_dir = self.ui.prompt("Enter project path (blank for current directory): ")
 
-        suggestions = self.performance_manager.suggest_lazy_loading(source_dir)
+        suggestions = self.performance_manager.suggest_lazy_loading(source_dir or None)
         if suggestions:
             self.ui.display_list("Lazy Loading Suggestions:", suggestions)
             return True
@@ -140,10 +242,10 @@ class PerformanceMenu:
 
     def _handle_cpu_profiling(self) -> bool:
         """Handle CPU profiling menu item."""
-        duration = self.ui.prompt("Enter profiling duration in seconds: ")
-        if not duration.isdigit():
+        command = self.ui.prompt("Enter CLI command to profile (e.g. page-budget): ")
+        if not command:
             return False
-        return self.performance_manager.run_cpu_profiling(int(duration))
+        return self.performance_manager.run_cpu_profiling(command)
 
     def _handle_memory_analysis(self) -> bool:
         """Handle memory analysis menu item."""
@@ -40,6 +40,27 @@ def show_compound_menu(ui) -> None:
                 icon='🔄',
                 shortcut='g'
             ),
+            MenuItem(
+                key='interactions',
+                label='Interaction Graph',
+                description='Resolve interactions and export the adjacency map',
+                icon='🔗',
+                shortcut='i'
+            ),
+            MenuItem(
+                key='related',
+                label='Related Compounds',
+                description='Precompute related compounds into related.json',
+                icon='🧭',
+                shortcut='r'
+            ),
+            MenuItem(
+                key='layout',
+                label='Data Layout',
+                description='Switch between monolithic and per-compound data modules',
+                icon='🗂',
+                shortcut='l'
+            ),
             MenuItem(
                 key='back',
                 label='Back to Project Menu',
@@ -61,6 +82,12 @@ def show_compound_menu(ui) -> None:
             validate_compounds(ui)
         elif choice == 'generate':
             generate_compound_pages(ui)
+        elif choice == 'interactions':
+            show_interaction_graph(ui)
+        elif choice == 'related':
+            compute_related_compounds(ui)
+        elif choice == 'layout':
+            migrate_data_layout(ui)
 
 def create_compound(ui) -> None:
     """Interactive compound creation process."""
@@ -234,15 +261,14 @@ def validate_compounds(ui) -> None:
         return
 
     print("\nValidating compounds...")
-    has_errors = False
+    results = ui.project.validate_all_compounds()
+    has_errors = bool(results)
 
-    for compound in compounds:
-        errors = ui.project.validate_compound_data(compound)
-        if errors:
-            has_errors = True
-            print(f"\n{ui.theme.COLORS['ERROR']}Errors in {compound['name']}:{ui.theme.COLORS['ENDC']}")
-            for error in errors:
-                print(f"  - {error}")
+    for name, fields in results.items():
+        print(f"\n{ui.theme.COLORS['ERROR']}Errors in {name}:{ui.theme.COLORS['ENDC']}")
+        for field, messages in fields.items():
+            for message in messages:
+                print(f"  - {field}: {message}")
 
     if not has_errors:
         print(f"\n{ui.theme.COLORS['SUCCESS']}All compounds are valid!{ui.theme.COLORS['ENDC']}")
@@ -263,19 +289,70 @@ def generate_compound_pages(ui) -> None:
         return
 
     print("\nGenerating compound pages...")
-    success_count = 0
-    error_count = 0
-
-    for compound in compounds:
-        if ui.project.generate_compound_page(compound['name']):
-            success_count += 1
-        else:
-            error_count += 1
+    results = ui.project.generate_all_pages()
 
-    if error_count == 0:
-        print(f"\n{ui.theme.COLORS['SUCCESS']}Successfully generated {success_count} pages!{ui.theme.COLORS['ENDC']}")
+    summary = (f"{results['created']} created, {results['updated']} updated, "
+               f"{results['unchanged']} unchanged, {results['removed']} removed")
+    if results['failed'] == 0:
+        print(f"\n{ui.theme.COLORS['SUCCESS']}Pages generated: {summary}{ui.theme.COLORS['ENDC']}")
     else:
-        print(f"\n{ui.theme.COLORS['WARNING']}Generated {success_count} pages with {error_count} errors{ui.theme.COLORS['ENDC']}")
+        print(f"\n{ui.theme.COLORS['WARNING']}Pages generated: {summary}, {results['failed']} errors{ui.theme.COLORS['ENDC']}")
+
+    print(f"\n{ui.theme.COLORS['INFO']}Press Enter to continue...{ui.theme.COLORS['ENDC']}")
+    input()
+
+def show_interaction_graph(ui) -> None:
+    """Resolve compound interactions and export the adjacency map."""
+    ui.print_header(
+        "Interaction Graph",
+        "Resolve interactions between compounds"
+    )
+
+    graph = ui.project.build_interaction_graph()
+    if not graph['adjacency']:
+        ui.status_bar.update("No compounds found", 3)
+        return
+
+    print("\nResolved interactions:")
+    for slug, targets in graph['adjacency'].items():
+        print(f"  {slug}: {', '.join(targets) if targets else '-'}")
+
+    if graph['unresolved']:
+        print(f"\n{ui.theme.COLORS['WARNING']}Unresolved references:{ui.theme.COLORS['ENDC']}")
+        for slug, texts in graph['unresolved'].items():
+            for text in texts:
+                print(f"  - {slug}: {text}")
+
+    output_path = ui.project.export_interaction_map()
+    if output_path:
+        print(f"\n{ui.theme.COLORS['SUCCESS']}Exported interaction map to {output_path}{ui.theme.COLORS['ENDC']}")
 
     print(f"\n{ui.theme.COLORS['INFO']}Press Enter to continue...{ui.theme.COLORS['ENDC']}")
     input()
+
+def compute_related_compounds(ui) -> None:
+    """Precompute related compounds for compound pages."""
+    output_path = ui.project.compute_related_compounds()
+    if output_path:
+        ui.status_bar.update(f"Related compounds up to date: {output_path}", 3)
+    else:
+        ui.status_bar.update("Failed to compute related compounds", 3)
+
+def migrate_data_layout(ui) -> None:
+    """Migrate compound data between the monolithic and sharded layouts."""
+    ui.print_header(
+        "Data Layout",
+        "Monolithic compounds.ts or one module per compound"
+    )
+
+    current = ui.project.get_compound_layout()
+    target = 'monolithic' if current == 'sharded' else 'sharded'
+    print(f"\nCurrent layout: {current}")
+
+    if ui.get_input(f"Migrate to the {target} layout? (y/N)").lower() != 'y':
+        return
+
+    if ui.project.migrate_compound_layout(target):
+        ui.status_bar.update(f"Compound data now uses the {target} layout", 3)
+    else:
+        ui.status_bar.update("Layout migration failed", 3)
@@ -3,6 +3,7 @@
 import json
 from datetime import datetime
 from ..models.menu_item import MenuItem
+from ..project.load_tester import format_result as format_load_result
 
 def show_testing_menu(ui) -> None:
     """Testing menu implementation with submenus."""
@@ -353,7 +354,7 @@ def show_performance_submenu(ui) -> None:
             MenuItem(
                 key='load',
                 label='Load Testing',
-                description='Run k6 load tests',
+                description='Measure throughput and latency of the built site',
                 icon='⚡',
                 shortcut='k'
             ),
@@ -530,34 +531,31 @@ def run_lighthouse_audit(ui) -> None:
         ui.status_bar.update(f"Error running Lighthouse audit: {str(e)}", 3)
 
 def run_load_tests(ui) -> None:
-    """Run k6 load tests."""
+    """Load test the built site."""
     ui.print_header(
         "Load Testing",
-        "k6 Load Tests"
+        "HTTP Load Test of the Built Site"
     )
 
-    tests = ui.project.get_load_tests()
-    if not tests:
-        ui.status_bar.update("No load tests found", 3)
-        return
-
-    print("\nAvailable Load Tests:")
-    for i, test in enumerate(tests, 1):
-        print(f"{i}. {test}")
-
     try:
-        selection = int(ui.get_input("\nSelect test number", required=True))
-        if selection > 0 and selection <= len(tests):
-            test = tests[selection-1]
-            vus = int(ui.get_input("Number of virtual users", required=True))
-            duration = ui.get_input("Test duration (e.g., 30s, 1m)", required=True)
+        target = ui.get_input("Target URL, 'preview', or blank to serve dist/", required=False) or None
+        concurrency = ui.get_input("Concurrent connections (blank for load-test.json)", required=False)
+        duration = ui.get_input("Duration in seconds (blank for load-test.json)", required=False)
+        rate = ui.get_input("Requests per second (blank for unthrottled)", required=False)
+
+        result = ui.project.run_load_test(target,
+                                          int(concurrency) if concurrency else None,
+                                          float(duration) if duration else None,
+                                          float(rate) if rate else None)
+        if not result:
+            ui.status_bar.update("Load test failed", 3)
+            return
 
-            if ui.project.run_k6_test(test, vus, duration):
-                ui.status_bar.update(f"Load test completed successfully", 3)
-            else:
-                ui.status_bar.update("Load test failed", 3)
-        else:
-            ui.status_bar.update("Invalid selection", 3)
+        print()
+        for line in format_load_result(result, result.get('previous')):
+            print(line)
+        print(f"\n{ui.theme.COLORS['INFO']}Press Enter to continue...{ui.theme.COLORS['ENDC']}")
+        input()
     except ValueError:
         ui.status_bar.update("Invalid input", 3)
 
@@ -0,0 +1,185 @@
+"""Content-addressed cache for processed assets.
+
+Entries are keyed by the hash of the source bytes plus the processing
+parameters, so an image that was already processed with the same settings is
+recognised in a single dictionary lookup no matter where it lives. Output
+bytes are stored as blobs under ``.asset-cache/objects`` so results can be
+restored exactly instead of being re-encoded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+CACHE_DIR_NAME = '.asset-cache'
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(source_hash: str, params: Dict[str, Any]) -> str:
+    """Cache key for a source hash processed with the given parameters."""
+    return hash_bytes(f"{source_hash}:{json.dumps(params, sort_keys=True)}".encode('utf-8'))
+
+
+class AssetCache:
+    """Manifest of processed assets plus a blob store of their outputs."""
+
+    def __init__(self, project_path: str):
+        """Initialize the cache.
+
+        Args:
+            project_path: Root path of the project; the cache lives in .asset-cache
+        """
+        self.project_path = project_path
+        self.cache_dir = os.path.join(project_path, CACHE_DIR_NAME)
+        self.objects_dir = os.path.join(self.cache_dir, 'objects')
+        self.manifest_path = os.path.join(self.cache_dir, 'manifest.json')
+        self._manifest = None
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Lazily loaded manifest: entries by key plus a stat index by path."""
+        if self._manifest is None:
+            self._manifest = {'version': MANIFEST_VERSION, 'entries': {}, 'files': {}}
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self._manifest = data
+        return self._manifest
+
+    def file_hash(self, path: str) -> str:
+        """Hash a file, reusing the recorded hash if size and mtime are unchanged."""
+        stat = os.stat(path)
+        rel_path = os.path.relpath(path, self.project_path)
+        known = self.manifest['files'].get(rel_path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['hash']
+        digest = hash_file(path)
+        self.manifest['files'][rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def lookup(self, source_hash: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the entry for a source processed with the given parameters."""
+        return self.manifest['entries'].get(cache_key(source_hash, params))
+
+    def record(self, source_hash: str, params: Dict[str, Any], outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record processing outputs for a source.
+
+        Args:
+            source_hash: Hash of the source bytes
+            params: Processing parameters (operation, quality, encoder version...)
+            outputs: One dict per output with 'path', 'hash' and 'bytes'
+
+        Returns:
+            Dict[str, Any]: The stored entry
+        """
+        entry = {
+            'source_hash': source_hash,
+            'params': params,
+            'outputs': [dict(output, path=os.path.relpath(output['path'], self.project_path))
+                        for output in outputs],
+            'created': time.time()
+        }
+        self.manifest['entries'][cache_key(source_hash, params)] = entry
+        return entry
+
+    def blob_path(self, content_hash: str) -> str:
+        """Path of the stored blob for a content hash."""
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash)
+
+    def store_blob(self, path: str, content_hash: str) -> None:
+        """Copy an output file into the blob store (no-op if already stored)."""
+        blob = self.blob_path(content_hash)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            shutil.copyfile(path, blob)
+
+    def restore_blob(self, content_hash: str, destination: str) -> bool:
+        """Write a stored blob to destination. Returns False if it is missing."""
+        blob = self.blob_path(content_hash)
+        if not os.path.exists(blob):
+            return False
+        tmp_path = f"{destination}.tmp"
+        shutil.copyfile(blob, tmp_path)
+        if os.path.exists(destination):
+            shutil.copymode(destination, tmp_path)
+        os.replace(tmp_path, destination)
+        return True
+
+    def save(self) -> None:
+        """Persist the manifest."""
+        if self._manifest is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def gc(self, max_age_days: Optional[float] = None) -> Dict[str, int]:
+        """Garbage-collect the cache.
+
+        Drops stat records for files that no longer exist, entries whose
+        outputs are all gone (or older than max_age_days), and blobs that no
+        remaining entry references.
+
+        Returns:
+            Dict[str, int]: Counts of removed entries, files and blobs, and bytes freed
+        """
+        stats = {'entries': 0, 'files': 0, 'blobs': 0, 'bytes_freed': 0}
+        manifest = self.manifest
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+
+        for rel_path in list(manifest['files']):
+            if not os.path.exists(os.path.join(self.project_path, rel_path)):
+                del manifest['files'][rel_path]
+                stats['files'] += 1
+
+        for key, entry in list(manifest['entries'].items()):
+            alive = any(os.path.exists(os.path.join(self.project_path, output['path']))
+                        for output in entry['outputs'])
+            if not alive or (cutoff is not None and entry['created'] < cutoff):
+                del manifest['entries'][key]
+                stats['entries'] += 1
+
+        referenced = {output['hash'] for entry in manifest['entries'].values() for output in entry['outputs']}
+        if os.path.isdir(self.objects_dir):
+            for shard in os.scandir(self.objects_dir):
+                for blob in os.scandir(shard.path):
+                    if blob.name not in referenced:
+                        stats['bytes_freed'] += blob.stat().st_size
+                        os.remove(blob.path)
+                        stats['blobs'] += 1
+                if not os.listdir(shard.path):
+                    os.rmdir(shard.path)
+
+        self.save()
+        return stats
+
+
+def gc_main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: garbage-collect the asset cache of a project."""
+    argv = argv or []
+    project_path = argv[0] if argv else os.getcwd()
+    max_age_days = float(argv[1]) if len(argv) > 1 else None
+    stats = AssetCache(project_path).gc(max_age_days)
+    print(f"Removed {stats['entries']} entries, {stats['files']} stale file records and "
+          f"{stats['blobs']} blobs ({stats['bytes_freed'] / 1024:.1f}KB freed)")
+    return 0
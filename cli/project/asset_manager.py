@@ -1,17 +1,176 @@
 """Asset management implementation."""
 
+import base64
+import io
 import os
-from PIL import Image
+import tempfile
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import PIL
+from PIL import Image, ImageFilter, features
 import shutil
-import importlib.util
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Tuple
+
+from .asset_cache import AssetCache, hash_bytes
+from .asset_references import ReferenceIndex
+from .asset_scanner import AssetScanner
+from .font_subsetter import (BASELINE_CHARACTERS, BROTLI_AVAILABLE, FONTTOOLS_AVAILABLE,
+                             collect_characters, subset_font_file)
+from .image_hashing import (HASH_VERSION, NUMPY_AVAILABLE, cluster_hashes, compute_hashes,
+                            hamming, load_thumbnail)
+from .image_headers import read_image_header
+
+if FONTTOOLS_AVAILABLE:
+    from fontTools import ttLib
+
+# Where rendered text lives, for usage-driven font subsetting
+TEXT_SOURCE_DIRS = ['pages', 'guides', 'health', 'src']
+
+# Longest side of low-quality image placeholders, in pixels
+PLACEHOLDER_SIZE = 16
+
+
+def _placeholder_from_image(img: Image.Image) -> Dict[str, Any]:
+    """Build a tiny blurred placeholder from an already decoded image.
+
+    Returns:
+        Dict[str, Any]: 'dataUri' (base64 WebP, or PNG without WebP support)
+        plus the source width and height so templates can reserve the space
+    """
+    scale = PLACEHOLDER_SIZE / max(img.size)
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    mode = 'RGBA' if 'A' in img.mode or 'transparency' in img.info else 'RGB'
+    if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        # Palette and CMYK images cannot be box-filtered directly
+        img = img.convert(mode)
+    small = img.resize(size, Image.BOX, reducing_gap=2.0).convert(mode).filter(ImageFilter.GaussianBlur(1))
+
+    buffer = io.BytesIO()
+    image_format = 'WEBP' if features.check('webp') else 'PNG'
+    small.save(buffer, image_format, quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return {
+        'dataUri': f"data:image/{image_format.lower()};base64,{encoded}",
+        'width': img.width,
+        'height': img.height
+    }
+
+def _optimize_image_file(image_path: str, quality: int, placeholder: bool = False) -> Dict[str, Any]:
+    """Re-encode one image and replace it only if the result is smaller.
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+
+    Args:
+        image_path: Path to the image file
+        quality: Quality level (0-100) for lossy compression
+        placeholder: Also build a placeholder from the same decode
+
+    Returns:
+        Dict[str, Any]: path, status ('optimized', 'skipped' or 'failed'),
+        original and final byte sizes, the placeholder if requested, and an
+        error message on failure
+    """
+    result = {'path': image_path, 'status': 'failed', 'original_bytes': 0, 'final_bytes': 0,
+              'placeholder': None, 'error': None}
+    try:
+        original_bytes = os.path.getsize(image_path)
+        result['original_bytes'] = result['final_bytes'] = original_bytes
+
+        buffer = io.BytesIO()
+        with Image.open(image_path) as img:
+            # Re-encoding would keep only the first frame of an animated GIF/WebP
+            if getattr(img, 'is_animated', False):
+                if placeholder:
+                    result['placeholder'] = _placeholder_from_image(img)
+                result['status'] = 'skipped'
+                return result
+            if img.format == 'PNG':
+                img.save(buffer, 'PNG', optimize=True)
+            else:
+                img.save(buffer, img.format, quality=quality, optimize=True)
+            if placeholder:
+                result['placeholder'] = _placeholder_from_image(img)
+
+        if buffer.tell() >= original_bytes:
+            result['status'] = 'skipped'
+            return result
+
+        # Write beside the original and swap atomically so a crash never leaves a truncated image
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(image_path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buffer.getbuffer())
+        shutil.copymode(image_path, tmp_path)
+        os.replace(tmp_path, image_path)
+
+        result['status'] = 'optimized'
+        result['final_bytes'] = buffer.tell()
+        result['output_hash'] = hash_bytes(buffer.getvalue())
+        return result
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+
+def _generate_variants_file(image_path: str, widths: List[int], formats: List[str],
+                            quality: int) -> Dict[str, Any]:
+    """Generate every width x format variant of one image from a single decode.
+
+    JPEGs are decoded with draft() at the smallest DCT scale that still covers
+    the largest width, and each width is resized from the previous (larger)
+    one rather than from the full-resolution source.
+
+    Returns:
+        Dict[str, Any]: source path, source dimensions and a list of variants
+        (width, height, format, path, bytes); 'error' is set on failure
+    """
+    manifest = {'source': image_path, 'width': 0, 'height': 0, 'variants': [], 'error': None}
+    try:
+        base, ext = os.path.splitext(image_path)
+        with Image.open(image_path) as img:
+            source_format = img.format
+            manifest['width'], manifest['height'] = img.size
+            aspect_ratio = img.height / img.width
+            # Never upscale: widths beyond the source collapse to the source width
+            targets = sorted({min(w, img.width) for w in widths}, reverse=True)
+            if not targets:
+                return manifest
+
+            if source_format == 'JPEG':
+                img.draft(None, (targets[0], max(1, round(targets[0] * aspect_ratio))))
+            current = img.convert('RGBA') if img.mode == 'P' else img.copy()
+
+        for width in targets:
+            height = max(1, round(width * aspect_ratio))
+            if current.width != width:
+                # reducing_gap lets Pillow box-reduce large steps before the LANCZOS pass
+                current = current.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+            for target_format in formats:
+                if target_format == 'original':
+                    save_format, output_path = source_format, f"{base}_{width}w{ext}"
+                else:
+                    save_format, output_path = target_format, f"{base}_{width}w.{target_format.lower()}"
+
+                frame = current
+                if save_format == 'JPEG' and frame.mode not in ('RGB', 'L'):
+                    frame = frame.convert('RGB')
+                if save_format == 'PNG':
+                    frame.save(output_path, 'PNG', optimize=True)
+                else:
+                    frame.save(output_path, save_format, quality=quality)
+
+                manifest['variants'].append({
+                    'width': width,
+                    'height': current.height,
+                    'format': target_format,
+                    'path': output_path,
+                    'bytes': os.path.getsize(output_path)
+                })
+        return manifest
+    except Exception as e:
+        manifest['error'] = str(e)
+        return manifest
 
-# Try to import fonttools, but make it optional
-try:
-    from fonttools import ttLib
-    FONTTOOLS_AVAILABLE = True
-except ImportError:
-    FONTTOOLS_AVAILABLE = False
 
 class AssetManager:
     """Manages project assets including images and fonts."""
@@ -25,6 +184,9 @@ class AssetManager:
         self.project_path = project_path
         self.image_formats = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif']
         self.font_formats = ['.ttf', '.otf', '.woff', '.woff2']
+        self.cache = AssetCache(project_path)
+        self.scanner = AssetScanner(project_path)
+        self.references = ReferenceIndex(project_path, self.scanner)
 
     def optimize_image(self, image_path: str, quality: int = 85) -> bool:
         """Optimize an image while maintaining acceptable quality.
@@ -36,25 +198,150 @@ class AssetManager:
         Returns:
             bool: True if optimization was successful
         """
-        try:
-            img = Image.open(image_path)
-            optimized_path = f"{os.path.splitext(image_path)[0]}_optimized{os.path.splitext(image_path)[1]}"
+        result = _optimize_image_file(image_path, quality)
+        if result['error']:
+            print(f"Error optimizing image: {result['error']}")
+        return result['status'] == 'optimized'
+
+    def optimize_images_batch(self, image_paths: List[str], quality: int = 85,
+                              max_workers: Optional[int] = None,
+                              progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+                              use_cache: bool = True, placeholders: bool = True) -> Dict[str, Any]:
+        """Optimize many images in parallel across worker processes.
+
+        Decoding and re-encoding are CPU bound, so images are spread over a
+        ProcessPoolExecutor and results are collected as they finish. With the
+        asset cache enabled, images already processed with the same settings
+        are skipped, and known outputs are restored instead of re-encoded.
+        Placeholders are built from the same decode and kept in the cache
+        entry, then written to the placeholder manifest.
 
-            if img.format == 'PNG':
-                img.save(optimized_path, 'PNG', optimize=True)
-            else:
-                img.save(optimized_path, quality=quality, optimize=True)
+        Args:
+            image_paths: Paths of the images to optimize
+            quality: Quality level (0-100) for lossy compression
+            max_workers: Number of worker processes (defaults to CPU count)
+            progress: Optional callback called as (done, total, result) per file
+            use_cache: Consult and update the .asset-cache manifest
+            placeholders: Generate placeholders and update the placeholder manifest
 
-            # Replace original if optimized is smaller
-            if os.path.getsize(optimized_path) < os.path.getsize(image_path):
-                shutil.move(optimized_path, image_path)
-                return True
+        Returns:
+            Dict[str, Any]: Summary with optimized/skipped/cached counts,
+            failures, bytes_saved and the per-file results
+        """
+        summary = {'optimized': 0, 'skipped': 0, 'cached': 0, 'failed': [], 'bytes_saved': 0, 'results': []}
+        total = len(image_paths)
+        if not total:
+            return summary
+
+        params = {'op': 'optimize', 'quality': quality, 'pillow': PIL.__version__,
+                  'placeholder': PLACEHOLDER_SIZE if placeholders else None}
+        source_hashes = {}
+        done = 0
+
+        def collect(result: Dict[str, Any]) -> None:
+            nonlocal done
+            done += 1
+            summary['results'].append(result)
+            if result['status'] == 'failed':
+                summary['failed'].append((result['path'], result['error']))
             else:
-                os.remove(optimized_path)
-                return False
-        except Exception as e:
-            print(f"Error optimizing image: {e}")
-            return False
+                summary[result['status']] += 1
+                summary['bytes_saved'] += result['original_bytes'] - result['final_bytes']
+            if progress:
+                progress(done, total, result)
+
+        pending = []
+        for path in image_paths:
+            if not use_cache:
+                pending.append(path)
+                continue
+            try:
+                source_hash = source_hashes[path] = self.cache.file_hash(path)
+            except OSError as e:
+                collect({'path': path, 'status': 'failed', 'original_bytes': 0, 'final_bytes': 0, 'error': str(e)})
+                continue
+            entry = self.cache.lookup(source_hash, params)
+            if entry is None:
+                pending.append(path)
+                continue
+            output = entry['outputs'][0]
+            original_bytes = os.path.getsize(path)
+            if output['hash'] == source_hash:
+                # This content is already a result of this processing
+                collect({'path': path, 'status': 'cached', 'original_bytes': original_bytes,
+                         'final_bytes': original_bytes, 'placeholder': entry.get('placeholder'), 'error': None})
+            elif self.cache.restore_blob(output['hash'], path):
+                self.cache.file_hash(path)
+                collect({'path': path, 'status': 'cached', 'original_bytes': original_bytes,
+                         'final_bytes': output['bytes'], 'placeholder': entry.get('placeholder'), 'error': None})
+            else:
+                pending.append(path)
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_optimize_image_file, path, quality, placeholders) for path in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if use_cache and result['status'] != 'failed':
+                        self._record_optimization(result, source_hashes[result['path']], params)
+                    collect(result)
+
+        if use_cache:
+            self.cache.save()
+        if placeholders:
+            self.update_placeholder_manifest({r['path']: r['placeholder'] for r in summary['results'] if r.get('placeholder')})
+        return summary
+
+    def _record_optimization(self, result: Dict[str, Any], source_hash: str, params: Dict[str, Any]) -> None:
+        """Record an optimization result (and its placeholder) in the asset cache."""
+        path = result['path']
+        if result['status'] == 'skipped':
+            # Re-encoding did not help; the source itself is the result
+            entry = self.cache.record(source_hash, params, [{'path': path, 'hash': source_hash, 'bytes': result['final_bytes']}])
+            entry['placeholder'] = result.get('placeholder')
+            return
+        output = {'path': path, 'hash': result['output_hash'], 'bytes': result['final_bytes']}
+        self.cache.store_blob(path, result['output_hash'])
+        self.cache.record(source_hash, params, [output])['placeholder'] = result.get('placeholder')
+        # The optimized bytes are themselves final, so re-runs skip them too
+        self.cache.record(result['output_hash'], params, [output])['placeholder'] = result.get('placeholder')
+        self.cache.file_hash(path)
+
+    def update_placeholder_manifest(self, placeholders: Dict[str, Dict[str, Any]],
+                                    manifest_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Merge placeholders into the manifest templates inline them from.
+
+        Entries for images that no longer exist are dropped.
+
+        Args:
+            placeholders: Placeholders keyed by image path
+            manifest_path: Output JSON (defaults to src/data/image-placeholders.json)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The manifest that was written, keyed by site URL
+        """
+        manifest_path = manifest_path or os.path.join(self.project_path, 'src', 'data', 'image-placeholders.json')
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        public_dir = os.path.join(self.project_path, 'public')
+        for url in list(manifest):
+            if not any(os.path.exists(os.path.join(root, url.lstrip('/'))) for root in (public_dir, self.project_path)):
+                del manifest[url]
+        for path, placeholder in placeholders.items():
+            manifest[self._asset_url(path)] = placeholder
+
+        manifest = dict(sorted(manifest.items()))
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def gc_asset_cache(self, max_age_days: Optional[float] = None) -> Dict[str, int]:
+        """Garbage-collect stale entries and unreferenced blobs from the asset cache."""
+        return self.cache.gc(max_age_days)
 
     def convert_image_format(self, image_path: str, target_format: str) -> Optional[str]:
         """Convert image to a different format.
@@ -82,6 +369,29 @@ class AssetManager:
             print(f"Error converting image: {e}")
             return None
 
+    def _variant_formats(self, formats: Optional[List[str]] = None) -> List[str]:
+        """Requested variant formats, minus any this Pillow build cannot encode."""
+        formats = formats or ['original', 'WEBP', 'AVIF']
+        return [f for f in formats if f == 'original' or features.check(f.lower())]
+
+    def generate_image_variants(self, image_path: str, widths: List[int],
+                                formats: Optional[List[str]] = None, quality: int = 85) -> Dict[str, Any]:
+        """Generate all widths x formats for one image in a single decode pass.
+
+        Args:
+            image_path: Path to the source image
+            widths: Desired output widths (wider than the source are clamped)
+            formats: 'original' and/or Pillow format names (default: original, WEBP, AVIF)
+            quality: Quality level (0-100) for lossy formats
+
+        Returns:
+            Dict[str, Any]: Variant manifest for the image
+        """
+        manifest = _generate_variants_file(image_path, widths, self._variant_formats(formats), quality)
+        if manifest['error']:
+            print(f"Error generating image variants: {manifest['error']}")
+        return manifest
+
     def generate_responsive_images(self, image_path: str, widths: List[int]) -> Dict[int, str]:
         """Generate responsive image variants.
 
@@ -92,23 +402,62 @@ class AssetManager:
         Returns:
             Dict[int, str]: Mapping of widths to generated image paths
         """
-        results = {}
-        try:
-            img = Image.open(image_path)
-            aspect_ratio = img.height / img.width
+        manifest = self.generate_image_variants(image_path, widths, ['original'])
+        return {variant['width']: variant['path'] for variant in manifest['variants']}
 
-            for width in widths:
-                height = int(width * aspect_ratio)
-                resized = img.resize((width, height), Image.Resampling.LANCZOS)
+    def _asset_url(self, path: str) -> str:
+        """Site URL for a file: relative to public/ if inside it, else to the project root."""
+        public_dir = os.path.join(self.project_path, 'public')
+        root = public_dir if os.path.abspath(path).startswith(os.path.abspath(public_dir) + os.sep) else self.project_path
+        return '/' + os.path.relpath(path, root).replace(os.sep, '/')
 
-                output_path = f"{os.path.splitext(image_path)[0]}_{width}w{os.path.splitext(image_path)[1]}"
-                resized.save(output_path, quality=85, optimize=True)
-                results[width] = output_path
+    def build_srcset_manifest(self, image_paths: List[str], widths: List[int],
+                              formats: Optional[List[str]] = None, quality: int = 85,
+                              manifest_path: Optional[str] = None,
+                              max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Generate variants for many images in parallel and write a srcset manifest.
 
-            return results
-        except Exception as e:
-            print(f"Error generating responsive images: {e}")
-            return results
+        Args:
+            image_paths: Source images
+            widths: Desired output widths
+            formats: Variant formats (see generate_image_variants)
+            quality: Quality level (0-100) for lossy formats
+            manifest_path: Output JSON (defaults to public/responsive-images.json)
+            max_workers: Number of worker processes (defaults to CPU count)
+
+        Returns:
+            Dict[str, Any]: Manifest keyed by source URL with width, height and
+            a srcset string per format; failures are listed under '_errors'
+        """
+        manifest_path = manifest_path or os.path.join(self.project_path, 'public', 'responsive-images.json')
+        formats = self._variant_formats(formats)
+        manifest: Dict[str, Any] = {}
+        errors = {}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_generate_variants_file, path, widths, formats, quality) for path in image_paths]
+            for future in as_completed(futures):
+                result = future.result()
+                source_url = self._asset_url(result['source'])
+                if result['error']:
+                    errors[source_url] = result['error']
+                    continue
+                srcset = {}
+                for variant in sorted(result['variants'], key=lambda v: v['width']):
+                    srcset.setdefault(variant['format'], []).append(f"{self._asset_url(variant['path'])} {variant['width']}w")
+                manifest[source_url] = {
+                    'width': result['width'],
+                    'height': result['height'],
+                    'srcset': {fmt: ', '.join(entries) for fmt, entries in srcset.items()}
+                }
+
+        manifest = dict(sorted(manifest.items()))
+        if errors:
+            manifest['_errors'] = errors
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
 
     def subset_font(self, font_path: str, text: str) -> Optional[str]:
         """Create a subset of a font file containing only specified characters.
@@ -124,22 +473,11 @@ class AssetManager:
             print("Warning: fonttools not available. Font subsetting disabled.")
             return None
 
-        try:
-            output_path = f"{os.path.splitext(font_path)[0]}_subset{os.path.splitext(font_path)[1]}"
-
-            # Create unicode list from text
-            unicodes = set(ord(c) for c in text)
-
-            # Load the font
-            font = ttLib.TTFont(font_path)
-
-            # Save a new copy with minimal tables
-            font.save(output_path, tables=['cmap', 'head', 'hhea', 'hmtx', 'maxp', 'name', 'OS/2', 'post'])
-
-            return output_path
-        except Exception as e:
-            print(f"Error subsetting font: {e}")
+        report = subset_font_file(font_path, text)
+        if report['error']:
+            print(f"Error subsetting font: {report['error']}")
             return None
+        return report['outputs'].get('woff2', report['outputs'].get('woff'))['path']
 
     def optimize_font_loading(self, font_path: str) -> Dict[str, str]:
         """Generate optimized font variants for different browsers.
@@ -153,30 +491,78 @@ class AssetManager:
         if not FONTTOOLS_AVAILABLE:
             print("Warning: fonttools not available. Font optimization disabled.")
             return {}
+        if not BROTLI_AVAILABLE:
+            print("Warning: brotli not available. Only WOFF will be generated.")
 
         results = {}
         try:
-            font = ttLib.TTFont(font_path)
             base_path = os.path.splitext(font_path)[0]
-
-            # Generate WOFF2 (best compression)
-            woff2_path = f"{base_path}.woff2"
-            font.save(woff2_path)
-            results['woff2'] = woff2_path
-
-            # Generate WOFF (fallback)
-            woff_path = f"{base_path}.woff"
-            font.save(woff_path)
-            results['woff'] = woff_path
+            for flavor in (['woff2', 'woff'] if BROTLI_AVAILABLE else ['woff']):
+                font = ttLib.TTFont(font_path)
+                font.flavor = flavor
+                output_path = f"{base_path}.{flavor}"
+                if os.path.abspath(output_path) == os.path.abspath(font_path):
+                    continue
+                font.save(output_path)
+                results[flavor] = output_path
 
             return results
         except Exception as e:
             print(f"Error optimizing font loading: {e}")
             return results
 
-    def scan_project_assets(self) -> Dict[str, List[str]]:
+    def collect_used_characters(self) -> str:
+        """Collect characters rendered across the site's HTML and Astro sources.
+
+        Returns:
+            str: Sorted characters, including BASELINE_CHARACTERS
+        """
+        sources = []
+        for directory in TEXT_SOURCE_DIRS:
+            path = os.path.join(self.project_path, directory)
+            if not os.path.isdir(path):
+                continue
+            sources.extend(f for f in self.scanner.scan(path)
+                           if f.endswith('.html') or (directory == 'src' and f.endswith('.astro')))
+        return ''.join(sorted(collect_characters(sources) | set(BASELINE_CHARACTERS)))
+
+    def subset_fonts_for_site(self, font_paths: Optional[List[str]] = None,
+                              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Subset fonts to the characters the site actually uses.
+
+        Each font is written as <name>.subset.woff2 and .woff next to the source.
+        Existing subset outputs are never used as inputs.
+
+        Args:
+            font_paths: Fonts to subset (defaults to all scanned fonts)
+            max_workers: Number of worker processes (defaults to CPU count)
+
+        Returns:
+            List[Dict[str, Any]]: Per-font report with original bytes, output
+            bytes per flavor, glyph counts and errors
+        """
+        if not FONTTOOLS_AVAILABLE:
+            print("Warning: fonttools not available. Font subsetting disabled.")
+            return []
+
+        if font_paths is None:
+            font_paths = self.scan_project_assets()['fonts']
+        font_paths = [p for p in font_paths if '.subset.' not in os.path.basename(p)]
+        text = self.collect_used_characters()
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            reports = list(executor.map(subset_font_file, font_paths, [text] * len(font_paths)))
+        return reports
+
+    def scan_project_assets(self, directory: Optional[str] = None) -> Dict[str, List[str]]:
         """Scan project directory for image and font assets.
 
+        Ignored trees (.gitignore, node_modules, vendored SDKs...) are pruned
+        and unchanged directories are served from the scan index.
+
+        Args:
+            directory: Limit the scan to this directory (defaults to the project root)
+
         Returns:
             Dict[str, List[str]]: Mapping of asset types to file paths
         """
@@ -185,18 +571,169 @@ class AssetManager:
             'fonts': []
         }
 
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1].lower()
+        for file_path in self.scanner.scan(directory):
+            ext = os.path.splitext(file_path)[1].lower()
 
-                if ext in self.image_formats:
-                    assets['images'].append(file_path)
-                elif ext in self.font_formats:
-                    assets['fonts'].append(file_path)
+            if ext in self.image_formats:
+                assets['images'].append(file_path)
+            elif ext in self.font_formats:
+                assets['fonts'].append(file_path)
 
         return assets
 
+    def find_unused_assets(self) -> Dict[str, Any]:
+        """Find images and fonts that no site source references.
+
+        Variants listed in public/responsive-images.json count as referenced
+        when their source image is. Assets matching a dynamic reference such
+        as `/images/${slug}.jpg` are reported separately rather than as unused.
+
+        Returns:
+            Dict[str, Any]: 'unused' (path and bytes per asset), 'total_bytes',
+            'possibly_used' paths and reference index 'stats'
+        """
+        index = self.references.update()
+        referenced = ReferenceIndex.referenced_paths(index)
+        patterns = ReferenceIndex.reference_patterns(index)
+
+        srcset_manifest = os.path.join(self.project_path, 'public', 'responsive-images.json')
+        if os.path.exists(srcset_manifest):
+            with open(srcset_manifest, 'r') as f:
+                manifest = json.load(f)
+            for source_url, entry in manifest.items():
+                if source_url == '_errors':
+                    continue
+                if f"public{source_url}" not in referenced and source_url.lstrip('/') not in referenced:
+                    continue
+                for srcset in entry['srcset'].values():
+                    for candidate in srcset.split(','):
+                        referenced.add(f"public{candidate.split()[0]}")
+
+        assets = self.scan_project_assets()
+        unused, possibly_used = [], []
+        for path in sorted(assets['images'] + assets['fonts']):
+            rel_path = os.path.relpath(path, self.project_path).replace(os.sep, '/')
+            if rel_path in referenced:
+                continue
+            if any(pattern.match(rel_path) for pattern in patterns):
+                possibly_used.append(path)
+                continue
+            unused.append({'path': path, 'bytes': os.path.getsize(path)})
+
+        return {
+            'unused': unused,
+            'total_bytes': sum(asset['bytes'] for asset in unused),
+            'possibly_used': possibly_used,
+            'stats': dict(self.references.stats)
+        }
+
+    def _perceptual_hashes(self, image_paths: List[str], max_workers: Optional[int] = None,
+                           failed: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Get aHash/dHash for images, decoding only those not already cached.
+
+        Hashes are cached by content hash in .asset-cache/perceptual-hashes.json,
+        so renamed or copied files are not decoded again.
+
+        Args:
+            image_paths: Images to hash
+            max_workers: Number of worker processes (defaults to CPU count)
+            failed: Receives (path, error) for images that could not be read
+
+        Returns:
+            Dict[str, Dict[str, Any]]: width, height, 'average' and 'gradient'
+            hashes keyed by image path (unreadable images are left out)
+        """
+        cache_path = os.path.join(self.cache.cache_dir, 'perceptual-hashes.json')
+        cached: Dict[str, Any] = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == HASH_VERSION:
+                cached = data['hashes']
+
+        failed = failed if failed is not None else []
+        content_hashes = {}
+        for path in image_paths:
+            # Files can disappear or become unreadable between the scan and hashing
+            try:
+                content_hashes[path] = self.cache.file_hash(path)
+            except OSError as e:
+                failed.append((path, str(e)))
+        missing = sorted({path for path, digest in content_hashes.items() if digest not in cached})
+        if missing:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                thumbnails = []
+                for thumbnail in executor.map(load_thumbnail, missing, chunksize=16):
+                    if thumbnail['error']:
+                        failed.append((thumbnail['path'], thumbnail['error']))
+                    else:
+                        thumbnails.append(thumbnail)
+            average, gradient = compute_hashes([t['average'] for t in thumbnails],
+                                               [t['gradient'] for t in thumbnails])
+            for thumbnail, average_hash, gradient_hash in zip(thumbnails, average, gradient):
+                cached[content_hashes[thumbnail['path']]] = {
+                    'width': thumbnail['width'],
+                    'height': thumbnail['height'],
+                    'average': average_hash,
+                    'gradient': gradient_hash
+                }
+            os.makedirs(self.cache.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': HASH_VERSION, 'hashes': cached}, f)
+            os.replace(tmp_path, cache_path)
+            self.cache.save()
+
+        return {path: cached[digest] for path, digest in content_hashes.items() if digest in cached}
+
+    def find_duplicate_images(self, image_paths: Optional[List[str]] = None, threshold: int = 6,
+                              max_workers: Optional[int] = None,
+                              failed: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+        """Find visually near-identical images and suggest which copy to keep.
+
+        Args:
+            image_paths: Images to compare (defaults to all scanned images)
+            threshold: Maximum differing bits (of 64) in both aHash and dHash
+            max_workers: Number of worker processes (defaults to CPU count)
+            failed: Receives (path, error) for images that were skipped as unreadable
+
+        Returns:
+            List[Dict[str, Any]]: One entry per cluster with the 'canonical' path
+            (highest resolution, then smallest file), its 'duplicates' with
+            distance and bytes, and 'reclaimable_bytes'; largest savings first
+        """
+        if not NUMPY_AVAILABLE:
+            print("Warning: numpy not available. Duplicate detection disabled.")
+            return []
+
+        if image_paths is None:
+            image_paths = self.scan_project_assets()['images']
+        hashes = self._perceptual_hashes(image_paths, max_workers, failed)
+        paths = sorted(hashes)
+        clusters = cluster_hashes([hashes[p]['average'] for p in paths],
+                                  [hashes[p]['gradient'] for p in paths], threshold)
+
+        results = []
+        for members in clusters:
+            files = [{'path': paths[i], 'bytes': os.path.getsize(paths[i]), **hashes[paths[i]]} for i in members]
+            files.sort(key=lambda f: (-f['width'] * f['height'], f['bytes'], len(f['path'])))
+            canonical, duplicates = files[0], files[1:]
+            results.append({
+                'canonical': canonical['path'],
+                'width': canonical['width'],
+                'height': canonical['height'],
+                'duplicates': [{
+                    'path': f['path'],
+                    'width': f['width'],
+                    'height': f['height'],
+                    'bytes': f['bytes'],
+                    'distance': hamming(f['gradient'], canonical['gradient'])
+                } for f in duplicates],
+                'reclaimable_bytes': sum(f['bytes'] for f in duplicates)
+            })
+        results.sort(key=lambda cluster: -cluster['reclaimable_bytes'])
+        return results
+
     def get_image_metadata(self, image_path: str) -> Dict[str, any]:
         """Get metadata for an image file.
 
@@ -220,6 +757,60 @@ class AssetManager:
             print(f"Error getting image metadata: {e}")
             return {}
 
+    def _read_header_metadata(self, image_path: str) -> Optional[Dict[str, Any]]:
+        """Header-only metadata for one image, or None if it cannot be read."""
+        try:
+            header = read_image_header(image_path)
+            if header is None:
+                return None
+            return dict(header, path=image_path, size_bytes=os.path.getsize(image_path))
+        except OSError:
+            return None
+
+    def get_images_metadata_batch(self, image_paths: Optional[List[str]] = None,
+                                  max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read format and dimensions of many images from their headers, in parallel.
+
+        Nothing is decoded, so this is I/O bound and uses a thread pool.
+
+        Args:
+            image_paths: Images to read (defaults to the scanner's image results)
+            max_workers: Number of worker threads
+
+        Returns:
+            List[Dict[str, Any]]: path, format, width, height and size_bytes per
+            readable image, in input order
+        """
+        if image_paths is None:
+            image_paths = self.scan_project_assets()['images']
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [metadata for metadata in executor.map(self._read_header_metadata, image_paths) if metadata]
+
+    def write_dimensions_manifest(self, manifest_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Write image dimensions keyed by site URL for width/height attributes.
+
+        Args:
+            manifest_path: Output JSON (defaults to src/data/image-dimensions.json)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The manifest that was written
+        """
+        manifest_path = manifest_path or os.path.join(self.project_path, 'src', 'data', 'image-dimensions.json')
+        manifest = {
+            self._asset_url(metadata['path']): {
+                'width': metadata['width'],
+                'height': metadata['height'],
+                'format': metadata['format'],
+                'bytes': metadata['size_bytes']
+            }
+            for metadata in self.get_images_metadata_batch()
+        }
+        manifest = dict(sorted(manifest.items()))
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
     def get_font_metadata(self, font_path: str) -> Dict[str, any]:
         """Get metadata for a font file.
 
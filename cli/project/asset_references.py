@@ -0,0 +1,189 @@
+"""Incremental index of asset references in site sources.
+
+HTML, Astro, TSX/JSX, CSS and Markdown sources are scanned for asset URLs
+(attributes, srcset, imports, CSS ``url()``, Markdown images). Each source's
+references are cached with its size and mtime, so re-indexing only parses
+files that changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Set
+
+from .asset_cache import CACHE_DIR_NAME
+from .asset_scanner import AssetScanner
+
+# Bump when extraction or resolution changes to invalidate stored indexes
+INDEX_VERSION = 1
+
+SOURCE_EXTENSIONS = ('.html', '.htm', '.astro', '.tsx', '.jsx', '.ts', '.js', '.mjs', '.css', '.md', '.mdx')
+
+_ASSET_EXTENSIONS = r'(?:png|jpe?g|gif|webp|avif|svg|ico|ttf|otf|woff2?|eot)'
+
+_QUOTED_REFERENCE = re.compile(
+    r"""["'`]([^"'`\s<>]*?\.""" + _ASSET_EXTENSIONS + r""")(?:[?#][^"'`\s]*)?["'`]""", re.IGNORECASE)
+_CSS_URL = re.compile(r"""url\(\s*(["']?)([^"')]+?)\1\s*\)""", re.IGNORECASE)
+_SRCSET = re.compile(r"""srcset\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+_MARKDOWN_IMAGE = re.compile(r"""!\[[^\]]*\]\(\s*<?([^)\s>]+)""")
+_DYNAMIC_PART = re.compile(r"\$\{[^}]*\}|\{[^}]*\}")
+_ASTRO_BASE = re.compile(r"""\bbase\s*:\s*(["'])([^"']*)\1""")
+
+_EXTERNAL_PREFIXES = ('http://', 'https://', '//', 'data:', 'mailto:', '#')
+
+
+def extract_references(content: str) -> Set[str]:
+    """Extract raw asset URLs from source text."""
+    references = {m.group(1) for m in _QUOTED_REFERENCE.finditer(content)}
+    references.update(m.group(2).strip() for m in _CSS_URL.finditer(content))
+    references.update(m.group(1) for m in _MARKDOWN_IMAGE.finditer(content))
+    for match in _SRCSET.finditer(content):
+        for candidate in match.group(1).split(','):
+            if candidate.strip():
+                references.add(candidate.split()[0])
+    return {ref for ref in references if ref and not ref.lower().startswith(_EXTERNAL_PREFIXES)}
+
+
+def load_aliases(root: str) -> Dict[str, str]:
+    """Import aliases from tsconfig.json paths (e.g. '@/' -> 'src/')."""
+    try:
+        with open(os.path.join(root, 'tsconfig.json'), 'r') as f:
+            paths = json.load(f).get('compilerOptions', {}).get('paths', {})
+    except (OSError, ValueError):
+        return {}
+    return {alias.rstrip('*'): targets[0].rstrip('*') for alias, targets in paths.items()
+            if alias.endswith('*') and targets}
+
+
+def astro_base(project_path: str) -> str:
+    """The `base` path configured in astro.config.*, without surrounding slashes ('' if unset)."""
+    for name in ('astro.config.mjs', 'astro.config.ts', 'astro.config.js'):
+        path = os.path.join(project_path, name)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                match = _ASTRO_BASE.search(f.read())
+            return match.group(2).strip('/') if match else ''
+    return ''
+
+
+class ReferenceIndex:
+    """Per-source cache of resolved asset references."""
+
+    def __init__(self, root: str, scanner: Optional[AssetScanner] = None,
+                 index_path: Optional[str] = None):
+        """Initialize the index.
+
+        Args:
+            root: Project root
+            scanner: Scanner used to list sources (defaults to a new AssetScanner)
+            index_path: Where to persist the index
+                (defaults to .asset-cache/reference-index.json under root)
+        """
+        self.root = os.path.abspath(root)
+        self.scanner = scanner or AssetScanner(self.root)
+        self.index_path = index_path or os.path.join(self.root, CACHE_DIR_NAME, 'reference-index.json')
+        self.aliases = load_aliases(self.root)
+        # Site-absolute URLs carry the configured base path, which is not part of the tree
+        self.base = astro_base(self.root)
+        self.stats = {'parsed': 0, 'reused': 0}
+
+    def _fingerprint(self) -> str:
+        """Hash of everything that affects resolution, to invalidate the index."""
+        return hashlib.sha256(json.dumps([INDEX_VERSION, self.aliases, self.base], sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _resolve(self, source_rel: str, reference: str) -> List[str]:
+        """Candidate root-relative paths a reference may point to.
+
+        Site-absolute URLs may be served from public/ or from the project root,
+        so both are returned, after stripping the Astro base path. Dynamic
+        parts (``${...}`` or ``{...}``) are kept as ``*`` and matched later
+        as patterns.
+        """
+        reference = reference.split('?', 1)[0].split('#', 1)[0]
+        reference = _DYNAMIC_PART.sub('*', reference)
+        for alias, target in self.aliases.items():
+            if reference.startswith(alias):
+                return [os.path.normpath(target + reference[len(alias):]).replace(os.sep, '/')]
+        if self.base and (reference + '/').startswith(f"/{self.base}/"):
+            reference = reference[len(self.base) + 1:] or '/'
+        if reference.startswith('/'):
+            path = os.path.normpath(reference.lstrip('/')).replace(os.sep, '/')
+            return [f"public/{path}", path]
+        base = os.path.dirname(source_rel)
+        path = os.path.normpath(os.path.join(base, reference)).replace(os.sep, '/')
+        return [] if path.startswith('..') else [path]
+
+    def _parse(self, path: str, rel_path: str) -> List[str]:
+        """Resolved references of one source file."""
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        resolved = set()
+        for reference in extract_references(content):
+            resolved.update(self._resolve(rel_path, reference))
+        return sorted(resolved)
+
+    def _load(self, fingerprint: str) -> Dict[str, Dict]:
+        """Load the persisted index if it was built with the same settings."""
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == fingerprint:
+                return data['sources']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save(self, fingerprint: str, sources: Dict[str, Dict]) -> None:
+        """Persist the index."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'sources': sources}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def update(self) -> Dict[str, List[str]]:
+        """Bring the index up to date, re-parsing only changed sources.
+
+        Returns:
+            Dict[str, List[str]]: Resolved references keyed by root-relative source path
+        """
+        fingerprint = self._fingerprint()
+        previous = self._load(fingerprint)
+        sources: Dict[str, Dict] = {}
+        self.stats = {'parsed': 0, 'reused': 0}
+
+        for path in self.scanner.scan():
+            if not path.lower().endswith(SOURCE_EXTENSIONS):
+                continue
+            rel_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            cached = previous.get(rel_path)
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                sources[rel_path] = cached
+                self.stats['reused'] += 1
+                continue
+            try:
+                refs = self._parse(path, rel_path)
+            except OSError:
+                continue
+            sources[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'refs': refs}
+            self.stats['parsed'] += 1
+
+        self._save(fingerprint, sources)
+        return {rel_path: entry['refs'] for rel_path, entry in sources.items()}
+
+    @staticmethod
+    def referenced_paths(index: Dict[str, List[str]]) -> Set[str]:
+        """All exact (non-pattern) referenced paths."""
+        return {ref for refs in index.values() for ref in refs if '*' not in ref}
+
+    @staticmethod
+    def reference_patterns(index: Dict[str, List[str]]) -> List[re.Pattern]:
+        """Dynamic references compiled to regexes, one '*' per template hole."""
+        patterns = {ref for refs in index.values() for ref in refs if '*' in ref}
+        return [re.compile('^' + '.*'.join(re.escape(part) for part in pattern.split('*')) + '$')
+                for pattern in sorted(patterns)]
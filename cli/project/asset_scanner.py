@@ -0,0 +1,197 @@
+"""Pruned, incremental file scanner for project assets."""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .asset_cache import CACHE_DIR_NAME
+
+# Trees that never contain project assets but are expensive to walk
+DEFAULT_EXCLUDES = [
+    '.git',
+    'node_modules',
+    'dist',
+    '.astro',
+    '__pycache__',
+    CACHE_DIR_NAME,
+    'programming/google-cloud-sdk',
+    'typescript-sdk-main',
+]
+
+
+def _translate_pattern(pattern: str) -> str:
+    """Translate a gitignore glob into a regex fragment."""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+class IgnoreRules:
+    """Matcher for .gitignore-style patterns plus explicit excludes."""
+
+    def __init__(self, lines: Iterable[str]):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if '/' in line:
+                # Patterns containing a slash are anchored to the root
+                regex = '^' + _translate_pattern(line.lstrip('/')) + '$'
+            else:
+                regex = '(?:^|/)' + _translate_pattern(line) + '$'
+            self.rules.append((re.compile(regex), negate, dir_only))
+
+    @classmethod
+    def for_root(cls, root: str, excludes: Optional[List[str]] = None) -> 'IgnoreRules':
+        """Build rules from the root .gitignore followed by explicit excludes."""
+        lines = []
+        gitignore = os.path.join(root, '.gitignore')
+        if os.path.exists(gitignore):
+            with open(gitignore, 'r') as f:
+                lines.extend(f.readlines())
+        lines.extend(f"/{e.strip('/')}" if '/' in e.strip('/') else e for e in (excludes or []))
+        return cls(lines)
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Whether a root-relative path is ignored (last matching rule wins)."""
+        ignored = False
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.search(rel_path):
+                ignored = not negate
+        return ignored
+
+
+class AssetScanner:
+    """Scandir-based scanner that prunes ignored trees and caches directory listings.
+
+    Each directory's filtered listing is cached with its mtime. On a re-scan,
+    every directory is still stat()ed (a child's changes do not touch its
+    parent's mtime), but only directories whose mtime changed are listed again.
+    """
+
+    def __init__(self, root: str, excludes: Optional[List[str]] = None,
+                 index_path: Optional[str] = None):
+        """Initialize the scanner.
+
+        Args:
+            root: Directory to scan
+            excludes: Paths or patterns to skip in addition to .gitignore
+                (defaults to DEFAULT_EXCLUDES)
+            index_path: Where to persist the directory index
+                (defaults to .asset-cache/scan-index.json under root)
+        """
+        self.root = os.path.abspath(root)
+        self.excludes = DEFAULT_EXCLUDES if excludes is None else excludes
+        self.index_path = index_path or os.path.join(self.root, CACHE_DIR_NAME, 'scan-index.json')
+        self.rules = IgnoreRules.for_root(self.root, self.excludes)
+        self.stats = {'listed': 0, 'reused': 0}
+
+    def _rules_fingerprint(self) -> str:
+        """Hash of everything that affects filtering, to invalidate the index."""
+        gitignore = os.path.join(self.root, '.gitignore')
+        content = ''
+        if os.path.exists(gitignore):
+            with open(gitignore, 'r') as f:
+                content = f.read()
+        return hashlib.sha256(json.dumps([content, self.excludes]).encode('utf-8')).hexdigest()
+
+    def _load_index(self, fingerprint: str) -> Dict[str, Dict]:
+        """Load the persisted directory index if it was built with the same rules."""
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == fingerprint:
+                return data['dirs']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save_index(self, fingerprint: str, dirs: Dict[str, Dict]) -> None:
+        """Persist the directory index."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'dirs': dirs}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _list_dir(self, path: str, rel_dir: str) -> Dict:
+        """List one directory, applying ignore rules to its entries."""
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.rules.is_ignored(rel_path, True):
+                        subdirs.append(entry.name)
+                elif entry.is_file() and not self.rules.is_ignored(rel_path, False):
+                    files.append(entry.name)
+        return {'files': sorted(files), 'dirs': sorted(subdirs)}
+
+    def scan(self, start: Optional[str] = None) -> List[str]:
+        """Return all non-ignored file paths under start (defaults to the root)."""
+        fingerprint = self._rules_fingerprint()
+        previous = self._load_index(fingerprint)
+        current: Dict[str, Dict] = {}
+        self.stats = {'listed': 0, 'reused': 0}
+        results = []
+
+        start = os.path.abspath(start or self.root)
+        start_rel = os.path.relpath(start, self.root)
+        prefix = '' if start_rel == '.' else start_rel.replace(os.sep, '/')
+        stack = [prefix]
+        while stack:
+            rel_dir = stack.pop()
+            path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = previous.get(rel_dir)
+            if cached and cached['mtime_ns'] == mtime_ns:
+                listing = cached
+                self.stats['reused'] += 1
+            else:
+                try:
+                    listing = dict(self._list_dir(path, rel_dir), mtime_ns=mtime_ns)
+                except OSError:
+                    continue
+                self.stats['listed'] += 1
+            current[rel_dir] = listing
+
+            results.extend(os.path.join(path, name) for name in listing['files'])
+            stack.extend(f"{rel_dir}/{name}" if rel_dir else name for name in listing['dirs'])
+
+        # Keep entries outside this scan's subtree so partial scans don't evict them
+        for rel_dir, listing in previous.items():
+            inside = not prefix or rel_dir == prefix or rel_dir.startswith(prefix + '/')
+            if not inside:
+                current.setdefault(rel_dir, listing)
+        self._save_index(fingerprint, current)
+        return sorted(results)
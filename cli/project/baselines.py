@@ -0,0 +1,355 @@
+"""Commit- and branch-keyed performance baselines.
+
+Benchmark samples are stored per commit by BenchmarkHistory. A baseline is
+a commit promoted for a branch in .perf-history/baselines.json, so each
+branch is compared with its own reference point instead of one global
+performance_baseline.json. Two refs can also be benchmarked side by side:
+both are checked out in temporary `git worktree`s and built alternately
+(A B, B A, ...), so drift in machine load during the session affects both
+sides equally, and only that session's samples are compared.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .benchmark_history import (DEFAULT_TOLERANCE, LEGACY_COMMIT, BenchmarkHistory, compare_samples,
+                                median)
+from .build_profiler import BuildProfiler, profile_samples
+from .page_weight import PageWeightAnalyzer, current_commit
+
+BASELINES_FILE = os.path.join('.perf-history', 'baselines.json')
+# Branches whose baseline is used when the current branch has none promoted
+DEFAULT_BRANCHES = ('main', 'master')
+DEFAULT_RUNS = 3
+
+
+def resolve_ref(project_path: str, ref: str) -> str:
+    """Full commit hash of a ref; the legacy baseline pseudo-commit is passed through.
+
+    Raises:
+        ValueError: If the ref does not name a commit
+    """
+    if ref == LEGACY_COMMIT:
+        return ref
+    try:
+        return subprocess.run(['git', 'rev-parse', '--verify', '--quiet', f"{ref}^{{commit}}"], cwd=project_path,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        raise ValueError(f"Unknown git ref: {ref}")
+
+
+def current_branch(project_path: str) -> Optional[str]:
+    """Checked-out branch name (None when detached or outside git)."""
+    try:
+        return subprocess.run(['git', 'symbolic-ref', '--short', '-q', 'HEAD'], cwd=project_path,
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def worktree(project_path: str, commit: str) -> Iterator[str]:
+    """Detached checkout of a commit in a temporary directory, removed on exit.
+
+    node_modules is linked from the project when package-lock.json is
+    unchanged, otherwise installed with `npm ci`.
+    """
+    parent = tempfile.mkdtemp(prefix='perf-worktree-')
+    path = os.path.join(parent, commit[:12])
+    try:
+        subprocess.run(['git', 'worktree', 'add', '--detach', path, commit], cwd=project_path,
+                       capture_output=True, text=True, check=True)
+        if os.path.exists(os.path.join(path, 'package.json')):
+            _install_dependencies(project_path, path)
+        yield path
+    finally:
+        subprocess.run(['git', 'worktree', 'remove', '--force', path], cwd=project_path, capture_output=True)
+        shutil.rmtree(parent, ignore_errors=True)
+        subprocess.run(['git', 'worktree', 'prune'], cwd=project_path, capture_output=True)
+
+
+def _read(path: str) -> Optional[bytes]:
+    """File contents, or None if it cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _install_dependencies(project_path: str, checkout: str) -> None:
+    """Reuse the project's node_modules for a checkout with the same lockfile."""
+    node_modules = os.path.join(project_path, 'node_modules')
+    lockfile = 'package-lock.json'
+    if os.path.isdir(node_modules) and _read(os.path.join(project_path, lockfile)) == _read(os.path.join(checkout, lockfile)):
+        os.symlink(node_modules, os.path.join(checkout, 'node_modules'), target_is_directory=True)
+        return
+    subprocess.run(['npm', 'ci', '--no-audit', '--no-fund'], cwd=checkout, capture_output=True, text=True, check=True)
+
+
+def benchmark_checkout(path: str) -> Dict[str, List[float]]:
+    """Build a checkout once and measure it.
+
+    Returns:
+        Dict[str, List[float]]: Build total and phase durations, and the
+        compressed weight of the whole site and of its heaviest page
+
+    Raises:
+        RuntimeError: If the build fails
+    """
+    profile = BuildProfiler(path).run(echo=False)
+    if profile['returncode'] != 0:
+        tail = '\n'.join(profile['output_tail'])
+        raise RuntimeError(f"Build failed with exit code {profile['returncode']}:\n{tail}")
+    samples = profile_samples(profile)
+
+    pages = PageWeightAnalyzer(path).analyze(budgets={})['pages']
+    samples['site.compressed_bytes'] = [sum(page['compressed_bytes'] for page in pages)]
+    samples['site.max_page_bytes'] = [max((page['compressed_bytes'] for page in pages), default=0)]
+    return samples
+
+
+class BaselineStore:
+    """Promoted baseline commit per branch, on top of the per-commit benchmark history."""
+
+    def __init__(self, project_path: str):
+        """Initialize the store.
+
+        Args:
+            project_path: Root path of the project
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.path = os.path.join(self.project_path, BASELINES_FILE)
+        self.history = BenchmarkHistory(self.project_path)
+
+    def branches(self) -> Dict[str, Dict[str, Any]]:
+        """Branch name to its promoted baseline ({'commit', 'promoted'})."""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('branches', {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, branches: Dict[str, Dict[str, Any]]) -> None:
+        """Persist the branch baselines."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'branches': branches}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def baseline_for(self, branch: Optional[str] = None) -> Optional[str]:
+        """Baseline commit of a branch (defaults to the current one).
+
+        Falls back to the baseline of the default branch, then to values
+        migrated from performance_baseline.json (see migrate_legacy()).
+        """
+        branches = self.branches()
+        for name in (branch or current_branch(self.project_path),) + DEFAULT_BRANCHES:
+            if name in branches:
+                return branches[name]['commit']
+        return LEGACY_COMMIT if LEGACY_COMMIT in self.history.stored_commits() else None
+
+    def migrate_legacy(self) -> bool:
+        """Import performance_baseline.json into the history as the fallback baseline.
+
+        Returns:
+            bool: True if values were imported, False if there was nothing
+            to import or it was imported before
+        """
+        return self.history.migrate_legacy_baseline()
+
+    def require_baseline(self, branch: Optional[str] = None) -> str:
+        """Like baseline_for(), but raise when there is no baseline.
+
+        Raises:
+            ValueError: If no baseline applies to the branch
+        """
+        commit = self.baseline_for(branch)
+        if commit is None:
+            raise ValueError("No baseline promoted for this branch; capture and promote one first")
+        return commit
+
+    def baseline_metrics(self, branch: Optional[str] = None) -> Dict[str, float]:
+        """Median of each metric of a branch's baseline (empty if it has none)."""
+        commit = self.baseline_for(branch)
+        if commit is None:
+            return {}
+        return {metric: median(values) for metric, values in self.history.load(commit)['metrics'].items() if values}
+
+    def capture(self, ref: Optional[str] = None, runs: int = DEFAULT_RUNS) -> Dict[str, Any]:
+        """Benchmark a commit and add the samples to its history.
+
+        Args:
+            ref: Commit to check out and build in a worktree; None builds the
+                working tree as it is (recorded under HEAD, flagged if dirty)
+            runs: Builds to measure
+
+        Returns:
+            Dict[str, Any]: commit and the samples of this capture
+        """
+        if ref is None:
+            commit, _ = current_commit(self.project_path)
+            samples = self._run(self.project_path, runs)
+            self.history.record(samples)
+        else:
+            commit = resolve_ref(self.project_path, ref)
+            with worktree(self.project_path, commit) as path:
+                samples = self._run(path, runs)
+            self.history.record(samples, commit=commit)
+        return {'commit': commit, 'samples': samples}
+
+    @staticmethod
+    def _run(path: str, runs: int) -> Dict[str, List[float]]:
+        samples: Dict[str, List[float]] = {}
+        for _ in range(runs):
+            for metric, values in benchmark_checkout(path).items():
+                samples.setdefault(metric, []).extend(values)
+        return samples
+
+    def promote(self, ref: str = 'HEAD', branch: Optional[str] = None) -> Dict[str, Any]:
+        """Make a captured commit the baseline of a branch (defaults to the current one).
+
+        Raises:
+            ValueError: If the commit has no samples or no branch is given
+                while HEAD is detached
+        """
+        commit = resolve_ref(self.project_path, ref)
+        if commit not in self.history.stored_commits():
+            raise ValueError(f"No benchmark samples for {ref} ({commit[:10]}); capture it first")
+        branch = branch or current_branch(self.project_path)
+        if not branch:
+            raise ValueError("HEAD is detached; name the branch to promote the baseline for")
+
+        branches = self.branches()
+        entry = {'commit': commit, 'promoted': time.time()}
+        if branch in branches and branches[branch]['commit'] != commit:
+            entry['previous'] = branches[branch]['commit']
+        branches[branch] = entry
+        self._save(branches)
+        return dict(entry, branch=branch)
+
+    def compare(self, base_ref: Optional[str] = None, head_ref: str = 'HEAD') -> Dict[str, Any]:
+        """Compare the stored samples of two commits.
+
+        Args:
+            base_ref: Base commit (defaults to the current branch's baseline)
+            head_ref: Commit compared against it
+
+        Raises:
+            ValueError: If either side has no samples
+        """
+        base = resolve_ref(self.project_path, base_ref) if base_ref else self.require_baseline()
+        head = resolve_ref(self.project_path, head_ref)
+        runs = {}
+        for label, commit in (('base', base), ('head', head)):
+            runs[label] = self.history.load(commit)['metrics']
+            if not runs[label]:
+                raise ValueError(f"No benchmark samples for {commit[:10]}; capture it first")
+        return self._compare(base, head, runs['base'], runs['head'])
+
+    def compare_worktrees(self, base_ref: str, head_ref: str = 'HEAD', runs: int = DEFAULT_RUNS) -> Dict[str, Any]:
+        """Build and benchmark two refs in side-by-side worktrees, alternating between them.
+
+        The samples are added to both commits' histories, but only this
+        session's samples are compared.
+        """
+        commits = [resolve_ref(self.project_path, base_ref), resolve_ref(self.project_path, head_ref)]
+        if LEGACY_COMMIT in commits:
+            raise ValueError("The legacy baseline has no commit to build; name a base ref")
+        samples: List[Dict[str, List[float]]] = [{}, {}]
+        with worktree(self.project_path, commits[0]) as base_path, \
+                worktree(self.project_path, commits[1]) as head_path:
+            paths = [base_path, head_path]
+            for round_index in range(runs):
+                order = (0, 1) if round_index % 2 == 0 else (1, 0)
+                for side in order:
+                    for metric, values in benchmark_checkout(paths[side]).items():
+                        samples[side].setdefault(metric, []).extend(values)
+
+        for commit, side_samples in zip(commits, samples):
+            self.history.record(side_samples, commit=commit)
+        return dict(self._compare(commits[0], commits[1], samples[0], samples[1]), rounds=runs)
+
+    def _compare(self, base: str, head: str, base_samples: Dict[str, Sequence[float]],
+                 head_samples: Dict[str, Sequence[float]]) -> Dict[str, Any]:
+        """Per-metric comparison, regressions first, then by size of change."""
+        tolerances = self.history.load_tolerances()
+        default = dict(DEFAULT_TOLERANCE, **tolerances.get('default', {}))
+        metrics = []
+        for metric in sorted(set(base_samples) & set(head_samples)):
+            if not base_samples[metric] or not head_samples[metric]:
+                continue
+            result = compare_samples(base_samples[metric], head_samples[metric],
+                                     dict(default, **tolerances.get(metric, {})))
+            metrics.append(dict(result, metric=metric, base_runs=len(base_samples[metric]),
+                                head_runs=len(head_samples[metric])))
+        metrics.sort(key=lambda row: (not row['regression'], -abs(row['change'])))
+        return {'base': base, 'head': head, 'metrics': metrics,
+                'regressions': sum(1 for row in metrics if row['regression'])}
+
+
+def format_comparison(comparison: Dict[str, Any]) -> List[str]:
+    """Printable per-metric table of a comparison."""
+    lines = [f"{comparison['base'][:10]} -> {comparison['head'][:10]}"
+             + (f" ({comparison['rounds']} alternating rounds)" if comparison.get('rounds') else '')]
+    for row in comparison['metrics']:
+        marker = 'REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['metric']:<28}{row['baseline_median']:>12g}{row['current_median']:>12g}"
+                     f"{row['change'] * 100:>+8.1f}%  p={row['p_value']:.3f}  {marker}".rstrip())
+    lines.append(f"{comparison['regressions']} regression(s) in {len(comparison['metrics'])} metrics")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point for baselines.
+
+    `baseline [list]`, `baseline capture [ref] [runs]`, `baseline promote [ref] [branch]`,
+    `baseline compare [base] [head]` (stored samples),
+    `baseline ab <base> [head] [runs]` (side-by-side worktree builds) and
+    `baseline migrate` (import performance_baseline.json).
+    Comparisons exit 1 on regressions.
+    """
+    argv = list(argv or [])
+    action = argv.pop(0) if argv else 'list'
+    store = BaselineStore(os.getcwd())
+    try:
+        if action == 'list':
+            for branch, entry in sorted(store.branches().items()):
+                print(f"{branch:<24}{entry['commit'][:10]}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['promoted']))}")
+            print(f"Current baseline: {store.baseline_for() or 'none'}")
+            return 0
+        if action == 'capture':
+            result = store.capture(argv[0] if argv and argv[0] != 'working-tree' else None,
+                                   int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS)
+            for metric, values in sorted(result['samples'].items()):
+                print(f"{metric:<28}{median(values):>12g}  ({len(values)} runs)")
+            print(f"Captured {result['commit'][:10]}")
+            return 0
+        if action == 'promote':
+            entry = store.promote(argv[0] if argv else 'HEAD', argv[1] if len(argv) > 1 else None)
+            print(f"Baseline for {entry['branch']} is now {entry['commit'][:10]}")
+            return 0
+        if action == 'migrate':
+            print("Imported performance_baseline.json" if store.migrate_legacy()
+                  else "Nothing to migrate")
+            return 0
+        if action == 'compare':
+            comparison = store.compare(argv[0] if argv else None, argv[1] if len(argv) > 1 else 'HEAD')
+        elif action == 'ab' and argv:
+            comparison = store.compare_worktrees(argv[0], argv[1] if len(argv) > 1 else 'HEAD',
+                                                 int(argv[2]) if len(argv) > 2 else DEFAULT_RUNS)
+        else:
+            print(main.__doc__)
+            return 2
+    except (ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}")
+        return 2
+    print('\n'.join(format_comparison(comparison)))
+    return 1 if comparison['regressions'] else 0
@@ -0,0 +1,307 @@
+"""Benchmark history store and statistical regression detection.
+
+Every benchmark run appends raw samples per metric to a file for the
+current commit under .perf-history/benchmarks. Regressions are detected by
+comparing a commit's samples with the pooled samples of the commits before
+it: the median shift must exceed the metric's tolerance and a one-sided
+Mann-Whitney U test must find it significant, so a single noisy run on a
+shared machine does not raise an alarm. Series too short for the rank test
+(one sample per commit) use a robust z-score against the baseline's
+spread instead.
+"""
+
+import json
+import math
+import os
+import subprocess
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .page_weight import current_commit
+
+HISTORY_DIR = os.path.join('.perf-history', 'benchmarks')
+TOLERANCES_FILE = 'performance-tolerances.json'
+LEGACY_BASELINE_FILE = 'performance_baseline.json'
+# Pseudo-commit holding values migrated from performance_baseline.json; always ordered first
+LEGACY_COMMIT = 'legacy-baseline'
+
+# Relative median change tolerated before a shift can count as a regression
+DEFAULT_TOLERANCE = {'tolerance': 0.05, 'higher_is_better': False}
+SIGNIFICANCE = 0.05
+# Commits pooled into the baseline a commit is compared against
+BASELINE_WINDOW = 5
+
+# Exact U distribution is used up to this many samples in total (without ties)
+_EXACT_LIMIT = 30
+
+# Shift, in units of the baseline's scaled MAD, that counts as significant
+# when there are too few samples for the rank test (e.g. one per commit)
+ROBUST_Z_THRESHOLD = 3.0
+
+
+def median(values: Sequence[float]) -> float:
+    """Median of a non-empty sequence."""
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def mad(values: Sequence[float]) -> float:
+    """Median absolute deviation."""
+    center = median(values)
+    return median([abs(value - center) for value in values])
+
+
+@lru_cache(maxsize=None)
+def _u_counts(n1: int, n2: int) -> Tuple[int, ...]:
+    """Number of rank orderings giving each U statistic value (no ties)."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # Largest element belongs to sample 1 (adds n2 to U) or to sample 2 (adds nothing)
+    with_first = _u_counts(n1 - 1, n2)
+    with_second = _u_counts(n1, n2 - 1)
+    counts = [0] * (n1 * n2 + 1)
+    for u, count in enumerate(with_first):
+        counts[u + n2] += count
+    for u, count in enumerate(with_second):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(baseline: Sequence[float], current: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U test that `current` tends to be larger than `baseline`.
+
+    Uses the exact distribution for small samples without ties and the
+    tie-corrected normal approximation otherwise.
+
+    Returns:
+        float: p-value
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    pooled = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+
+    if tie_term == 0 and n <= _EXACT_LIMIT:
+        counts = _u_counts(n1, n2)
+        return sum(counts[math.ceil(u):]) / sum(counts)
+
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def min_p_value(n1: int, n2: int) -> float:
+    """Smallest one-sided p-value the exact U test can give for these sample sizes."""
+    return 1 / math.comb(n1 + n2, n1) if n1 and n2 else 1.0
+
+
+def compare_samples(baseline: Sequence[float], current: Sequence[float],
+                    tolerance: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare two sample sets for one metric.
+
+    With enough samples a shift beyond the tolerance must also pass the
+    Mann-Whitney test. Series with too few samples for that test to ever
+    reach SIGNIFICANCE (one sample per commit, as build and load timings
+    record) fall back to the robust z-score: the shift must exceed
+    ROBUST_Z_THRESHOLD scaled MADs of the baseline, or just the tolerance
+    when the baseline has no spread.
+
+    Returns:
+        Dict[str, Any]: medians, relative change, robust z-score (shift in
+        units of scaled MAD), p-value, the test used ('mann-whitney' or
+        'robust-z') and whether it is a regression
+    """
+    higher_is_better = tolerance.get('higher_is_better', False)
+    base_median, current_median = median(baseline), median(current)
+    change = (current_median - base_median) / abs(base_median) if base_median else 0.0
+    spread = 1.4826 * mad(baseline)
+    worse = -change if higher_is_better else change
+    if higher_is_better:
+        p_value = mann_whitney_greater([-v for v in baseline], [-v for v in current])
+    else:
+        p_value = mann_whitney_greater(baseline, current)
+    robust_z = (current_median - base_median) / spread if spread else None
+    if min_p_value(len(current), len(baseline)) >= SIGNIFICANCE:
+        method = 'robust-z'
+        worse_z = None if robust_z is None else (-robust_z if higher_is_better else robust_z)
+        significant = worse_z is None or worse_z > ROBUST_Z_THRESHOLD
+    else:
+        method = 'mann-whitney'
+        significant = p_value < SIGNIFICANCE
+    return {
+        'baseline_median': base_median,
+        'current_median': current_median,
+        'change': change,
+        'robust_z': robust_z,
+        'p_value': p_value,
+        'method': method,
+        'regression': worse > tolerance.get('tolerance', DEFAULT_TOLERANCE['tolerance']) and significant
+    }
+
+
+class BenchmarkHistory:
+    """Per-commit store of benchmark samples."""
+
+    def __init__(self, project_path: str):
+        """Initialize the store.
+
+        Args:
+            project_path: Root path of the project
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.history_dir = os.path.join(self.project_path, HISTORY_DIR)
+
+    def _path(self, commit: str) -> str:
+        """File holding a commit's samples."""
+        return os.path.join(self.history_dir, f"{commit}.json")
+
+    def load(self, commit: str) -> Dict[str, Any]:
+        """Stored run data for a commit (empty if none)."""
+        try:
+            with open(self._path(commit), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'commit': commit, 'metrics': {}}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        """Persist a commit's run data."""
+        os.makedirs(self.history_dir, exist_ok=True)
+        path = self._path(data['commit'])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def record(self, samples: Dict[str, Sequence[float]], commit: Optional[str] = None) -> Dict[str, Any]:
+        """Append samples per metric to a commit (defaults to HEAD).
+
+        Returns:
+            Dict[str, Any]: The commit's updated run data
+        """
+        dirty = False
+        if commit is None:
+            commit, dirty = current_commit(self.project_path)
+        data = self.load(commit)
+        data['updated'] = time.time()
+        data['dirty'] = data.get('dirty', False) or dirty
+        for metric, values in samples.items():
+            data['metrics'].setdefault(metric, []).extend(float(value) for value in values)
+        self._save(data)
+        return data
+
+    def stored_commits(self) -> List[str]:
+        """Commits with stored samples."""
+        if not os.path.isdir(self.history_dir):
+            return []
+        return [name[:-5] for name in os.listdir(self.history_dir) if name.endswith('.json')]
+
+    def ordered_commits(self, head: str = 'HEAD') -> List[str]:
+        """Stored commits in history order (oldest first) up to head, legacy baseline first."""
+        stored = set(self.stored_commits())
+        try:
+            history = subprocess.run(['git', 'rev-list', '--reverse', '--max-count=1000', head],
+                                     cwd=self.project_path, capture_output=True, text=True,
+                                     check=True).stdout.split()
+        except (OSError, subprocess.CalledProcessError):
+            history = []
+        ordered = [commit for commit in history if commit in stored]
+        return ([LEGACY_COMMIT] if LEGACY_COMMIT in stored else []) + ordered
+
+    def load_tolerances(self) -> Dict[str, Dict[str, Any]]:
+        """Per-metric tolerances from performance-tolerances.json.
+
+        The file maps metric names to {"tolerance": 0.05, "higher_is_better": false};
+        a "default" entry overrides DEFAULT_TOLERANCE.
+        """
+        path = os.path.join(self.project_path, TOLERANCES_FILE)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def migrate_legacy_baseline(self) -> bool:
+        """Import performance_baseline.json as the oldest entry of the store.
+
+        The legacy file is left in place; it is only imported once.
+
+        Returns:
+            bool: True if values were imported
+        """
+        legacy_path = os.path.join(self.project_path, LEGACY_BASELINE_FILE)
+        if not os.path.exists(legacy_path) or LEGACY_COMMIT in self.stored_commits():
+            return False
+        with open(legacy_path, 'r') as f:
+            values = json.load(f)
+        samples = {metric: [value] for metric, value in values.items() if isinstance(value, (int, float))}
+        self.record(samples, commit=LEGACY_COMMIT)
+        return True
+
+    def detect_regressions(self, head: str = 'HEAD', window: int = BASELINE_WINDOW) -> List[Dict[str, Any]]:
+        """Find regressions along the history and the commit where each first appeared.
+
+        Each commit is compared with the pooled samples of up to `window`
+        earlier commits. After a regression the baseline restarts at the
+        regressing commit, so a lasting shift is reported once, at its onset.
+
+        Returns:
+            List[Dict[str, Any]]: metric, first_commit, comparison details and
+            whether the regression is still present at head
+        """
+        commits = self.ordered_commits(head)
+        runs = {commit: self.load(commit)['metrics'] for commit in commits}
+        tolerances = self.load_tolerances()
+        default = dict(DEFAULT_TOLERANCE, **tolerances.get('default', {}))
+        metrics = sorted({metric for samples in runs.values() for metric in samples})
+
+        regressions = []
+        for metric in metrics:
+            tolerance = dict(default, **tolerances.get(metric, {}))
+            series = [(commit, runs[commit][metric]) for commit in commits if runs[commit].get(metric)]
+            start = 0
+            for index in range(1, len(series)):
+                baseline = [v for _, values in series[max(start, index - window):index] for v in values]
+                if not baseline:
+                    continue
+                result = compare_samples(baseline, series[index][1], tolerance)
+                if result['regression']:
+                    regressions.append(dict(result, metric=metric, first_commit=series[index][0]))
+                    start = index
+
+            # A regression persists if head is still worse than that regression's baseline
+            for regression in (r for r in regressions if r['metric'] == metric):
+                latest = series[-1][1]
+                baseline_median = regression['baseline_median']
+                change = (median(latest) - baseline_median) / abs(baseline_median) if baseline_median else 0.0
+                worse = -change if tolerance['higher_is_better'] else change
+                regression['present_at_head'] = worse > tolerance['tolerance']
+        return regressions
+
+
+def format_report(regressions: List[Dict[str, Any]]) -> List[str]:
+    """Printable lines for a regression list."""
+    lines = []
+    for r in regressions:
+        status = 'still present' if r.get('present_at_head') else 'since recovered'
+        z = f", z={r['robust_z']:.1f}" if r['robust_z'] is not None else ''
+        lines.append(f"{r['metric']}: {r['change'] * 100:+.1f}% at {r['first_commit'][:10]} "
+                     f"({r['baseline_median']:g} -> {r['current_median']:g}, p={r['p_value']:.3f}{z}; {status})")
+    return lines
@@ -0,0 +1,297 @@
+"""Build phase timing for Astro/Vite builds.
+
+The build runs with every output line stamped with its offset from the
+start. The phase markers Astro prints (content sync, type generation,
+server and client builds, static route generation, image optimization)
+split the run into phases, and the per-route lines of static generation
+give the render time of every page. Runs are appended to
+.perf-history/builds.jsonl for trends, and their durations are recorded in
+the benchmark history so build slowdowns go through regression detection.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from .benchmark_history import BenchmarkHistory
+from .page_weight import current_commit
+from .process_tracker import ProcessTreeTracker
+from .resource_sampler import sparkline
+
+BUILD_LOG = os.path.join('.perf-history', 'builds.jsonl')
+BUILD_COMMAND = ['npm', 'run', 'build']
+
+# Output before the first Astro marker (e.g. the build:css step of `npm run build`)
+PRELUDE_PHASE = 'prebuild'
+
+_ANSI = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+# Astro prefixes most lines with a wall clock time
+_CLOCK = re.compile(r'^\d{1,2}:\d{2}:\d{2}\s+')
+
+# (phase, pattern) in the order Astro prints them; a match starts the phase
+PHASE_MARKERS: Tuple[Tuple[str, Pattern], ...] = (
+    ('content', re.compile(r'\[content\] Syncing content')),
+    ('types', re.compile(r'\[types\] Generat')),
+    ('build-info', re.compile(r'\[build\] Collecting build info')),
+    ('server', re.compile(r'\[build\] Building (static|server) entrypoints|^building server\b')),
+    ('client', re.compile(r'^building client\b')),
+    ('routes', re.compile(r'^generating static routes')),
+    ('images', re.compile(r'^generating optimized images')),
+    ('finalize', re.compile(r'\[build\] Rearranging server assets|\[@astrojs/sitemap\]')),
+)
+_END = re.compile(r'\[build\] (\d+ page\(s\) built in|Complete!)')
+# Durations Astro/Vite report themselves: "Generated 512ms", "✓ built in 2.5s", "Completed in 600ms."
+_REPORTED = re.compile(r'(?:Generated|built in|Completed in)\s+(\d+(?:\.\d+)?)(ms|s)\b')
+_ROUTE_SOURCE = re.compile(r'^▶\s+(\S+)')
+_ROUTE = re.compile(r'^[├└]─\s+(\S+)\s+\(\+(\d+(?:\.\d+)?)(ms|s)\)')
+
+
+def _seconds(value: str, unit: str) -> float:
+    """Convert a reported duration to seconds."""
+    return float(value) / 1000 if unit == 'ms' else float(value)
+
+
+def clean_line(line: str) -> str:
+    """Strip colour codes, the clock prefix and surrounding whitespace."""
+    return _CLOCK.sub('', _ANSI.sub('', line).strip()).strip()
+
+
+def parse_build_log(lines: Sequence[Tuple[float, str]]) -> Dict[str, Any]:
+    """Split a timestamped build log into phases and route timings.
+
+    Args:
+        lines: (seconds since start, raw output line) pairs
+
+    Returns:
+        Dict[str, Any]: 'phases' (name, start, seconds, reported seconds if
+        Astro printed one), 'routes' (path, source, seconds; slowest first)
+        and 'total_seconds'
+    """
+    phases: List[Dict[str, Any]] = []
+    routes: List[Dict[str, Any]] = []
+    source = None
+    end = lines[-1][0] if lines else 0.0
+    finished = None
+
+    current = {'name': PRELUDE_PHASE, 'start': 0.0, 'reported': None}
+    for offset, raw in lines:
+        text = clean_line(raw)
+        if not text:
+            continue
+        for name, pattern in PHASE_MARKERS:
+            if pattern.search(text) and name != current['name']:
+                phases.append(current)
+                current = {'name': name, 'start': offset, 'reported': None}
+                break
+
+        if _END.search(text):
+            if finished is None:
+                finished = offset
+            continue
+        reported = _REPORTED.search(text)
+        if reported:
+            current['reported'] = _seconds(*reported.groups())
+
+        source_match = _ROUTE_SOURCE.match(text)
+        if source_match:
+            source = source_match.group(1)
+            continue
+        route = _ROUTE.match(text)
+        if route:
+            path, value, unit = route.groups()
+            routes.append({'path': path, 'source': source, 'seconds': _seconds(value, unit)})
+    phases.append(current)
+
+    stop = finished if finished is not None else end
+    for phase, following in zip(phases, phases[1:] + [None]):
+        phase_end = following['start'] if following else stop
+        phase['seconds'] = round(max(phase_end - phase['start'], 0.0), 3)
+        phase['start'] = round(phase['start'], 3)
+    # Drop an empty prelude (builds run directly with `astro build`)
+    phases = [p for p in phases if p['name'] != PRELUDE_PHASE or p['seconds'] > 0]
+
+    routes.sort(key=lambda route: route['seconds'], reverse=True)
+    return {'phases': phases, 'routes': routes, 'total_seconds': round(end, 3)}
+
+
+def profile_samples(profile: Dict[str, Any]) -> Dict[str, List[float]]:
+    """Benchmark samples of one run: the total and every phase duration."""
+    samples = {'build.total_seconds': [profile['total_seconds']]}
+    for phase in profile['phases']:
+        samples[f"build.phase.{phase['name']}"] = [phase['seconds']]
+    return samples
+
+
+class BuildProfiler:
+    """Runs the project build and records phase and route timings."""
+
+    def __init__(self, project_path: str):
+        """Initialize the profiler.
+
+        Args:
+            project_path: Root path of the project
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.log_path = os.path.join(self.project_path, BUILD_LOG)
+
+    def run(self, command: Optional[List[str]] = None, echo: bool = True) -> Dict[str, Any]:
+        """Run the build, timestamping each output line as it arrives.
+
+        Args:
+            command: Build command (defaults to `npm run build`)
+            echo: Print the build output while it runs
+
+        Returns:
+            Dict[str, Any]: Parsed timings plus commit, return code, resource
+            usage of the build's process tree and the tail of the output
+
+        Raises:
+            RuntimeError: If the build command cannot be started (e.g. npm is missing)
+        """
+        command = command or BUILD_COMMAND
+        env = dict(os.environ, FORCE_COLOR='0', NO_COLOR='1')
+        started = time.time()
+        start = time.monotonic()
+        lines: List[Tuple[float, str]] = []
+
+        try:
+            process = subprocess.Popen(command, cwd=self.project_path, env=env, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True, bufsize=1)
+        except OSError as e:
+            raise RuntimeError(f"Cannot run `{' '.join(command)}`: {e.strerror or e}") from e
+        with ProcessTreeTracker(process.pid, label=' '.join(command)) as tracker:
+            for line in process.stdout:
+                lines.append((time.monotonic() - start, line.rstrip('\n')))
+                if echo:
+                    print(f"{lines[-1][0]:7.2f}s  {line}", end='')
+            process.wait()
+        lines.append((time.monotonic() - start, ''))
+
+        commit, dirty = current_commit(self.project_path)
+        profile = parse_build_log(lines)
+        profile.update({
+            'timestamp': started,
+            'commit': commit,
+            'dirty': dirty,
+            'command': ' '.join(command),
+            'returncode': process.returncode,
+            'resources': tracker.stats,
+            'output_tail': [text for _, text in lines[-20:] if text]
+        })
+        return profile
+
+    def save(self, profile: Dict[str, Any]) -> None:
+        """Append a run to the build log and its durations to the benchmark history.
+
+        Failed builds are logged but kept out of the benchmark history.
+        """
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        record = {key: value for key, value in profile.items() if key != 'output_tail'}
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        if profile['returncode'] != 0:
+            return
+        BenchmarkHistory(self.project_path).record(profile_samples(profile), commit=profile['commit'])
+
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Logged successful runs, oldest first."""
+        runs = []
+        if not os.path.exists(self.log_path):
+            return runs
+        with open(self.log_path, 'r') as f:
+            for line in f:
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    continue
+                if run.get('returncode') == 0:
+                    runs.append(run)
+        return runs[-limit:] if limit else runs
+
+    def trends(self, limit: int = 30) -> Dict[str, List[float]]:
+        """Seconds per run for the total and each phase over the last runs.
+
+        Runs without a phase count as 0 for it, so every series lines up with
+        the run list.
+        """
+        runs = self.history(limit)
+        names: List[str] = []
+        for run in runs:
+            for phase in run['phases']:
+                if phase['name'] not in names:
+                    names.append(phase['name'])
+        series = {'total': [run['total_seconds'] for run in runs]}
+        for name in names:
+            series[name] = [next((p['seconds'] for p in run['phases'] if p['name'] == name), 0.0)
+                            for run in runs]
+        return series
+
+    def route_trends(self, limit: int = 30) -> Dict[str, List[float]]:
+        """Render seconds per route over the last runs (routes missing from a run are skipped)."""
+        series: Dict[str, List[float]] = {}
+        for run in self.history(limit):
+            for route in run.get('routes', []):
+                series.setdefault(route['path'], []).append(route['seconds'])
+        return series
+
+
+def format_profile(profile: Dict[str, Any], routes: int = 10) -> List[str]:
+    """Printable phase table and slowest routes for one run."""
+    total = profile['total_seconds'] or 1.0
+    lines = [f"{'Phase':<12}{'Seconds':>9}{'Share':>8}{'Reported':>10}"]
+    for phase in profile['phases']:
+        reported = f"{phase['reported']:.2f}s" if phase.get('reported') is not None else '-'
+        lines.append(f"{phase['name']:<12}{phase['seconds']:>8.2f}s{phase['seconds'] / total * 100:>7.1f}%{reported:>10}")
+    lines.append(f"{'total':<12}{profile['total_seconds']:>8.2f}s")
+    if profile['routes']:
+        lines.append('')
+        lines.append(f"Slowest of {len(profile['routes'])} routes:")
+        for route in profile['routes'][:routes]:
+            lines.append(f"{route['seconds'] * 1000:>8.0f}ms  {route['path']}  ({route['source']})")
+    return lines
+
+
+def format_trends(trends: Dict[str, List[float]], width: int = 30) -> List[str]:
+    """Printable sparkline per phase; all rows share the total's scale."""
+    if not trends.get('total'):
+        return []
+    ceiling = max(trends['total'])
+    return [f"{name:<12}{sparkline(values, width, ceiling)}  last {values[-1]:.2f}s"
+            for name, values in trends.items()]
+
+
+USAGE = "Usage: build-profile [project_path [build command...]]  (default: . and `npm run build`)"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: profile one build, store it, print the tables and trends."""
+    argv = argv or []
+    if argv and argv[0] in ('-h', '--help'):
+        print(USAGE)
+        return 0
+    if argv and (argv[0].startswith('-') or not os.path.isdir(argv[0])):
+        problem = 'Unknown option' if argv[0].startswith('-') else 'Not a project directory'
+        print(f"{problem}: {argv[0]}\n{USAGE}", file=sys.stderr)
+        return 2
+    profiler = BuildProfiler(argv[0] if argv else os.getcwd())
+    try:
+        profile = profiler.run(argv[1:] or None, echo=False)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 127
+    profiler.save(profile)
+    if profile['returncode'] != 0:
+        print('\n'.join(profile['output_tail']), file=sys.stderr)
+        print(f"Build failed with exit code {profile['returncode']}", file=sys.stderr)
+        return profile['returncode']
+    print('\n'.join(format_profile(profile)))
+    trend_lines = format_trends(profiler.trends())
+    if trend_lines:
+        print(f"\nTrend over the last {len(profiler.history(30))} builds:")
+        print('\n'.join(trend_lines))
+    return 0
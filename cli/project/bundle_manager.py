@@ -1,6 +1,8 @@
 """Bundle analysis and optimization functionality."""
 
+import os
 from typing import List, Dict, Any, Optional
+from .chunk_analyzer import ChunkAnalyzer, format_report
 
 class BundleManager:
     """Handles bundle analysis and optimization."""
@@ -10,9 +12,13 @@ class BundleManager:
     def analyze_bundle_size(self) -> bool:
         """Analyze bundle size and composition."""
         try:
-            # Use webpack-bundle-analyzer
-            command = "npx webpack-bundle-analyzer dist/stats.json"
-            return self.ui.run_command(command)
+            report = ChunkAnalyzer(os.getcwd()).analyze()
+            if not report['chunks']:
+                self.ui.status_bar.update(f"No JavaScript chunks in {report['site_root']}/; run the build first", 3)
+                return False
+            for line in format_report(report):
+                print(line)
+            return True
         except Exception as e:
             self.ui.status_bar.update(f"Bundle analysis error: {str(e)}", 3)
             return False
@@ -63,11 +69,7 @@ class BundleManager:
     def get_bundle_stats(self) -> Optional[Dict[str, Any]]:
         """Get bundle statistics."""
         try:
-            # Generate and read stats
-            self.ui.run_command("npx webpack --json > stats.json")
-            import json
-            with open("stats.json", "r") as f:
-                return json.load(f)
+            return ChunkAnalyzer(os.getcwd()).analyze()
         except Exception as e:
             self.ui.status_bar.update(f"Error getting bundle stats: {str(e)}", 3)
             return None
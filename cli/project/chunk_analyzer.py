@@ -0,0 +1,343 @@
+"""Code-splitting analysis of a Vite/Astro build.
+
+The emitted JavaScript chunks (dist/_astro/*.js) are parsed for their static
+and dynamic imports to rebuild the chunk graph, and every built page is
+parsed for the scripts, module preloads and island component/renderer URLs
+it loads. Each route then maps to the chunks it loads eagerly (the static
+import closure of its entries) and lazily (reachable only through dynamic
+imports). Vite's manifest.json, when the build emits one, names the source
+entry of each chunk; sourcemaps, when emitted, list the modules bundled into
+each chunk so modules duplicated across chunks can be found.
+"""
+
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from .page_weight import BROTLI_AVAILABLE, PageWeightAnalyzer
+
+# Locations Vite writes the manifest to when build.manifest is enabled
+MANIFEST_PATHS = (os.path.join('.vite', 'manifest.json'), 'manifest.json')
+
+# Directory Astro emits bundled assets to
+ASSETS_DIR = '_astro'
+
+# Chunks above this raw size are flagged for splitting (webpack's default hint)
+LARGE_CHUNK_BYTES = 244000
+
+_JS_EXTENSIONS = ('.js', '.mjs')
+# Minified ESM: import{a as b}from"./x.js"; import"./x.js"; export{c}from"./x.js"
+_STATIC_IMPORT = re.compile(r"""\b(?:import|export)\s*(?:[\w$*{}\s,]*?from\s*)?["']([^"'\s]+\.m?js)["']""")
+_DYNAMIC_IMPORT = re.compile(r"""\bimport\(\s*["']([^"'\s]+\.m?js)["']\s*\)""")
+
+
+def find_imports(source: str) -> Tuple[Set[str], Set[str]]:
+    """Static and dynamic import specifiers of a JavaScript module."""
+    return set(_STATIC_IMPORT.findall(source)), set(_DYNAMIC_IMPORT.findall(source))
+
+
+class _PageScripts(HTMLParser):
+    """Collects the JavaScript a page loads: module scripts, preloads and island URLs."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls: List[str] = []
+        self.inline: List[str] = []
+        self.islands: List[Dict[str, str]] = []
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script':
+            if attrs.get('src'):
+                self.urls.append(attrs['src'])
+            else:
+                self._in_script = True
+        elif tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'modulepreload' in rel and attrs.get('href'):
+                self.urls.append(attrs['href'])
+        elif tag == 'astro-island':
+            for key in ('component-url', 'renderer-url', 'before-hydration-url'):
+                if attrs.get(key):
+                    self.urls.append(attrs[key])
+            try:
+                name = json.loads(attrs.get('opts') or '{}').get('name', '')
+            except ValueError:
+                name = ''
+            self.islands.append({'name': name, 'url': attrs.get('component-url', ''),
+                                 'client': attrs.get('client', '')})
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.inline.append(data)
+
+
+def route_of(page: str) -> str:
+    """URL route of a built page path relative to the site root."""
+    route = '/' + page.replace(os.sep, '/')
+    if route.endswith('/index.html'):
+        return route[:-len('index.html')]
+    return route[:-len('.html')] if route.endswith('.html') else route
+
+
+class ChunkAnalyzer:
+    """Maps routes to the chunks they load and finds duplicated modules."""
+
+    def __init__(self, project_path: str, weights: Optional[PageWeightAnalyzer] = None):
+        """Initialize the analyzer.
+
+        Args:
+            project_path: Root path of the project
+            weights: Page weight analyzer reused for page discovery, URL
+                resolution and cached compressed sizes
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.weights = weights or PageWeightAnalyzer(self.project_path)
+        self.site_root = self.weights.site_root()
+        self.compression = 'brotli' if BROTLI_AVAILABLE else 'gzip'
+
+    def _rel(self, path: str) -> str:
+        """Path relative to the site root, with forward slashes."""
+        return os.path.relpath(path, self.site_root).replace(os.sep, '/')
+
+    def _resolve(self, referrer: str, url: str) -> Optional[str]:
+        """Resolve a script URL or import specifier to an emitted JS file."""
+        if urlsplit(url).scheme:
+            return None
+        path = self.weights.resolve(self.site_root, referrer, url)
+        return path if path and path.endswith(_JS_EXTENSIONS) else None
+
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Vite manifest entries keyed by emitted file (empty if the build wrote none)."""
+        for name in MANIFEST_PATHS:
+            path = os.path.join(self.site_root, name)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    manifest = json.load(f)
+                return {entry['file']: dict(entry, key=key) for key, entry in manifest.items() if 'file' in entry}
+        return {}
+
+    def _module_sources(self, chunk_path: str) -> Optional[Dict[str, int]]:
+        """Modules bundled into a chunk with their source sizes, from its sourcemap."""
+        map_path = f"{chunk_path}.map"
+        if not os.path.exists(map_path):
+            return None
+        try:
+            with open(map_path, 'r') as f:
+                sourcemap = json.load(f)
+        except (OSError, ValueError):
+            return None
+        contents = sourcemap.get('sourcesContent') or []
+        modules = {}
+        for index, source in enumerate(sourcemap.get('sources', [])):
+            name = re.sub(r'^(\.\./)+|^/', '', source.split('?')[0])
+            content = contents[index] if index < len(contents) else None
+            modules[name] = len(content.encode('utf-8')) if content else 0
+        return modules
+
+    def _add_chunk(self, graph: Dict[str, Dict[str, Any]], path: str, manifest: Dict[str, Dict[str, Any]]) -> None:
+        """Parse a JS file and everything it imports into the graph."""
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            rel = self._rel(path)
+            if rel in graph:
+                continue
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                static, dynamic = find_imports(f.read())
+            imports = {p for p in (self._resolve(path, spec) for spec in static) if p}
+            dynamic_imports = {p for p in (self._resolve(path, spec) for spec in dynamic) if p}
+            entry = manifest.get(rel, {})
+            graph[rel] = {
+                'path': path,
+                'imports': sorted(self._rel(p) for p in imports),
+                'dynamic_imports': sorted(self._rel(p) for p in dynamic_imports),
+                'src': entry.get('src') or entry.get('key'),
+                'modules': self._module_sources(path)
+            }
+            pending.extend(imports | dynamic_imports)
+
+    def chunk_graph(self, entries: Set[str] = frozenset()) -> Dict[str, Dict[str, Any]]:
+        """Emitted JS files under _astro/ plus the given entry files, with everything they import.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per file (relative to the site root):
+            resolved static and dynamic imports, manifest source entry and
+            bundled modules (None without a sourcemap)
+        """
+        manifest = self.load_manifest()
+        graph: Dict[str, Dict[str, Any]] = {}
+        assets_dir = os.path.join(self.site_root, ASSETS_DIR)
+        files = set(entries)
+        if os.path.isdir(assets_dir):
+            files.update(os.path.join(assets_dir, name) for name in os.listdir(assets_dir)
+                         if name.endswith(_JS_EXTENSIONS))
+        for path in sorted(files):
+            self._add_chunk(graph, path, manifest)
+        return graph
+
+    @staticmethod
+    def closure(graph: Dict[str, Dict[str, Any]], entries: Set[str]) -> Tuple[Set[str], Set[str]]:
+        """Chunks loaded eagerly from entries, and those reachable only through dynamic imports."""
+        eager, pending = set(), list(entries)
+        while pending:
+            chunk = pending.pop()
+            if chunk in eager or chunk not in graph:
+                continue
+            eager.add(chunk)
+            pending.extend(graph[chunk]['imports'])
+
+        lazy, pending = set(), [d for chunk in eager for d in graph[chunk]['dynamic_imports']]
+        while pending:
+            chunk = pending.pop()
+            if chunk in eager or chunk in lazy or chunk not in graph:
+                continue
+            lazy.add(chunk)
+            pending.extend(graph[chunk]['imports'] + graph[chunk]['dynamic_imports'])
+        return eager, lazy
+
+    def page_entries(self, page: str) -> Set[str]:
+        """JS files (absolute paths) a page loads directly, including imports of inline module scripts."""
+        with open(page, 'r', encoding='utf-8', errors='ignore') as f:
+            parser = _PageScripts()
+            parser.feed(f.read())
+        urls = list(parser.urls)
+        for script in parser.inline:
+            static, dynamic = find_imports(script)
+            urls.extend(static | dynamic)
+        return {path for path in (self._resolve(page, url) for url in urls) if path}
+
+    def _sizes(self, graph: Dict[str, Dict[str, Any]], chunks: Set[str]) -> Tuple[int, int]:
+        """Raw and compressed bytes of a chunk set."""
+        raw = compressed = 0
+        for chunk in chunks:
+            sizes = self.weights.file_sizes(graph[chunk]['path'])
+            raw += sizes['raw']
+            compressed += sizes[self.compression]
+        return raw, compressed
+
+    def analyze(self) -> Dict[str, Any]:
+        """Analyze the build's code splitting.
+
+        Returns:
+            Dict[str, Any]: 'routes' (eager and lazy chunks with raw and
+            compressed JS bytes, heaviest first), 'chunk_sets' (routes sharing
+            the same eager chunks), 'chunks' (size, source entry, number of
+            routes loading it), 'large_chunks', 'duplicate_modules' (needs
+            sourcemaps, see 'sourcemaps') and 'duplicate_chunks' (identical
+            content under different names)
+        """
+        pages = {page: self.page_entries(page) for page in self.weights.find_pages(self.site_root)}
+        graph = self.chunk_graph({path for entries in pages.values() for path in entries})
+        routes = []
+        usage: Dict[str, int] = {chunk: 0 for chunk in graph}
+        for page, entries in pages.items():
+            eager, lazy = self.closure(graph, {self._rel(path) for path in entries})
+            for chunk in eager:
+                usage[chunk] += 1
+            raw, compressed = self._sizes(graph, eager)
+            lazy_raw, lazy_compressed = self._sizes(graph, lazy)
+            routes.append({
+                'route': route_of(self._rel(page)),
+                'chunks': sorted(eager),
+                'lazy_chunks': sorted(lazy),
+                'js_raw_bytes': raw,
+                'js_compressed_bytes': compressed,
+                'lazy_raw_bytes': lazy_raw,
+                'lazy_compressed_bytes': lazy_compressed
+            })
+        routes.sort(key=lambda route: -route['js_compressed_bytes'])
+
+        sets: Dict[Tuple[str, ...], List[str]] = {}
+        for route in routes:
+            sets.setdefault(tuple(route['chunks']), []).append(route['route'])
+        chunk_sets = [{'chunks': list(chunks), 'routes': members} for chunks, members in sets.items() if chunks]
+        chunk_sets.sort(key=lambda chunk_set: -len(chunk_set['routes']))
+
+        chunks, by_digest, owners = [], {}, {}
+        for name, info in sorted(graph.items()):
+            sizes = self.weights.file_sizes(info['path'])
+            chunks.append({
+                'chunk': name,
+                'src': info['src'],
+                'raw_bytes': sizes['raw'],
+                'compressed_bytes': sizes[self.compression],
+                'routes': usage[name],
+                'modules': len(info['modules']) if info['modules'] is not None else None
+            })
+            by_digest.setdefault(self.weights.cache.file_hash(info['path']), []).append(name)
+            for module, size in (info['modules'] or {}).items():
+                owners.setdefault(module, []).append((name, size))
+        chunks.sort(key=lambda chunk: -chunk['raw_bytes'])
+
+        duplicate_modules = [
+            {'module': module, 'chunks': [name for name, _ in found], 'source_bytes': found[0][1]}
+            for module, found in owners.items() if len(found) > 1
+        ]
+        duplicate_modules.sort(key=lambda d: -d['source_bytes'] * (len(d['chunks']) - 1))
+
+        self.weights._save_sizes()
+        self.weights.cache.save()
+        return {
+            'site_root': os.path.relpath(self.site_root, self.project_path),
+            'compression': self.compression,
+            'manifest': bool(self.load_manifest()),
+            'sourcemaps': any(info['modules'] is not None for info in graph.values()),
+            'routes': routes,
+            'chunk_sets': chunk_sets,
+            'chunks': chunks,
+            'large_chunks': [chunk for chunk in chunks if chunk['raw_bytes'] > LARGE_CHUNK_BYTES],
+            'duplicate_modules': duplicate_modules,
+            'duplicate_chunks': [names for names in by_digest.values() if len(names) > 1]
+        }
+
+
+def format_report(report: Dict[str, Any], limit: int = 10) -> List[str]:
+    """Printable summary of a code-splitting report."""
+    compression = report['compression']
+    lines = [f"{len(report['routes'])} routes, {len(report['chunks'])} chunks, "
+             f"{len(report['chunk_sets'])} distinct chunk sets ({report['site_root']}/)"]
+    lines.append('')
+    lines.append(f"Heaviest routes (eager JS, {compression}):")
+    for route in report['routes'][:limit]:
+        lazy = f", +{route['lazy_compressed_bytes'] / 1024:.1f}KB lazy" if route['lazy_chunks'] else ''
+        lines.append(f"{route['js_compressed_bytes'] / 1024:8.1f}KB {route['js_raw_bytes'] / 1024:8.1f}KB raw  "
+                     f"{route['route']} ({len(route['chunks'])} chunks{lazy})")
+    lines.append('')
+    lines.append('Largest chunks:')
+    for chunk in report['chunks'][:limit]:
+        source = f"  <- {chunk['src']}" if chunk['src'] else ''
+        lines.append(f"{chunk['compressed_bytes'] / 1024:8.1f}KB {chunk['raw_bytes'] / 1024:8.1f}KB raw  "
+                     f"{chunk['chunk']} on {chunk['routes']} routes{source}")
+    if report['duplicate_modules']:
+        lines.append('')
+        lines.append('Modules bundled into several chunks:')
+        for duplicate in report['duplicate_modules'][:limit]:
+            lines.append(f"{duplicate['source_bytes'] / 1024:8.1f}KB  {duplicate['module']} in "
+                         f"{', '.join(duplicate['chunks'])}")
+    elif not report['sourcemaps']:
+        lines.append('')
+        lines.append('No sourcemaps found; enable vite.build.sourcemap to detect duplicated modules.')
+    for names in report['duplicate_chunks']:
+        lines.append(f"Identical chunks: {', '.join(names)}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: print the code-splitting report, exit 1 if there is no built JS."""
+    argv = argv or []
+    report = ChunkAnalyzer(argv[0] if argv else os.getcwd()).analyze()
+    if not report['chunks']:
+        print(f"No JavaScript chunks found in {report['site_root']}/; run the build first", file=sys.stderr)
+        return 1
+    print('\n'.join(format_report(report)))
+    return 0
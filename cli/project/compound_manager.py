@@ -1,9 +1,92 @@
 """Compound management functionality."""
 
+import hashlib
 import json
 import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
+from .compound_schema import CompoundValidator
+from .ts_literal import find_literal_end, parse_ts_literal, to_ts_literal
+
+# Try to import numpy, but make it optional
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Marker written into generated pages and data modules so they can be told apart from hand-written ones
+GENERATED_PAGE_MARKER = "// @generated by CompoundManager"
+
+COMPOUNDS_DECLARATION = re.compile(r"export\s+const\s+compounds\s*(?::\s*Compound\[\])?\s*=\s*")
+SHARD_DECLARATION = re.compile(r"export\s+const\s+\w+\s*:\s*Compound\s*=\s*")
+SHARD_REFERENCE = re.compile(r"""['"]\./compounds/([\w-]+)['"]""")
+
+# Fields kept in the slim sharded index; everything else loads per compound
+INDEX_FIELDS = ['name', 'slug', 'category', 'description', 'halfLife', 'detectionTime',
+                'anabolicRating', 'androgenicRating']
+
+# compoundIndex/loadCompound for the monolithic compounds.ts, matching the sharded index.ts,
+# so consumers work unchanged in either layout
+MONOLITHIC_API = (
+    f"export type CompoundSummary = Pick<Compound, {' | '.join(repr(f) for f in INDEX_FIELDS)}>;\n\n"
+    "export const compoundIndex: CompoundSummary[] = compounds;\n\n"
+    "export function loadCompound(slug: string): Promise<Compound> | undefined {\n"
+    "  const compound = compounds.find((c) => c.slug === slug);\n"
+    "  return compound ? Promise.resolve(compound) : undefined;\n"
+    "}\n"
+)
+
+# Bump when the similarity features change so stale related.json files are recomputed
+RELATED_FEATURES_VERSION = 1
+DESCRIPTION_TOKEN = re.compile(r"[a-z0-9]+")
+
+LAYOUT_MONOLITHIC = 'monolithic'
+LAYOUT_SHARDED = 'sharded'
+
+
+def load_compounds_file(path: str) -> List[Dict[str, Any]]:
+    """Parse the compounds array literal out of a TypeScript data file.
+
+    Raises:
+        ValueError: If the file has no parseable compounds array
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+
+    match = COMPOUNDS_DECLARATION.search(content)
+    if not match:
+        raise ValueError("No 'export const compounds' declaration found")
+    start = match.end()
+    return parse_ts_literal(content[start:find_literal_end(content, start)])
+
+
+def load_compound_shard(path: str) -> Dict[str, Any]:
+    """Parse the single compound literal out of a per-compound module.
+
+    Raises:
+        ValueError: If the file has no `export const x: Compound = {...}`
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+
+    match = SHARD_DECLARATION.search(content)
+    if not match:
+        raise ValueError(f"No compound declaration found in {path}")
+    start = match.end()
+    return parse_ts_literal(content[start:find_literal_end(content, start)])
+
+
+def shard_identifier(slug: str) -> str:
+    """Turn a slug into the camelCase export name used by shard modules."""
+    head, *rest = re.split(r'[^0-9A-Za-z]+', slug)
+    identifier = head + ''.join(part.capitalize() for part in rest)
+    return f"_{identifier}" if identifier[:1].isdigit() else identifier
+
+
 class CompoundData:
     """Represents a compound with its properties."""
     def __init__(self, name: str, category: str, description: str,
@@ -51,69 +134,208 @@ class CompoundManager:
         self.npm_manager = npm_manager
         self.project_root = "/Users/drunkonjava/Desktop/HelloWorldGitHub"
         self.compounds_file = os.path.join(self.project_root, "src/data/compounds.ts")
-
-    def get_compounds(self) -> List[Dict[str, Any]]:
+        self.shards_dir = os.path.join(self.project_root, "src/data/compounds")
+        self.shard_index_file = os.path.join(self.shards_dir, "index.ts")
+        self.shard_all_file = os.path.join(self.shards_dir, "all.ts")
+        self.pages_dir = os.path.join(self.project_root, "src/pages/compounds")
+        self.interactions_file = os.path.join(self.project_root, "src/data/compounds/interactions.json")
+        self.related_file = os.path.join(self.project_root, "src/data/compounds/related.json")
+        self.validator = CompoundValidator()
+        self._interaction_graph = None
+        self._interaction_graph_key = None
+
+    def detect_layout(self) -> str:
+        """Detect which data layout is active.
+
+        The monolithic compounds.ts wins when present, since `data/compounds`
+        imports resolve to it before compounds/index.ts.
+        """
+        if os.path.exists(self.compounds_file):
+            return LAYOUT_MONOLITHIC
+        return LAYOUT_SHARDED
+
+    def _shard_path(self, slug: str) -> str:
+        """Path of the per-compound module for a slug."""
+        return os.path.join(self.shards_dir, 'compounds', f"{slug}.ts")
+
+    def _read_sharded(self) -> List[Dict[str, Any]]:
+        """Read compounds from the per-compound modules, in index order."""
+        with open(self.shard_index_file, 'r') as f:
+            slugs = list(dict.fromkeys(SHARD_REFERENCE.findall(f.read())))
+        return [load_compound_shard(self._shard_path(slug)) for slug in slugs]
+
+    def get_compounds(self, layout: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of all compounds."""
         try:
-            with open(self.compounds_file, 'r') as f:
-                content = f.read()
-
-            # Extract compounds array
-            compounds_start = content.find('export const compounds: Compound[] = [')
-            compounds_end = content.rfind('];')
-
-            if compounds_start == -1 or compounds_end == -1:
-                return []
-
-            # Extract compounds array content
-            compounds_content = content[compounds_start:compounds_end+1]
-
-            # Convert TypeScript syntax to valid JSON
-            compounds_content = compounds_content.replace("export const compounds: Compound[] = ", "")
-            compounds_content = compounds_content.replace("'", '"')
-
-            try:
-                compounds = json.loads(compounds_content)
-                return compounds
-            except json.JSONDecodeError:
-                return []
-
+            if (layout or self.detect_layout()) == LAYOUT_SHARDED:
+                return self._read_sharded()
+            return load_compounds_file(self.compounds_file)
         except Exception as e:
             print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to get compounds: {str(e)}{self.ui.theme.COLORS['ENDC']}")
             return []
 
-    def add_compound(self, compound_data: CompoundData) -> bool:
-        """Add a new compound to the compounds.ts file."""
-        try:
-            # Read current compounds file
+    def _write_if_changed(self, path: str, content: str) -> bool:
+        """Write a file only when its content differs. Returns True if written."""
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                if f.read() == content:
+                    return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return True
+
+    def _ensure_generated(self, paths: List[str]) -> None:
+        """Refuse to touch existing files that CompoundManager did not generate.
+
+        Raises:
+            ValueError: Naming the first hand-written file among paths
+        """
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r') as f:
+                if GENERATED_PAGE_MARKER not in f.read():
+                    raise ValueError(f"{os.path.relpath(path, self.project_root)} was not generated by "
+                                     "CompoundManager; move it aside first")
+
+    def _sharded_files(self, slugs: List[str]) -> List[str]:
+        """Every file of the sharded layout for the given slugs."""
+        return [self.shard_index_file, self.shard_all_file] + [self._shard_path(slug) for slug in slugs]
+
+    def _write_monolithic(self, compounds: List[Dict[str, Any]]) -> None:
+        """Write all compounds into compounds.ts, keeping surrounding declarations."""
+        array_literal = to_ts_literal(compounds)
+        if os.path.exists(self.compounds_file):
             with open(self.compounds_file, 'r') as f:
                 content = f.read()
+            match = COMPOUNDS_DECLARATION.search(content)
+            if not match:
+                raise ValueError("Invalid compounds.ts file structure")
+            end = find_literal_end(content, match.end())
+            content = content[:match.end()] + array_literal + content[end:]
+        else:
+            content = (
+                f"{GENERATED_PAGE_MARKER}\n"
+                "import type { Compound } from './compounds/types';\n\n"
+                "export type { Compound };\n\n"
+                f"export const compounds: Compound[] = {array_literal};\n\n"
+                f"{MONOLITHIC_API}"
+            )
+        self._write_if_changed(self.compounds_file, content)
 
-            # Parse existing compounds array
-            compounds_start = content.find('export const compounds: Compound[] = [')
-            compounds_end = content.rfind('];')
+    def _write_sharded(self, compounds: List[Dict[str, Any]]) -> None:
+        """Write one module per compound, a slim index with lazy loaders and all.ts.
 
-            if compounds_start == -1 or compounds_end == -1:
-                print(f"\n{self.ui.theme.COLORS['ERROR']}Invalid compounds.ts file structure{self.ui.theme.COLORS['ENDC']}")
-                return False
+        index.ts imports no compound module statically, so pages importing it
+        ship only the summaries; all.ts has the full list for build-time code.
+        """
+        slugs = [compound['slug'] for compound in compounds]
+        self._ensure_generated(self._sharded_files(slugs))
+        for compound in compounds:
+            identifier = shard_identifier(compound['slug'])
+            self._write_if_changed(self._shard_path(compound['slug']), (
+                f"{GENERATED_PAGE_MARKER}\n"
+                "import type { Compound } from '../types';\n\n"
+                f"export const {identifier}: Compound = {to_ts_literal(compound)};\n\n"
+                f"export default {identifier};\n"
+            ))
+
+        summaries = [{field: c[field] for field in INDEX_FIELDS if field in c} for c in compounds]
+        loaders = '\n'.join(
+            f"  {json.dumps(slug)}: () => import('./compounds/{slug}').then((m) => m.default),"
+            for slug in slugs
+        )
+        self._write_if_changed(self.shard_index_file, (
+            f"{GENERATED_PAGE_MARKER}\n"
+            "import type { Compound } from './types';\n\n"
+            "export type { Compound };\n\n"
+            f"export type CompoundSummary = Pick<Compound, {' | '.join(repr(f) for f in INDEX_FIELDS)}>;\n\n"
+            "// Slim listing for search and index pages; full records load per compound\n"
+            f"export const compoundIndex: CompoundSummary[] = {to_ts_literal(summaries)};\n\n"
+            f"const loaders: Record<string, () => Promise<Compound>> = {{\n{loaders}\n}};\n\n"
+            "export function loadCompound(slug: string): Promise<Compound> | undefined {\n"
+            "  return loaders[slug]?.();\n"
+            "}\n"
+        ))
+
+        identifiers = [shard_identifier(slug) for slug in slugs]
+        imports = ''.join(f"import {{ {identifier} }} from './compounds/{slug}';\n"
+                          for identifier, slug in zip(identifiers, slugs))
+        self._write_if_changed(self.shard_all_file, (
+            f"{GENERATED_PAGE_MARKER}\n"
+            "// Every compound, for build-time code only; pages should use index.ts\n"
+            "import type { Compound } from './types';\n"
+            f"{imports}\n"
+            f"export const compounds: Compound[] = [{', '.join(identifiers)}];\n\n"
+            f"export {{ {', '.join(identifiers)} }};\n"
+        ))
+
+        # Drop generated modules for compounds that no longer exist; hand-written ones are kept
+        shard_root = os.path.join(self.shards_dir, 'compounds')
+        for file_name in os.listdir(shard_root):
+            slug, ext = os.path.splitext(file_name)
+            path = os.path.join(shard_root, file_name)
+            if ext == '.ts' and slug not in slugs:
+                with open(path, 'r') as f:
+                    generated = GENERATED_PAGE_MARKER in f.read()
+                if generated:
+                    os.remove(path)
+
+    def save_compounds(self, compounds: List[Dict[str, Any]], layout: Optional[str] = None) -> None:
+        """Write the full compound list in the given (or active) layout."""
+        if (layout or self.detect_layout()) == LAYOUT_SHARDED:
+            self._write_sharded(compounds)
+        else:
+            self._write_monolithic(compounds)
+
+    def migrate_layout(self, target_layout: str) -> bool:
+        """Convert compound data between the monolithic and sharded layouts.
+
+        Hand-written data files are never replaced or removed: if any file the
+        migration would touch lacks the generated marker, nothing is written.
+
+        Args:
+            target_layout: LAYOUT_MONOLITHIC or LAYOUT_SHARDED
+
+        Returns:
+            bool: True if the data was migrated
+        """
+        try:
+            if target_layout not in (LAYOUT_MONOLITHIC, LAYOUT_SHARDED):
+                raise ValueError(f"Unknown layout: {target_layout}")
+            source_layout = self.detect_layout()
+            if source_layout == target_layout:
+                print(f"\n{self.ui.theme.COLORS['INFO']}Compound data already uses the {target_layout} layout{self.ui.theme.COLORS['ENDC']}")
+                return True
+
+            compounds = self.get_compounds(source_layout)
+            if not compounds:
+                raise ValueError("No compounds could be read from the current layout")
+            # Check every file to be replaced or removed before writing anything
+            sharded_files = self._sharded_files([compound['slug'] for compound in compounds])
+            self._ensure_generated(sharded_files + [self.compounds_file])
+            self.save_compounds(compounds, target_layout)
+
+            removed = [self.compounds_file] if target_layout == LAYOUT_SHARDED else sharded_files
+            for path in removed:
+                if os.path.exists(path):
+                    os.remove(path)
+
+            print(f"\n{self.ui.theme.COLORS['SUCCESS']}Migrated {len(compounds)} compounds to the {target_layout} layout{self.ui.theme.COLORS['ENDC']}")
+            return True
 
-            # Convert compound to TypeScript object string
-            new_compound = json.dumps(compound_data.to_dict(), indent=2)
-            # Fix JSON to TypeScript syntax
-            new_compound = new_compound.replace('"', "'")
-
-            # Insert new compound into array
-            updated_content = (
-                content[:compounds_end] +
-                ('  ' if content[compounds_end-1] != '[' else '') +
-                (',' if content[compounds_end-1] != '[' else '') +
-                '\n  ' + new_compound +
-                '\n' + content[compounds_end:]
-            )
+        except Exception as e:
+            print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to migrate compound layout: {str(e)}{self.ui.theme.COLORS['ENDC']}")
+            return False
 
-            # Write updated content
-            with open(self.compounds_file, 'w') as f:
-                f.write(updated_content)
+    def add_compound(self, compound_data: CompoundData) -> bool:
+        """Add a new compound to the compound data."""
+        try:
+            layout = self.detect_layout()
+            compounds = self.get_compounds(layout)
+            compounds.append(compound_data.to_dict())
+            self.save_compounds(compounds, layout)
 
             print(f"\n{self.ui.theme.COLORS['SUCCESS']}Successfully added compound: {compound_data.name}{self.ui.theme.COLORS['ENDC']}")
 
@@ -129,7 +351,8 @@ class CompoundManager:
     def edit_compound(self, compound_name: str, updated_data: CompoundData) -> bool:
         """Edit an existing compound."""
         try:
-            compounds = self.get_compounds()
+            layout = self.detect_layout()
+            compounds = self.get_compounds(layout)
 
             # Find compound index
             compound_index = -1
@@ -144,25 +367,7 @@ class CompoundManager:
 
             # Update compound
             compounds[compound_index] = updated_data.to_dict()
-
-            # Convert to TypeScript
-            compounds_str = json.dumps(compounds, indent=2).replace('"', "'")
-
-            # Update file
-            with open(self.compounds_file, 'r') as f:
-                content = f.read()
-
-            compounds_start = content.find('export const compounds: Compound[] = [')
-            compounds_end = content.rfind('];')
-
-            updated_content = (
-                content[:compounds_start] +
-                f'export const compounds: Compound[] = {compounds_str}' +
-                content[compounds_end+1:]
-            )
-
-            with open(self.compounds_file, 'w') as f:
-                f.write(updated_content)
+            self.save_compounds(compounds, layout)
 
             print(f"\n{self.ui.theme.COLORS['SUCCESS']}Successfully updated compound: {compound_name}{self.ui.theme.COLORS['ENDC']}")
 
@@ -177,49 +382,88 @@ class CompoundManager:
 
     def validate_compound_data(self, compound: Dict[str, Any]) -> List[str]:
         """Validate compound data structure."""
-        errors = []
-
-        # Required fields
-        required_fields = [
-            'name', 'category', 'description', 'anabolicRating',
-            'androgenicRating', 'halfLife', 'detectionTime',
-            'dosageRanges', 'sideEffects', 'pctRequirements'
-        ]
-
-        for field in required_fields:
-            if field not in compound:
-                errors.append(f"Missing required field: {field}")
-
-        # Type validation
-        if 'anabolicRating' in compound and not isinstance(compound['anabolicRating'], int):
-            errors.append("anabolicRating must be an integer")
-        if 'androgenicRating' in compound and not isinstance(compound['androgenicRating'], int):
-            errors.append("androgenicRating must be an integer")
-
-        # Nested structure validation
-        if 'dosageRanges' in compound:
-            for level in ['beginner', 'intermediate', 'advanced']:
-                if level not in compound['dosageRanges']:
-                    errors.append(f"Missing {level} dosage range")
-                else:
-                    range_data = compound['dosageRanges'][level]
-                    if not all(k in range_data for k in ['min', 'max', 'unit']):
-                        errors.append(f"Invalid {level} dosage range structure")
-
-        if 'sideEffects' in compound:
-            for category in ['common', 'uncommon', 'rare']:
-                if category not in compound['sideEffects']:
-                    errors.append(f"Missing {category} side effects")
-                elif not isinstance(compound['sideEffects'][category], list):
-                    errors.append(f"{category} side effects must be a list")
-
-        if 'pctRequirements' in compound:
-            required_pct_fields = ['required', 'protocol', 'duration']
-            for field in required_pct_fields:
-                if field not in compound['pctRequirements']:
-                    errors.append(f"Missing PCT field: {field}")
-
-        return errors
+        return [f"{field}: {message}"
+                for field, messages in self.validator.validate(compound).items()
+                for message in messages]
+
+    def validate_all_compounds(self, compounds: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """Validate every compound in one pass.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: Errors grouped by compound, then field
+        """
+        if compounds is None:
+            compounds = self.get_compounds()
+        return self.validator.validate_many(compounds)
+
+    def _render_compound_page(self, compound: Dict[str, Any], layout: Optional[str] = None) -> str:
+        """Render the index.astro source for a compound."""
+        if (layout or self.detect_layout()) == LAYOUT_SHARDED:
+            # Import only this compound's module so the page never pulls in the catalog
+            data_import = f"import compound from '../../../data/compounds/compounds/{compound['slug']}';"
+        else:
+            data_import = (
+                "import { compounds } from '../../../data/compounds';\n\n"
+                f"const compound = compounds.find(c => c.slug === '{compound['slug']}');"
+            )
+        return f"""---
+{GENERATED_PAGE_MARKER}
+import Layout from '../../../layouts/Layout.astro';
+import CompoundTemplate from '../../../templates/CompoundTemplate/CompoundTemplate.astro';
+{data_import}
+---
+
+<Layout title="{compound['name']} Guide">
+  <CompoundTemplate compound={{compound}} />
+</Layout>
+"""
+
+    def _write_compound_page(self, slug: str, template: str) -> str:
+        """Write a rendered page only if its content hash changed.
+
+        Returns:
+            str: 'created', 'updated' or 'unchanged'
+        """
+        compound_dir = os.path.join(self.pages_dir, slug)
+        page_path = os.path.join(compound_dir, 'index.astro')
+        rendered = template.encode('utf-8')
+
+        if os.path.exists(page_path):
+            with open(page_path, 'rb') as f:
+                current_hash = hashlib.sha256(f.read()).hexdigest()
+            if current_hash == hashlib.sha256(rendered).hexdigest():
+                # Leave the file (and its mtime) alone so Astro caches stay valid
+                return 'unchanged'
+            status = 'updated'
+        else:
+            status = 'created'
+
+        os.makedirs(compound_dir, exist_ok=True)
+        # open() rather than mkstemp so the page gets normal (umask) permissions
+        tmp_path = f"{page_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(rendered)
+            os.replace(tmp_path, page_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return status
+
+    def _find_generated_page_slugs(self) -> List[str]:
+        """List slugs of page directories previously written by this manager."""
+        slugs = []
+        if not os.path.isdir(self.pages_dir):
+            return slugs
+        for entry in os.scandir(self.pages_dir):
+            page_path = os.path.join(entry.path, 'index.astro')
+            if not entry.is_dir() or not os.path.isfile(page_path):
+                continue
+            with open(page_path, 'r') as f:
+                if GENERATED_PAGE_MARKER in f.read():
+                    slugs.append(entry.name)
+        return slugs
 
     def generate_compound_page(self, compound_name: str) -> bool:
         """Generate or update compound page."""
@@ -237,26 +481,7 @@ class CompoundManager:
                 print(f"\n{self.ui.theme.COLORS['ERROR']}Compound not found: {compound_name}{self.ui.theme.COLORS['ENDC']}")
                 return False
 
-            # Create compound directory
-            compound_dir = os.path.join(self.project_root, 'src/pages/compounds', compound['slug'])
-            os.makedirs(compound_dir, exist_ok=True)
-
-            # Generate index.astro file
-            template = f"""---
-import Layout from '../../../layouts/Layout.astro';
-import CompoundTemplate from '../../../templates/CompoundTemplate/CompoundTemplate.astro';
-import {{ compounds }} from '../../../data/compounds';
-
-const compound = compounds.find(c => c.slug === '{compound['slug']}');
----
-
-<Layout title="{compound['name']} Guide">
-  <CompoundTemplate compound={{compound}} />
-</Layout>
-"""
-
-            with open(os.path.join(compound_dir, 'index.astro'), 'w') as f:
-                f.write(template)
+            self._write_compound_page(compound['slug'], self._render_compound_page(compound))
 
             print(f"\n{self.ui.theme.COLORS['SUCCESS']}Successfully generated page for: {compound_name}{self.ui.theme.COLORS['ENDC']}")
             return True
@@ -265,6 +490,235 @@ const compound = compounds.find(c => c.slug === '{compound['slug']}');
             print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to generate compound page: {str(e)}{self.ui.theme.COLORS['ENDC']}")
             return False
 
+    def generate_all_pages(self, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Generate pages for every compound in parallel, skipping unchanged ones.
+
+        Pages whose rendered content hash matches the file on disk are not
+        rewritten, and generated pages for slugs no longer in the data are removed.
+
+        Args:
+            max_workers: Size of the worker pool (defaults to the executor's choice)
+
+        Returns:
+            Dict[str, int]: Counts of created, updated, unchanged, removed and failed pages
+        """
+        results = {'created': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        compounds = self.get_compounds()
+        if not compounds:
+            # Never treat an unreadable data file as "every compound was removed"
+            return results
+        layout = self.detect_layout()
+        rendered = {c['slug']: self._render_compound_page(c, layout) for c in compounds}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                slug: executor.submit(self._write_compound_page, slug, template)
+                for slug, template in rendered.items()
+            }
+            for slug, future in futures.items():
+                try:
+                    results[future.result()] += 1
+                except Exception as e:
+                    results['failed'] += 1
+                    print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to generate page for {slug}: {str(e)}{self.ui.theme.COLORS['ENDC']}")
+
+        for slug in self._find_generated_page_slugs():
+            if slug not in rendered:
+                shutil.rmtree(os.path.join(self.pages_dir, slug))
+                results['removed'] += 1
+
+        return results
+
+    def _compounds_fingerprint(self, compounds: List[Dict[str, Any]]) -> str:
+        """Stable hash of compound data, used to invalidate derived indexes."""
+        return hashlib.sha256(json.dumps(compounds, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def build_interaction_graph(self, compounds: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Build a normalized, undirected interaction graph keyed by slug.
+
+        Each free-text interaction is scanned for the names or slugs of other
+        listed compounds. Interactions that mention no known compound are
+        reported as unresolved rather than dropped.
+
+        Args:
+            compounds: Compound records (defaults to the current data file)
+
+        Returns:
+            Dict[str, Any]: 'adjacency' (slug -> sorted slugs) and 'unresolved'
+            (slug -> interaction texts that did not match any compound)
+        """
+        if compounds is None:
+            compounds = self.get_compounds()
+
+        key = self._compounds_fingerprint(compounds)
+        if self._interaction_graph is not None and self._interaction_graph_key == key:
+            return self._interaction_graph
+
+        # One alternation over every alias, longest first so "Testosterone Enanthate"
+        # wins over "Testosterone" when both are listed
+        aliases = {}
+        for compound in compounds:
+            aliases[compound['name'].lower()] = compound['slug']
+            aliases[compound['slug'].lower()] = compound['slug']
+            aliases[compound['slug'].replace('-', ' ').lower()] = compound['slug']
+        pattern = None
+        if aliases:
+            alternation = '|'.join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+            pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+        adjacency = {compound['slug']: set() for compound in compounds}
+        unresolved = {}
+        for compound in compounds:
+            slug = compound['slug']
+            for interaction in compound.get('interactions', []):
+                targets = set()
+                if pattern is not None:
+                    targets = {aliases[m.lower()] for m in pattern.findall(interaction)}
+                targets.discard(slug)
+                if not targets:
+                    unresolved.setdefault(slug, []).append(interaction)
+                    continue
+                for target in targets:
+                    adjacency[slug].add(target)
+                    adjacency[target].add(slug)
+
+        self._interaction_graph = {
+            'adjacency': {slug: sorted(targets) for slug, targets in adjacency.items()},
+            'unresolved': unresolved
+        }
+        self._interaction_graph_key = key
+        return self._interaction_graph
+
+    def find_interacting_compounds(self, names: List[str]) -> List[str]:
+        """Get slugs of compounds that interact with any of the given compounds.
+
+        Args:
+            names: Compound names or slugs to look up
+
+        Returns:
+            List[str]: Sorted slugs interacting with at least one of the inputs
+        """
+        adjacency = self.build_interaction_graph()['adjacency']
+        queried = {name.lower().replace(' ', '-') for name in names}
+        found = set()
+        for slug in queried:
+            found.update(adjacency.get(slug, ()))
+        return sorted(found)
+
+    def export_interaction_map(self, output_path: Optional[str] = None) -> Optional[str]:
+        """Write the precomputed interaction adjacency map as JSON for the site.
+
+        Args:
+            output_path: Destination file (defaults to src/data/compounds/interactions.json)
+
+        Returns:
+            Optional[str]: Path written, or None on failure
+        """
+        output_path = output_path or self.interactions_file
+        try:
+            graph = self.build_interaction_graph()
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, 'w') as f:
+                json.dump(graph['adjacency'], f, indent=2, sort_keys=True)
+                f.write('\n')
+            return output_path
+        except Exception as e:
+            print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to export interaction map: {str(e)}{self.ui.theme.COLORS['ENDC']}")
+            return None
+
+    def _encode_compound_features(self, compounds: List[Dict[str, Any]]) -> "np.ndarray":
+        """Encode compounds as L2-normalized feature rows.
+
+        Blocks: one-hot category, scaled anabolic/androgenic ratings, and a
+        TF-IDF vector over description tokens.
+        """
+        n = len(compounds)
+
+        categories = sorted({c.get('category', '') for c in compounds})
+        category_index = {category: i for i, category in enumerate(categories)}
+        category_block = np.zeros((n, len(categories)))
+        category_block[np.arange(n), [category_index[c.get('category', '')] for c in compounds]] = 1.0
+
+        ratings = np.array([[c.get('anabolicRating', 0), c.get('androgenicRating', 0)]
+                            for c in compounds], dtype=float)
+        ratings = np.log1p(np.clip(ratings, 0, None))
+        rating_block = ratings / max(ratings.max(), 1e-9)
+
+        token_lists = [DESCRIPTION_TOKEN.findall(c.get('description', '').lower()) for c in compounds]
+        vocabulary = {token: i for i, token in enumerate(sorted({t for tokens in token_lists for t in tokens}))}
+        rows = np.repeat(np.arange(n), [len(tokens) for tokens in token_lists])
+        cols = np.array([vocabulary[t] for tokens in token_lists for t in tokens], dtype=int)
+        counts = np.zeros((n, len(vocabulary)))
+        np.add.at(counts, (rows, cols), 1.0)
+        idf = np.log((1 + n) / (1 + (counts > 0).sum(axis=0))) + 1.0
+        text_block = counts * idf
+        text_block /= np.maximum(np.linalg.norm(text_block, axis=1, keepdims=True), 1e-9)
+
+        features = np.hstack([category_block, rating_block, text_block])
+        return features / np.maximum(np.linalg.norm(features, axis=1, keepdims=True), 1e-9)
+
+    def compute_related_compounds(self, top_k: int = 3, force: bool = False) -> Optional[str]:
+        """Precompute top-k similar compounds and write them to related.json.
+
+        Similarity is cosine similarity over the encoded feature rows, computed
+        for all pairs in one matrix product. The file stores a fingerprint of
+        the data and parameters, and is left untouched when it still matches.
+
+        Args:
+            top_k: Number of related compounds per compound
+            force: Recompute even if the fingerprint is unchanged
+
+        Returns:
+            Optional[str]: Path to related.json, or None on failure
+        """
+        if not NUMPY_AVAILABLE:
+            print(f"\n{self.ui.theme.COLORS['WARNING']}Warning: numpy not available. Related compounds disabled.{self.ui.theme.COLORS['ENDC']}")
+            return None
+
+        try:
+            compounds = self.get_compounds()
+            if not compounds:
+                raise ValueError("No compounds found")
+
+            fingerprint = hashlib.sha256(
+                f"{self._compounds_fingerprint(compounds)}:{top_k}:{RELATED_FEATURES_VERSION}".encode('utf-8')
+            ).hexdigest()
+            if not force and os.path.exists(self.related_file):
+                with open(self.related_file, 'r') as f:
+                    if json.load(f).get('fingerprint') == fingerprint:
+                        return self.related_file
+
+            features = self._encode_compound_features(compounds)
+            similarity = features @ features.T
+            np.fill_diagonal(similarity, -np.inf)
+
+            k = min(top_k, len(compounds) - 1)
+            related = {}
+            if k > 0:
+                # argpartition finds the top-k per row without a full sort; only k columns get ordered
+                top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+                top_scores = np.take_along_axis(similarity, top, axis=1)
+                order = np.argsort(-top_scores, axis=1)
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                for i, compound in enumerate(compounds):
+                    related[compound['slug']] = [
+                        {'slug': compounds[j]['slug'], 'score': round(float(score), 4)}
+                        for j, score in zip(top[i], top_scores[i])
+                    ]
+            else:
+                related = {compound['slug']: [] for compound in compounds}
+
+            os.makedirs(os.path.dirname(self.related_file), exist_ok=True)
+            with open(self.related_file, 'w') as f:
+                json.dump({'fingerprint': fingerprint, 'topK': top_k, 'related': related}, f, indent=2)
+                f.write('\n')
+            return self.related_file
+
+        except Exception as e:
+            print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to compute related compounds: {str(e)}{self.ui.theme.COLORS['ENDC']}")
+            return None
+
     def get_compound_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get compound data by name."""
         compounds = self.get_compounds()
@@ -0,0 +1,174 @@
+"""Declarative compound schema and compiled bulk validator.
+
+The schema mirrors the ``Compound`` interface in src/data/compounds/types.ts.
+It is compiled once into nested check closures, so validating thousands of
+records is a single pass with no per-record schema interpretation.
+
+Can also be run headless as a pre-commit check:
+
+    python -m cli validate-compounds src/data/compounds.ts
+"""
+
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Leaf type names follow TypeScript: 'string', 'number', 'boolean'
+_DOSAGE_RANGE = {'min': 'number', 'max': 'number', 'unit': 'string'}
+
+COMPOUND_SCHEMA: Dict[str, Any] = {
+    'name': 'string',
+    'slug': 'string',
+    'category': 'string',
+    'description': 'string',
+    'anabolicRating': 'number',
+    'androgenicRating': 'number',
+    'halfLife': 'string',
+    'detectionTime': 'string',
+    'dosageRanges': {
+        'beginner': _DOSAGE_RANGE,
+        'intermediate': _DOSAGE_RANGE,
+        'advanced': _DOSAGE_RANGE
+    },
+    'sideEffects': {
+        'common': ['string'],
+        'uncommon': ['string'],
+        'rare': ['string']
+    },
+    'pctRequirements': {
+        'required': 'boolean',
+        'protocol': 'string',
+        'duration': 'string'
+    },
+    'interactions': ['string'],
+    'references': ['string']
+}
+
+_LEAF_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    # bool is an int subclass in Python but not a number in TypeScript
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool)
+}
+
+_MISSING = object()
+
+
+def _compile_node(path: Tuple[str, ...], node: Any) -> Callable[[Any], List[Tuple[str, str]]]:
+    """Compile one schema node into a closure validating a value at `path`."""
+    label = '.'.join(path)
+
+    if isinstance(node, str):
+        is_valid = _LEAF_CHECKS[node]
+
+        def check_leaf(value):
+            return [] if is_valid(value) else [(label, f"must be a {node}")]
+        return check_leaf
+
+    if isinstance(node, list):
+        item_type = node[0]
+        is_valid = _LEAF_CHECKS[item_type]
+
+        def check_list(value):
+            if not isinstance(value, list):
+                return [(label, "must be a list")]
+            return [(f"{label}[{i}]", f"must be a {item_type}")
+                    for i, item in enumerate(value) if not is_valid(item)]
+        return check_list
+
+    children = [(key, _compile_node(path + (key,), child)) for key, child in node.items()]
+    keys = frozenset(node)
+
+    def check_object(value):
+        if not isinstance(value, dict):
+            return [(label, "must be an object")]
+        errors = []
+        for key, check in children:
+            child = value.get(key, _MISSING)
+            if child is _MISSING:
+                errors.append((f"{label}.{key}" if label else key, "missing required field"))
+            else:
+                errors.extend(check(child))
+        for key in value.keys() - keys:
+            errors.append((f"{label}.{key}" if label else key, "unknown field"))
+        return errors
+    return check_object
+
+
+class CompoundValidator:
+    """Validator compiled once from a declarative schema."""
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None):
+        self.schema = schema or COMPOUND_SCHEMA
+        self._check = _compile_node((), self.schema)
+
+    def validate(self, record: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Validate one record.
+
+        Returns:
+            Dict[str, List[str]]: Errors grouped by field path (empty if valid)
+        """
+        grouped: Dict[str, List[str]] = {}
+        for field, message in self._check(record):
+            grouped.setdefault(field, []).append(message)
+        return grouped
+
+    def validate_many(self, records: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[str]]]:
+        """Validate many records in one pass.
+
+        Records are keyed by slug (falling back to name, then list index).
+        Duplicate slugs are reported against the later record.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: Errors grouped by record, then field
+        """
+        results: Dict[str, Dict[str, List[str]]] = {}
+        seen_slugs = set()
+        check = self._check
+        for index, record in enumerate(records):
+            key = f"#{index}"
+            errors = check(record)
+            if isinstance(record, dict):
+                key = str(record.get('slug') or record.get('name') or key)
+                slug = record.get('slug')
+                if slug is not None:
+                    if slug in seen_slugs:
+                        errors.append(('slug', f"duplicate slug '{slug}'"))
+                    seen_slugs.add(slug)
+            if errors:
+                if key in results:
+                    key = f"{key} (#{index})"
+                grouped = results.setdefault(key, {})
+                for field, message in errors:
+                    grouped.setdefault(field, []).append(message)
+        return results
+
+
+def format_errors(results: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """Flatten grouped validation errors into printable lines."""
+    lines = []
+    for record, fields in results.items():
+        for field, messages in fields.items():
+            for message in messages:
+                lines.append(f"{record}: {field} {message}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate compound data files, returning a non-zero exit code on errors."""
+    # Imported here because compound_manager imports this module
+    from .compound_manager import load_compounds_file
+
+    paths = (argv if argv is not None else sys.argv[1:]) or ['src/data/compounds.ts']
+    validator = CompoundValidator()
+    failed = False
+    for path in paths:
+        try:
+            records = load_compounds_file(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: could not be parsed: {e}")
+            failed = True
+            continue
+        for line in format_errors(validator.validate_many(records)):
+            print(f"{path}: {line}")
+            failed = True
+    return 1 if failed else 0
@@ -0,0 +1,121 @@
+"""Usage-driven font subsetting to WOFF2/WOFF."""
+
+import io
+import logging
+import os
+import re
+import string
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Optional, Set
+
+# Try to import fonttools, but make it optional
+try:
+    from fontTools import subset as ft_subset
+    from fontTools import ttLib
+    FONTTOOLS_AVAILABLE = True
+    # The subsetter logs every table it touches at INFO level
+    logging.getLogger('fontTools.subset').setLevel(logging.WARNING)
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+
+# WOFF2 compression needs the brotli module
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Always kept so text injected at runtime (numbers, search input) still renders
+BASELINE_CHARACTERS = ''.join(c for c in string.printable if c.isprintable()) + ' –—‘’“”•…'
+
+# Attributes whose values are rendered as visible text
+_TEXT_ATTRIBUTES = {'alt', 'title', 'placeholder', 'aria-label', 'value', 'content'}
+
+_ASTRO_FRONTMATTER = re.compile(r'\A\s*---\n.*?\n---\n', re.DOTALL)
+
+
+class _TextCollector(HTMLParser):
+    """Collects visible characters from markup, skipping scripts and styles."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.characters: Set[str] = set()
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip_depth += 1
+        for name, value in attrs:
+            if name in _TEXT_ATTRIBUTES and value:
+                self.characters.update(value)
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.characters.update(data)
+
+
+def collect_characters(paths: Iterable[str]) -> Set[str]:
+    """Collect the set of characters rendered by HTML and Astro sources.
+
+    Astro frontmatter is dropped; template expressions are kept since their
+    string literals usually end up on the page.
+    """
+    collector = _TextCollector()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        if path.endswith('.astro'):
+            content = _ASTRO_FRONTMATTER.sub('', content, count=1)
+        collector.feed(content)
+        collector.close()
+        collector.reset()
+    return {c for c in collector.characters if c.isprintable() or c == ' '}
+
+
+def subset_font_file(font_path: str, text: str, output_base: Optional[str] = None) -> Dict[str, Any]:
+    """Subset a font to the glyphs needed for `text` and write WOFF2 and WOFF.
+
+    Module-level so it can run in ProcessPoolExecutor workers.
+
+    Args:
+        font_path: Source font (TTF, OTF, WOFF or WOFF2)
+        text: Characters to keep
+        output_base: Output path without extension (defaults to <font>.subset)
+
+    Returns:
+        Dict[str, Any]: Byte sizes, glyph counts and output paths per flavor;
+        'error' is set on failure
+    """
+    report = {'font': font_path, 'original_bytes': os.path.getsize(font_path),
+              'glyphs_before': 0, 'glyphs_after': 0, 'outputs': {}, 'error': None}
+    try:
+        options = ft_subset.Options()
+        options.layout_features = ['*']
+        options.name_IDs = ['*']
+        options.notdef_outline = True
+        font = ttLib.TTFont(font_path)
+        report['glyphs_before'] = len(font.getGlyphOrder())
+
+        subsetter = ft_subset.Subsetter(options)
+        subsetter.populate(unicodes={ord(c) for c in text})
+        subsetter.subset(font)
+        report['glyphs_after'] = len(font.getGlyphOrder())
+
+        output_base = output_base or f"{os.path.splitext(font_path)[0]}.subset"
+        flavors = ['woff2', 'woff'] if BROTLI_AVAILABLE else ['woff']
+        for flavor in flavors:
+            font.flavor = flavor
+            buffer = io.BytesIO()
+            font.save(buffer)
+            output_path = f"{output_base}.{flavor}"
+            with open(output_path, 'wb') as f:
+                f.write(buffer.getvalue())
+            report['outputs'][flavor] = {'path': output_path, 'bytes': buffer.tell()}
+        return report
+    except Exception as e:
+        report['error'] = str(e)
+        return report
@@ -0,0 +1,358 @@
+"""Static performance audit of the built HTML pages.
+
+A stand-in for the parts of a Lighthouse run that can be judged from the
+markup alone, so it runs without Chrome. Pages are parsed in worker
+processes for render-blocking resources in <head>, images without
+dimensions or lazy loading, oversized inline scripts and external origins
+without preconnect hints. The stylesheets and scripts the pages load are
+then checked once each for minification and for web fonts that are not
+preloaded.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .page_weight import PageWeightAnalyzer, css_references, current_commit, resource_type
+
+HISTORY_DIR = os.path.join('.perf-history', 'html-audit')
+
+# Images above the fold are expected among the first few in document order
+EAGER_IMAGE_COUNT = 2
+INLINE_SCRIPT_MAX_BYTES = 10 * 1024
+# Assets whose estimated minification saving exceeds this share are flagged
+UNMINIFIED_MIN_SAVINGS = 0.10
+UNMINIFIED_MIN_BYTES = 1024
+
+SEVERITIES = ('error', 'warning', 'info')
+
+_EXECUTABLE_SCRIPT_TYPES = ('', 'module', 'text/javascript', 'application/javascript')
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION_SPACE = re.compile(r'\s*([{}:;,>])\s*')
+_FONT_EXTENSIONS = ('.woff2', '.woff', '.ttf', '.otf')
+
+
+def _finding(rule: str, severity: str, message: str, line: Optional[int] = None, **details) -> Dict[str, Any]:
+    """One audit finding."""
+    finding = {'rule': rule, 'severity': severity, 'message': message}
+    if line is not None:
+        finding['line'] = line
+    finding.update(details)
+    return finding
+
+
+def _origin(url: str) -> Optional[str]:
+    """scheme://host of an absolute URL (protocol-relative URLs count as https)."""
+    parts = urlsplit(url if not url.startswith('//') else f"https:{url}")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ('http', 'https') and parts.netloc else None
+
+
+class _PageAudit(HTMLParser):
+    """Collects the elements the page-level rules look at."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_head = True
+        self.stylesheets: List[Dict[str, Any]] = []
+        self.scripts: List[Dict[str, Any]] = []
+        self.inline_scripts: List[Dict[str, Any]] = []
+        self.images: List[Dict[str, Any]] = []
+        self.preconnect: set = set()
+        self.preload: List[Dict[str, str]] = []
+        self.origins: Dict[str, int] = {}
+        self._script: Optional[Dict[str, Any]] = None
+
+    def _use(self, url: Optional[str]) -> None:
+        """Note the origin of a resource requested from <head>."""
+        if not self.in_head:
+            return
+        origin = _origin(url or '')
+        if origin and origin not in self.origins:
+            self.origins[origin] = self.getpos()[0]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        line = self.getpos()[0]
+        if tag == 'body':
+            self.in_head = False
+        elif tag == 'link':
+            rel = set((attrs.get('rel') or '').lower().split())
+            href = attrs.get('href') or ''
+            if 'stylesheet' in rel and href:
+                self.stylesheets.append({'url': href, 'line': line, 'in_head': self.in_head,
+                                         'media': (attrs.get('media') or 'all').lower(),
+                                         'disabled': 'disabled' in attrs})
+                self._use(href)
+            if rel & {'preconnect', 'dns-prefetch'}:
+                origin = _origin(href)
+                if origin:
+                    self.preconnect.add(origin)
+            if rel & {'preload', 'modulepreload'} and href:
+                self.preload.append({'url': href, 'as': attrs.get('as') or ''})
+        elif tag == 'script':
+            script_type = (attrs.get('type') or '').lower()
+            if attrs.get('src'):
+                self.scripts.append({'url': attrs['src'], 'line': line, 'in_head': self.in_head,
+                                     'deferred': 'async' in attrs or 'defer' in attrs or script_type == 'module'})
+                self._use(attrs['src'])
+            elif script_type in _EXECUTABLE_SCRIPT_TYPES:
+                self._script = {'line': line, 'bytes': 0}
+        elif tag == 'img':
+            self.images.append({'src': attrs.get('src') or '', 'line': line,
+                                'width': attrs.get('width'), 'height': attrs.get('height'),
+                                'loading': (attrs.get('loading') or '').lower(),
+                                'fetchpriority': (attrs.get('fetchpriority') or '').lower()})
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        elif tag == 'script' and self._script is not None:
+            self.inline_scripts.append(self._script)
+            self._script = None
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script['bytes'] += len(data.encode('utf-8'))
+
+
+def audit_page(page_path: str) -> Dict[str, Any]:
+    """Apply the page-level rules to one HTML file.
+
+    Module-level so it can run in ProcessPoolExecutor workers.
+
+    Returns:
+        Dict[str, Any]: path, findings, and the stylesheet/script URLs and
+        preload hints the asset-level rules need; 'error' is set on failure
+    """
+    result = {'path': page_path, 'findings': [], 'stylesheets': [], 'scripts': [], 'preload': [], 'error': None}
+    try:
+        with open(page_path, 'r', encoding='utf-8', errors='ignore') as f:
+            parser = _PageAudit()
+            parser.feed(f.read())
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+    findings = result['findings']
+    for sheet in parser.stylesheets:
+        if sheet['in_head'] and not sheet['disabled'] and sheet['media'] not in ('print', 'none'):
+            findings.append(_finding('render-blocking-css', 'warning',
+                                     'Stylesheet in <head> blocks first render; inline critical CSS '
+                                     'and load the rest without blocking', sheet['line'], url=sheet['url']))
+    for script in parser.scripts:
+        if script['in_head'] and not script['deferred']:
+            findings.append(_finding('render-blocking-script', 'error',
+                                     'Script in <head> without async/defer/type="module" blocks parsing',
+                                     script['line'], url=script['url']))
+    for script in parser.inline_scripts:
+        if script['bytes'] > INLINE_SCRIPT_MAX_BYTES:
+            findings.append(_finding('inline-script-large', 'warning',
+                                     f"Inline script of {script['bytes'] / 1024:.1f}KB is re-sent with every "
+                                     'page and never cached; move it to an external module',
+                                     script['line'], bytes=script['bytes']))
+
+    for index, image in enumerate(parser.images):
+        if image['src'].startswith('data:'):
+            continue
+        if not (image['width'] and image['height']):
+            findings.append(_finding('img-missing-dimensions', 'warning',
+                                     'Image without width and height causes layout shift',
+                                     image['line'], url=image['src']))
+        if index < EAGER_IMAGE_COUNT:
+            if image['loading'] == 'lazy':
+                findings.append(_finding('lcp-image-lazy', 'warning',
+                                         'Likely above-the-fold image is lazy-loaded, delaying LCP',
+                                         image['line'], url=image['src']))
+            elif index == 0 and image['fetchpriority'] != 'high' and \
+                    not any(hint['url'] == image['src'] for hint in parser.preload):
+                findings.append(_finding('lcp-image-not-prioritized', 'info',
+                                         'First image has no fetchpriority="high" or preload hint',
+                                         image['line'], url=image['src']))
+        elif image['loading'] != 'lazy':
+            findings.append(_finding('img-not-lazy', 'info', 'Image below the first screens without loading="lazy"',
+                                     image['line'], url=image['src']))
+
+    for origin, line in parser.origins.items():
+        if origin not in parser.preconnect:
+            findings.append(_finding('missing-preconnect', 'info',
+                                     f"No preconnect hint for {origin}", line, origin=origin))
+
+    result['stylesheets'] = [s['url'] for s in parser.stylesheets if s['in_head'] and not s['disabled']]
+    result['scripts'] = [s['url'] for s in parser.scripts]
+    result['preload'] = [hint['url'] for hint in parser.preload]
+    return result
+
+
+def minification_savings(content: str, kind: str) -> float:
+    """Estimated share of a CSS/JS file that minification would remove.
+
+    Removes block comments and collapses whitespace (and, for CSS, the space
+    around punctuation). Conservative: real minifiers also shorten names.
+    """
+    if not content:
+        return 0.0
+    stripped = _WHITESPACE.sub(' ', _BLOCK_COMMENT.sub('', content))
+    if kind == 'css':
+        stripped = _CSS_PUNCTUATION_SPACE.sub(r'\1', stripped)
+    return max(0.0, 1 - len(stripped.strip()) / len(content))
+
+
+class HTMLAuditor:
+    """Audits every built page and the stylesheets and scripts they load."""
+
+    def __init__(self, project_path: str, weights: Optional[PageWeightAnalyzer] = None):
+        """Initialize the auditor.
+
+        Args:
+            project_path: Root path of the project
+            weights: Page weight analyzer reused for page discovery and URL resolution
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.weights = weights or PageWeightAnalyzer(self.project_path)
+        self.history_dir = os.path.join(self.project_path, HISTORY_DIR)
+
+    def _asset_findings(self, path: str, url: str) -> List[Dict[str, Any]]:
+        """Findings for one local stylesheet or script; fonts are checked by the caller."""
+        kind = resource_type(path)
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        size = len(content.encode('utf-8'))
+        savings = minification_savings(content, kind)
+        if size >= UNMINIFIED_MIN_BYTES and savings >= UNMINIFIED_MIN_SAVINGS:
+            return [_finding('unminified-asset', 'warning',
+                             f"{kind.upper()} looks unminified (~{savings * 100:.0f}% of {size / 1024:.1f}KB removable)",
+                             url=url, bytes=size, savings=round(savings, 3))]
+        return []
+
+    def _fonts(self, path: str) -> List[str]:
+        """Local web fonts referenced by a stylesheet, resolved to files."""
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            references = css_references(f.read())
+        fonts = []
+        for reference in references:
+            if reference.split('?')[0].lower().endswith(_FONT_EXTENSIONS):
+                font = self.weights.resolve(self.weights.site_root(), path, reference)
+                if font:
+                    fonts.append(font)
+        return fonts
+
+    def audit(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Audit all pages in parallel.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+
+        Returns:
+            Dict[str, Any]: Report with commit, per-page findings (page,
+            findings with rule, severity, message, line and URL) and finding
+            counts per rule and severity
+        """
+        site_root = self.weights.site_root()
+        pages = self.weights.find_pages(site_root)
+        commit, dirty = current_commit(self.project_path)
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(pages) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(audit_page, pages, chunksize=chunksize))
+
+        asset_cache: Dict[str, List[Dict[str, Any]]] = {}
+        font_cache: Dict[str, List[str]] = {}
+        report_pages = []
+        for result in results:
+            page = result['path']
+            findings = list(result['findings'])
+            if result['error']:
+                findings.append(_finding('parse-error', 'error', result['error']))
+
+            preloaded = {self.weights.resolve(site_root, page, url) for url in result['preload']}
+            for url in result['stylesheets'] + result['scripts']:
+                path = self.weights.resolve(site_root, page, url)
+                if not path or resource_type(path) not in ('css', 'js'):
+                    continue
+                if path not in asset_cache:
+                    asset_cache[path] = self._asset_findings(path, url)
+                findings.extend(asset_cache[path])
+                if url in result['stylesheets'] and resource_type(path) == 'css':
+                    if path not in font_cache:
+                        font_cache[path] = self._fonts(path)
+                    for font in font_cache[path]:
+                        if font not in preloaded:
+                            findings.append(_finding(
+                                'missing-font-preload', 'info',
+                                'Web font used by a render-blocking stylesheet is not preloaded',
+                                url=os.path.relpath(font, site_root).replace(os.sep, '/')))
+
+            findings.sort(key=lambda f: (SEVERITIES.index(f['severity']), f['rule'], f.get('line', 0)))
+            report_pages.append({'page': os.path.relpath(page, site_root).replace(os.sep, '/'), 'findings': findings})
+
+        report_pages.sort(key=lambda p: p['page'])
+        by_rule: Dict[str, int] = {}
+        by_severity = {severity: 0 for severity in SEVERITIES}
+        for page in report_pages:
+            for finding in page['findings']:
+                by_rule[finding['rule']] = by_rule.get(finding['rule'], 0) + 1
+                by_severity[finding['severity']] += 1
+        return {
+            'commit': commit,
+            'dirty': dirty,
+            'generated': time.time(),
+            'site_root': os.path.relpath(site_root, self.project_path),
+            'pages': report_pages,
+            'summary': {'pages': len(report_pages), 'by_severity': by_severity,
+                        'by_rule': dict(sorted(by_rule.items(), key=lambda item: -item[1]))}
+        }
+
+    def save(self, report: Dict[str, Any]) -> str:
+        """Store a report under its commit, replacing any earlier report for it."""
+        os.makedirs(self.history_dir, exist_ok=True)
+        path = os.path.join(self.history_dir, f"{report['commit']}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def format_summary(report: Dict[str, Any], limit: int = 10) -> List[str]:
+    """Printable rule counts and the pages with the most serious findings."""
+    summary = report['summary']
+    severity = summary['by_severity']
+    lines = [f"{summary['pages']} pages: {severity['error']} errors, {severity['warning']} warnings, "
+             f"{severity['info']} suggestions"]
+    for rule, count in summary['by_rule'].items():
+        lines.append(f"{count:6}  {rule}")
+
+    def weight(page):
+        return tuple(-sum(1 for f in page['findings'] if f['severity'] == s) for s in SEVERITIES)
+    worst = [page for page in sorted(report['pages'], key=weight) if page['findings']][:limit]
+    if worst:
+        lines.append('')
+        lines.append('Pages with the most serious findings:')
+        for page in worst:
+            counts = ', '.join(f"{sum(1 for f in page['findings'] if f['severity'] == s)} {s}" for s in SEVERITIES)
+            lines.append(f"  {page['page']} ({counts})")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: `html-audit [project] [--json]`; exit 1 if any page has errors."""
+    argv = argv or []
+    as_json = '--json' in argv
+    paths = [arg for arg in argv if arg != '--json']
+    auditor = HTMLAuditor(paths[0] if paths else os.getcwd())
+    report = auditor.audit()
+    auditor.save(report)
+    if as_json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print('\n'.join(format_summary(report)))
+    return 1 if report['summary']['by_severity']['error'] else 0
@@ -0,0 +1,141 @@
+"""Perceptual image hashing and near-duplicate clustering.
+
+Images are decoded once into tiny grayscale thumbnails (in worker processes,
+using JPEG draft mode so large photos are never fully decoded), then the
+average hash (aHash) and difference hash (dHash) of the whole batch are
+computed at once with NumPy. Near-duplicates are found with a BK-tree over
+dHash Hamming distances and confirmed against aHash.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+# Try to import numpy, but make it optional
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+HASH_SIZE = 8
+# Bump when thumbnailing or hashing changes to invalidate cached hashes
+HASH_VERSION = 1
+
+
+def load_thumbnail(image_path: str) -> Dict[str, Any]:
+    """Decode an image into the thumbnails needed for hashing.
+
+    Module-level so it can run in ProcessPoolExecutor workers.
+
+    Returns:
+        Dict[str, Any]: path, width, height, 'average' (8x8) and 'gradient'
+        (9x8) grayscale pixels as bytes; 'error' is set on failure
+    """
+    result = {'path': image_path, 'width': 0, 'height': 0, 'average': None, 'gradient': None, 'error': None}
+    try:
+        with Image.open(image_path) as img:
+            result['width'], result['height'] = img.size
+            # JPEG decodes at 1/2..1/8 scale directly; other formats ignore this
+            img.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+            gray = img.convert('L')
+        result['average'] = gray.resize((HASH_SIZE, HASH_SIZE), Image.BOX).tobytes()
+        result['gradient'] = gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX).tobytes()
+        return result
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+
+def compute_hashes(average: List[bytes], gradient: List[bytes]) -> Tuple[List[int], List[int]]:
+    """Compute aHash and dHash for a batch of thumbnails in one vectorized pass.
+
+    Args:
+        average: 8x8 grayscale thumbnails
+        gradient: 9x8 grayscale thumbnails
+
+    Returns:
+        Tuple[List[int], List[int]]: 64-bit aHashes and dHashes
+    """
+    if not average:
+        return [], []
+    pixels = np.frombuffer(b''.join(average), dtype=np.uint8).reshape(-1, HASH_SIZE * HASH_SIZE)
+    average_bits = pixels > pixels.mean(axis=1, keepdims=True)
+
+    rows = np.frombuffer(b''.join(gradient), dtype=np.uint8).reshape(-1, HASH_SIZE, HASH_SIZE + 1)
+    gradient_bits = (rows[:, :, 1:] > rows[:, :, :-1]).reshape(-1, HASH_SIZE * HASH_SIZE)
+
+    def pack(bits):
+        return np.packbits(bits, axis=1).view('>u8').ravel().tolist()
+    return pack(average_bits), pack(gradient_bits)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree for Hamming-distance range queries over hashes."""
+
+    def __init__(self):
+        # Each node is [hash, item, {distance: child}]
+        self.root: Optional[list] = None
+
+    def add(self, value: int, item: Any) -> None:
+        """Insert a hash with an associated item."""
+        if self.root is None:
+            self.root = [value, item, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, item, {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> Iterator[Tuple[int, Any]]:
+        """Yield (distance, item) for every stored hash within max_distance."""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                yield distance, node[1]
+            # Triangle inequality: only children in [d - max, d + max] can match
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+
+
+def cluster_hashes(average: List[int], gradient: List[int], threshold: int) -> List[List[int]]:
+    """Group indexes whose aHash and dHash are both within threshold bits.
+
+    Clusters are connected components, so A~B and B~C puts all three together.
+
+    Returns:
+        List[List[int]]: Clusters of two or more indexes
+    """
+    parent = list(range(len(gradient)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    tree = BKTree()
+    for index, value in enumerate(gradient):
+        for _, other in tree.search(value, threshold):
+            if hamming(average[index], average[other]) <= threshold:
+                parent[find(index)] = find(other)
+        tree.add(value, index)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(gradient)):
+        groups.setdefault(find(index), []).append(index)
+    return [members for members in groups.values() if len(members) > 1]
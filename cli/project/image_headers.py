@@ -0,0 +1,105 @@
+"""Header-only image dimension parsing.
+
+Reads just enough bytes of PNG, JPEG, GIF, WebP and AVIF files to get the
+format and pixel dimensions, without decoding any image data.
+"""
+
+import struct
+from typing import Dict, Optional, Tuple
+
+# Enough for every fixed-offset header; JPEG and AVIF read further on demand
+_HEAD_BYTES = 64
+_AVIF_SCAN_BYTES = 64 * 1024
+
+# JPEG start-of-frame markers carry the dimensions (C4, C8 and CC are not SOF)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _png_size(head: bytes) -> Optional[Tuple[int, int]]:
+    if head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+def _gif_size(head: bytes) -> Optional[Tuple[int, int]]:
+    return struct.unpack('<HH', head[6:10])
+
+
+def _webp_size(head: bytes) -> Optional[Tuple[int, int]]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        b0, b1, b2, b3 = head[21:25]
+        return 1 + (b0 | (b1 & 0x3F) << 8), 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0F) << 10)
+    if chunk == b'VP8X':
+        return 1 + int.from_bytes(head[24:27], 'little'), 1 + int.from_bytes(head[27:30], 'little')
+    return None
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # standalone markers have no length field
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def _avif_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(0)
+    data = f.read(_AVIF_SCAN_BYTES)
+    # The image spatial extents property: box header, version/flags, then width and height
+    index = data.find(b'ispe')
+    if index == -1 or index + 16 > len(data):
+        return None
+    return struct.unpack('>II', data[index + 8:index + 16])
+
+
+def read_image_header(path: str) -> Optional[Dict[str, object]]:
+    """Get format and dimensions of an image from its header.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        Optional[Dict[str, object]]: 'format', 'width' and 'height', or None if
+        the file is not a recognised image
+    """
+    with open(path, 'rb') as f:
+        head = f.read(_HEAD_BYTES)
+        size = None
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            image_format, size = 'PNG', _png_size(head)
+        elif head[:6] in (b'GIF87a', b'GIF89a'):
+            image_format, size = 'GIF', _gif_size(head)
+        elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            image_format, size = 'WEBP', _webp_size(head)
+        elif head[:2] == b'\xff\xd8':
+            image_format, size = 'JPEG', _jpeg_size(f)
+        elif head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis', b'mif1', b'msf1'):
+            image_format, size = 'AVIF', _avif_size(f)
+        else:
+            return None
+
+    if size is None:
+        return None
+    return {'format': image_format, 'width': size[0], 'height': size[1]}
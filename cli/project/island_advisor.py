@@ -0,0 +1,327 @@
+"""Lazy-loading advice from the static import graph of src/.
+
+Every .astro, .tsx/.jsx and .ts/.js source is parsed once for its imports,
+dynamic imports, imported bindings and hydrated islands (components with a
+``client:*`` directive); parse results are cached by content hash, so re-runs
+only parse files that changed. Pages are then walked through the .astro
+components they render to find every island, and each island's transitive
+static imports give the JavaScript it pulls into the page. Weights are source
+bytes (an upper bound on the minified output); npm packages count as the size
+of their entry module.
+
+Islands hydrated on load are ranked by the bytes that deferring them
+(client:visible / client:idle) would take off the initial load of the pages
+using them, and heavy dependencies of already deferred islands are ranked as
+dynamic import candidates.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .asset_cache import CACHE_DIR_NAME, AssetCache
+from .asset_references import load_aliases
+
+# Bump when parsing changes to invalidate cached parse results
+GRAPH_VERSION = 1
+
+SOURCE_EXTENSIONS = ('.astro', '.tsx', '.jsx', '.ts', '.js', '.mjs')
+# Files that ship to the browser when imported by an island
+_CLIENT_EXTENSIONS = ('.tsx', '.jsx', '.ts', '.js', '.mjs', '.cjs', '.css')
+_RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '.mjs', '.astro',
+                     '/index.ts', '/index.tsx', '/index.js', '/index.jsx')
+
+# Directives that hydrate as soon as the page loads
+EAGER_DIRECTIVES = ('load', 'only')
+# Dependencies of deferred islands worth splitting out with a dynamic import
+DYNAMIC_IMPORT_MIN_BYTES = 30 * 1024
+
+_IMPORT = re.compile(r"""\bimport\s+(type\s+)?([\w$*{}\s,]+?)\s+from\s*["']([^"']+)["']""")
+_SIDE_EFFECT_IMPORT = re.compile(r"""\bimport\s*["']([^"']+)["']""")
+_REEXPORT = re.compile(r"""\bexport\s+(type\s+)?[\w$*{}\s,]*?\s*from\s*["']([^"']+)["']""")
+_DYNAMIC_IMPORT = re.compile(r"""\bimport\(\s*["']([^"']+)["']\s*\)""")
+_ISLAND = re.compile(r"""<([A-Z][\w.]*)\b[^<>]*?\bclient:(load|idle|visible|media|only)\b""")
+_LINE_COMMENT = re.compile(r'^\s*//.*$', re.MULTILINE)
+
+
+def parse_source(content: str) -> Dict[str, Any]:
+    """Imports, bindings and islands of one source file.
+
+    Returns:
+        Dict[str, Any]: 'imports' and 'dynamic' specifiers, 'bindings'
+        (local name -> specifier, for resolving island components) and
+        'islands' (component name and client directive)
+    """
+    content = _LINE_COMMENT.sub('', content)
+    imports: Set[str] = set()
+    bindings: Dict[str, str] = {}
+    for match in _IMPORT.finditer(content):
+        type_only, clause, specifier = match.groups()
+        if type_only:
+            continue
+        imports.add(specifier)
+        for name in re.split(r'[{},]', clause):
+            name = name.strip()
+            if not name or name.startswith('type '):
+                continue
+            # `* as UI`, `Button as B` -> bind the local name
+            bindings[name.split(' as ')[-1].strip()] = specifier
+    imports.update(_SIDE_EFFECT_IMPORT.findall(content))
+    imports.update(specifier for type_only, specifier in _REEXPORT.findall(content) if not type_only)
+    islands = [{'component': name, 'directive': directive} for name, directive in _ISLAND.findall(content)]
+    return {
+        'imports': sorted(imports),
+        'dynamic': sorted(set(_DYNAMIC_IMPORT.findall(content))),
+        'bindings': bindings,
+        'islands': islands
+    }
+
+
+class ImportGraph:
+    """Resolved static import graph of the project sources, parsed incrementally."""
+
+    def __init__(self, project_path: str, cache: Optional[AssetCache] = None):
+        """Initialize the graph.
+
+        Args:
+            project_path: Root path of the project
+            cache: Asset cache whose stat index provides content hashes
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.cache = cache or AssetCache(self.project_path)
+        self.cache_path = os.path.join(self.project_path, CACHE_DIR_NAME, 'import-graph.json')
+        self.aliases = load_aliases(self.project_path)
+        self.stats = {'parsed': 0, 'reused': 0}
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._packages: Dict[str, Optional[str]] = {}
+        self._by_hash = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Cached parse results keyed by content hash."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == GRAPH_VERSION:
+                return data['files']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def save(self) -> None:
+        """Persist parse results of the files seen this run (dropping stale hashes)."""
+        files = {entry['hash']: entry['parsed'] for entry in self._parsed.values()}
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': GRAPH_VERSION, 'files': files}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.cache.save()
+
+    def parse(self, path: str) -> Dict[str, Any]:
+        """Parse results of a file, reused from the cache when its content is unchanged."""
+        if path not in self._parsed:
+            digest = self.cache.file_hash(path)
+            parsed = self._by_hash.get(digest)
+            if parsed is None:
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    parsed = parse_source(f.read())
+                self.stats['parsed'] += 1
+            else:
+                self.stats['reused'] += 1
+            self._parsed[path] = {'hash': digest, 'parsed': parsed}
+        return self._parsed[path]['parsed']
+
+    def size(self, path: str) -> int:
+        """Size of a file in bytes."""
+        if path not in self._sizes:
+            self._sizes[path] = os.path.getsize(path)
+        return self._sizes[path]
+
+    def _package_entry(self, specifier: str) -> Optional[str]:
+        """Entry module of an npm package import (e.g. 'react-dom/client')."""
+        if specifier in self._packages:
+            return self._packages[specifier]
+        parts = specifier.split('/')
+        name_parts = 2 if specifier.startswith('@') else 1
+        package_dir = os.path.join(self.project_path, 'node_modules', *parts[:name_parts])
+        subpath = '/'.join(parts[name_parts:])
+        entry = None
+        if subpath:
+            entry = self._probe(os.path.join(package_dir, subpath))
+        else:
+            try:
+                with open(os.path.join(package_dir, 'package.json'), 'r') as f:
+                    manifest = json.load(f)
+                main = manifest.get('module') or manifest.get('main') or 'index.js'
+            except (OSError, ValueError):
+                main = 'index.js'
+            entry = self._probe(os.path.join(package_dir, main))
+        self._packages[specifier] = entry
+        return entry
+
+    @staticmethod
+    def _probe(base: str) -> Optional[str]:
+        """First existing file for an extensionless import path."""
+        for suffix in _RESOLVE_SUFFIXES:
+            candidate = base + suffix
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def resolve(self, importer: str, specifier: str) -> Optional[str]:
+        """Resolve an import specifier to a file (sources or an npm package entry)."""
+        specifier = specifier.split('?', 1)[0]
+        for alias, target in self.aliases.items():
+            if specifier.startswith(alias):
+                return self._probe(os.path.join(self.project_path, target + specifier[len(alias):]))
+        if specifier.startswith('.'):
+            return self._probe(os.path.normpath(os.path.join(os.path.dirname(importer), specifier)))
+        if specifier.startswith('/') or ':' in specifier:
+            return None
+        return self._package_entry(specifier)
+
+    def is_package(self, path: str) -> bool:
+        """Whether a resolved file lives in node_modules (and is not followed further)."""
+        return f"{os.sep}node_modules{os.sep}" in path
+
+    def client_closure(self, entry: str) -> Set[str]:
+        """Files an island entry pulls in through static imports."""
+        seen, pending = set(), [entry]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            if self.is_package(path) or not path.endswith(SOURCE_EXTENSIONS):
+                continue
+            for specifier in self.parse(path)['imports']:
+                target = self.resolve(path, specifier)
+                if target and target.endswith(_CLIENT_EXTENSIONS):
+                    pending.append(target)
+        return seen
+
+    def page_islands(self, page: str) -> List[Dict[str, Any]]:
+        """Islands rendered by a page, directly or through the .astro components it uses."""
+        islands, seen, pending = [], set(), [page]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            parsed = self.parse(path)
+            for island in parsed['islands']:
+                binding = island['component'].split('.')[0]
+                specifier = parsed['bindings'].get(binding)
+                target = self.resolve(path, specifier) if specifier else None
+                if target:
+                    islands.append(dict(island, file=target, rendered_by=path))
+            for specifier in parsed['imports']:
+                target = self.resolve(path, specifier)
+                if target and target.endswith('.astro'):
+                    pending.append(target)
+        return islands
+
+
+def _rel(project_path: str, path: str) -> str:
+    """Project-relative path with forward slashes."""
+    return os.path.relpath(path, project_path).replace(os.sep, '/')
+
+
+def advise(project_path: str, pages_dir: str = os.path.join('src', 'pages'),
+           graph: Optional[ImportGraph] = None) -> Dict[str, Any]:
+    """Compute island weights per page and rank lazy-loading candidates.
+
+    Args:
+        project_path: Root path of the project
+        pages_dir: Directory of Astro pages, relative to the project
+        graph: Import graph to reuse (defaults to a new one)
+
+    Returns:
+        Dict[str, Any]: 'pages' (islands with their bytes and bytes not shared
+        with other eagerly hydrated islands), 'candidates' ranked by bytes
+        saved across pages, and parse 'stats'
+    """
+    project_path = os.path.abspath(project_path)
+    graph = graph or ImportGraph(project_path)
+    root = os.path.join(project_path, pages_dir)
+    pages = sorted(os.path.join(directory, name) for directory, _, files in os.walk(root)
+                   for name in files if name.endswith('.astro'))
+
+    closures: Dict[str, Set[str]] = {}
+    candidates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    page_reports = []
+    for page in pages:
+        islands = graph.page_islands(page)
+        for island in islands:
+            if island['file'] not in closures:
+                closures[island['file']] = graph.client_closure(island['file'])
+
+        eager = [island for island in islands if island['directive'] in EAGER_DIRECTIVES]
+        rows = []
+        for island in islands:
+            closure = closures[island['file']]
+            others = set()
+            for other in eager:
+                if other['file'] != island['file']:
+                    others |= closures[other['file']]
+            exclusive = closure - others
+            row = {
+                'component': island['component'],
+                'file': _rel(project_path, island['file']),
+                'directive': island['directive'],
+                'rendered_by': _rel(project_path, island['rendered_by']),
+                'modules': len(closure),
+                'bytes': sum(graph.size(path) for path in closure),
+                'exclusive_bytes': sum(graph.size(path) for path in exclusive)
+            }
+            rows.append(row)
+
+            if island['directive'] in EAGER_DIRECTIVES:
+                suggestion = 'client:visible or client:idle'
+                if island['directive'] == 'only':
+                    suggestion = 'dynamic import inside a client:visible wrapper'
+                key = (row['file'], suggestion)
+                candidate = candidates.setdefault(key, {
+                    'component': row['component'], 'file': row['file'], 'directive': island['directive'],
+                    'suggestion': suggestion, 'pages': [], 'bytes_per_page': row['exclusive_bytes'],
+                    'bytes_saved': 0})
+                candidate['pages'].append(_rel(project_path, page))
+                candidate['bytes_saved'] += row['exclusive_bytes']
+            else:
+                for path in exclusive:
+                    if path == island['file'] or graph.size(path) < DYNAMIC_IMPORT_MIN_BYTES:
+                        continue
+                    key = (_rel(project_path, path), 'dynamic import')
+                    candidate = candidates.setdefault(key, {
+                        'component': row['component'], 'file': key[0], 'directive': island['directive'],
+                        'suggestion': f"dynamic import from {row['file']}", 'pages': [],
+                        'bytes_per_page': graph.size(path), 'bytes_saved': 0})
+                    candidate['pages'].append(_rel(project_path, page))
+                    candidate['bytes_saved'] += graph.size(path)
+
+        eager_files = set().union(*(closures[island['file']] for island in eager)) if eager else set()
+        page_reports.append({
+            'page': _rel(project_path, page),
+            'islands': sorted(rows, key=lambda row: -row['bytes']),
+            'eager_bytes': sum(graph.size(path) for path in eager_files)
+        })
+
+    graph.save()
+    page_reports.sort(key=lambda page: -page['eager_bytes'])
+    return {
+        'pages': page_reports,
+        'candidates': sorted(candidates.values(), key=lambda c: -c['bytes_saved']),
+        'stats': dict(graph.stats, pages=len(pages))
+    }
+
+
+def format_candidates(report: Dict[str, Any], limit: int = 10) -> List[str]:
+    """Printable lines for the ranked lazy-loading candidates."""
+    lines = []
+    for candidate in report['candidates'][:limit]:
+        lines.append(f"{candidate['bytes_saved'] / 1024:8.1f}KB  {candidate['component']} "
+                     f"(client:{candidate['directive']}, {candidate['file']}) -> {candidate['suggestion']} "
+                     f"on {len(candidate['pages'])} page(s)")
+    return lines
@@ -0,0 +1,613 @@
+"""Asyncio HTTP load generator for the built site.
+
+The site is served from dist/ by a small asyncio static server running in a
+separate process (so serving does not compete with the load generator for
+the GIL), or an already running server such as ``astro preview`` is
+targeted. Workers keep one HTTP/1.1 connection each and request routes
+drawn from a weighted mix. Latencies go into HDR-style log-linear
+histograms, which keep a bounded relative error at any latency without
+storing individual samples.
+"""
+
+import asyncio
+import fnmatch
+import json
+import mimetypes
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .asset_references import astro_base
+from .benchmark_history import BenchmarkHistory
+from .page_weight import PageWeightAnalyzer, current_commit
+
+HISTORY_DIR = os.path.join('.perf-history', 'load-tests')
+CONFIG_FILE = 'load-test.json'
+
+DEFAULT_CONFIG = {
+    'concurrency': 10,
+    'duration': 10.0,
+    'warmup': 1.0,
+    # Target requests per second across all workers (None: as fast as possible)
+    'rate': None,
+    'timeout': 10.0,
+    # URL glob -> share of traffic, split evenly over the URLs it matches
+    'mix': {'pages': 1.0}
+}
+
+# Mix key standing for every built page
+PAGES_GROUP = 'pages'
+
+# A worker gives up after this many connection failures in a row; the wait
+# between attempts doubles from CONNECT_BACKOFF up to MAX_CONNECT_BACKOFF seconds
+MAX_CONNECT_FAILURES = 10
+CONNECT_BACKOFF = 0.01
+MAX_CONNECT_BACKOFF = 1.0
+
+USAGE = "Usage: load-test [static|preview|http(s)://host[:port]/] [concurrency] [duration]"
+
+
+def check_target_url(url: str) -> None:
+    """Make sure a target is an absolute http(s) URL with a host.
+
+    Raises:
+        ValueError: If it is not
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f"Target must be 'static', 'preview' or an http(s) URL with a host, not {url!r}")
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in microseconds (HDR histogram bucketing).
+
+    Values below 2**SUB_BUCKET_BITS are recorded exactly; above that each
+    power of two is split into 2**(SUB_BUCKET_BITS - 1) linear buckets, so
+    the relative error stays below 1/64.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        """Bucket index of a value; monotonic in the value."""
+        shift = max(0, value.bit_length() - cls.SUB_BUCKET_BITS)
+        return (shift << (cls.SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def _highest_equivalent(cls, index: int) -> int:
+        """Largest value that falls into a bucket."""
+        half = 1 << (cls.SUB_BUCKET_BITS - 1)
+        if index < 2 * half:
+            return index
+        shift = (index >> (cls.SUB_BUCKET_BITS - 1)) - 1
+        mantissa = index - (shift << (cls.SUB_BUCKET_BITS - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        """Record one latency."""
+        value_us = max(0, int(value_us))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value_us
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = max(self.max, value_us)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add another histogram's counts to this one."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> int:
+        """Value at a percentile (the highest value of the bucket reaching it)."""
+        if not self.total:
+            return 0
+        target = max(1, -(-self.total * pct // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, float]:
+        """min/mean/p50/p90/p95/p99/max in milliseconds."""
+        summary = {'min': (self.min or 0) / 1000, 'mean': self.sum / self.total / 1000 if self.total else 0.0}
+        for pct in (50, 90, 95, 99):
+            summary[f"p{pct}"] = self.percentile(pct) / 1000
+        summary['max'] = self.max / 1000
+        return {key: round(value, 3) for key, value in summary.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (bucket upper bound in microseconds -> count)."""
+        return {str(self._highest_equivalent(index)): count for index, count in sorted(self.counts.items())}
+
+
+class _StaticSite:
+    """Maps request paths to files under the site root, caching file bodies."""
+
+    def __init__(self, root: str, base: str):
+        self.root = os.path.abspath(root)
+        self.base = f"/{base}" if base else ''
+        self._files: Dict[str, Optional[Tuple[bytes, str]]] = {}
+
+    def lookup(self, target: str) -> Optional[Tuple[bytes, str]]:
+        """Body and content type for a request target, or None if not found."""
+        path = unquote(urlsplit(target).path)
+        if path in self._files:
+            return self._files[path]
+        relative = path
+        if self.base and (path + '/').startswith(self.base + '/'):
+            relative = path[len(self.base):] or '/'
+        candidate = os.path.normpath(os.path.join(self.root, relative.lstrip('/')))
+        found = None
+        if candidate == self.root or candidate.startswith(self.root + os.sep):
+            for option in (candidate, os.path.join(candidate, 'index.html'), candidate + '.html'):
+                if os.path.isfile(option):
+                    with open(option, 'rb') as f:
+                        found = (f.read(), mimetypes.guess_type(option)[0] or 'application/octet-stream')
+                    break
+        self._files[path] = found
+        return found
+
+
+async def _serve_connection(site: _StaticSite, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer GET/HEAD requests on one keep-alive connection."""
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, _ = lines[0].split(' ', 2)
+            keep_alive = not any(line.lower() == 'connection: close' for line in lines[1:])
+            found = site.lookup(target) if method in ('GET', 'HEAD') else None
+            body, content_type = found or (b'Not Found', 'text/plain')
+            status = '200 OK' if found else '404 Not Found'
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1'))
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve_static(root: str, base: str, port: int, ready) -> None:
+    """Serve a directory until terminated; sends the bound port through `ready`.
+
+    Module-level so it can be the target of a multiprocessing.Process.
+    """
+    site = _StaticSite(root, base)
+
+    async def main():
+        server = await asyncio.start_server(lambda r, w: _serve_connection(site, r, w),
+                                            '127.0.0.1', port, backlog=1024)
+        ready.send(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+class StaticServer:
+    """Runs serve_static in a child process for the duration of a `with` block."""
+
+    def __init__(self, root: str, base: str = '', port: int = 0):
+        self.root = root
+        self.base = base
+        self.port = port
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the served site."""
+        return f"http://127.0.0.1:{self.port}/{self.base + '/' if self.base else ''}"
+
+    def __enter__(self) -> 'StaticServer':
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=serve_static, args=(self.root, self.base, self.port, sender),
+                                                daemon=True)
+        self._process.start()
+        if not receiver.poll(10):
+            self._process.terminate()
+            raise RuntimeError('Static server did not start')
+        self.port = receiver.recv()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._process.terminate()
+        self._process.join(5)
+
+
+def start_preview(project_path: str, port: int = 4321, timeout: float = 60.0) -> subprocess.Popen:
+    """Start `astro preview` and wait until it accepts connections."""
+    process = subprocess.Popen(['npx', 'astro', 'preview', '--host', '127.0.0.1', '--port', str(port)],
+                               cwd=project_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"astro preview exited with code {process.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError('astro preview did not start listening in time')
+
+
+def site_urls(site_root: str, pages: List[str], base: str) -> Tuple[List[str], List[str]]:
+    """Request paths of the built pages and of every other file of the site."""
+    prefix = f"/{base}" if base else ''
+    page_set = set(pages)
+    page_urls, asset_urls = [], []
+    for directory, _, files in os.walk(site_root):
+        for name in files:
+            path = os.path.join(directory, name)
+            rel = os.path.relpath(path, site_root).replace(os.sep, '/')
+            if path in page_set:
+                route = '/' + rel
+                route = route[:-len('index.html')] if route.endswith('/index.html') else route
+                page_urls.append(prefix + route)
+            elif not name.startswith('.'):
+                asset_urls.append(f"{prefix}/{rel}")
+    return sorted(page_urls), sorted(asset_urls)
+
+
+def build_mix(mix: Dict[str, float], page_urls: List[str], asset_urls: List[str]) -> Tuple[List[str], List[float]]:
+    """Expand a mix of URL globs into request paths and weights.
+
+    The 'pages' key stands for every built page; other keys are globs matched
+    against all site URLs. Each key's weight is split evenly over its matches.
+    """
+    weights: Dict[str, float] = {}
+    for pattern, share in mix.items():
+        if pattern == PAGES_GROUP:
+            matches = page_urls
+        else:
+            matches = [url for url in page_urls + asset_urls if fnmatch.fnmatchcase(url, pattern)]
+        for url in matches:
+            weights[url] = weights.get(url, 0.0) + share / len(matches)
+    return list(weights), list(weights.values())
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, int, bool]:
+    """Read one response; returns status, body bytes and whether the connection stays open."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip().lower()] = value.strip().lower()
+    keep_alive = headers.get('connection') != 'close'
+
+    if 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+        return status, len(body), keep_alive
+    if headers.get('transfer-encoding') == 'chunked':
+        size = 0
+        while True:
+            chunk_size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if chunk_size == 0:
+                await reader.readuntil(b'\r\n')
+                return status, size, keep_alive
+            size += len(await reader.readexactly(chunk_size + 2)) - 2
+    return status, len(await reader.read()), False
+
+
+class LoadGenerator:
+    """Drives concurrent HTTP/1.1 keep-alive workers against a base URL."""
+
+    def __init__(self, base_url: str, urls: List[str], weights: List[float], concurrency: int = 10,
+                 duration: float = 10.0, warmup: float = 1.0, rate: Optional[float] = None,
+                 timeout: float = 10.0, seed: Optional[int] = None):
+        """Initialize the generator.
+
+        Args:
+            base_url: Scheme, host and port requests go to (paths come from urls)
+            urls: Request paths
+            weights: Relative frequency of each path
+            concurrency: Number of connections/workers
+            duration: Seconds of measured load
+            warmup: Seconds of load before measuring starts
+            rate: Target requests per second in total; latencies are then
+                measured from each request's scheduled time, so a stalled
+                server is not hidden by workers waiting (coordinated omission)
+            timeout: Seconds before a request counts as an error
+            seed: Seed for the request mix
+        """
+        check_target_url(base_url)
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.ssl = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.urls = urls
+        self.weights = weights
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.rate = rate
+        self.timeout = timeout
+        self.random = random.Random(seed)
+
+    async def _worker(self, start: float, end: float, results: Dict[str, Any], worker_index: int) -> None:
+        """Issue requests on one connection until the end time."""
+        reader = writer = None
+        connect_failures = 0
+        interval = self.concurrency / self.rate if self.rate else 0.0
+        scheduled = start + worker_index * interval / self.concurrency
+        while True:
+            now = time.perf_counter()
+            if self.rate:
+                if scheduled > now:
+                    await asyncio.sleep(scheduled - now)
+                began = scheduled
+                scheduled += interval
+            else:
+                began = now
+            if began >= end:
+                break
+            url = self.random.choices(self.urls, self.weights)[0]
+            connecting = writer is None
+            try:
+                if connecting:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port, ssl=self.ssl or None), self.timeout)
+                    connect_failures = 0
+                writer.write(f"GET {url} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                             "Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n".encode('latin-1'))
+                status, size, keep_alive = await asyncio.wait_for(_read_response(reader), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError, ValueError, IndexError) as e:
+                if began >= start + self.warmup:
+                    results['errors'][type(e).__name__] = results['errors'].get(type(e).__name__, 0) + 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                if connecting:
+                    # Back off instead of spinning on a refused or unreachable port
+                    connect_failures += 1
+                    if connect_failures >= MAX_CONNECT_FAILURES:
+                        break
+                    await asyncio.sleep(min(CONNECT_BACKOFF * 2 ** (connect_failures - 1), MAX_CONNECT_BACKOFF))
+                continue
+            finished = time.perf_counter()
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+            if began < start + self.warmup:
+                continue
+            latency = int((finished - began) * 1_000_000)
+            results['histogram'].record(latency)
+            route = results['routes'].setdefault(url, LatencyHistogram())
+            route.record(latency)
+            results['status'][status] = results['status'].get(status, 0) + 1
+            results['bytes'] += size
+        if writer is not None:
+            writer.close()
+
+    async def _run(self) -> Dict[str, Any]:
+        """Run all workers and collect their results."""
+        results = {'histogram': LatencyHistogram(), 'routes': {}, 'status': {}, 'errors': {}, 'bytes': 0}
+        start = time.perf_counter()
+        end = start + self.warmup + self.duration
+        await asyncio.gather(*(self._worker(start, end, results, i) for i in range(self.concurrency)))
+        results['elapsed'] = time.perf_counter() - start - self.warmup
+        return results
+
+    def run(self) -> Dict[str, Any]:
+        """Run the load test.
+
+        Returns:
+            Dict[str, Any]: requests, errors, status counts, throughput,
+            latency summary and histogram, and per-route p50/p95/p99
+        """
+        results = asyncio.run(self._run())
+        histogram = results['histogram']
+        elapsed = max(results['elapsed'], 1e-9)
+        return {
+            'concurrency': self.concurrency,
+            'duration': self.duration,
+            'rate': self.rate,
+            'requests': histogram.total,
+            'errors': results['errors'],
+            'status': {str(code): count for code, count in sorted(results['status'].items())},
+            'bytes': results['bytes'],
+            'throughput_rps': round(histogram.total / elapsed, 1),
+            'transfer_bps': round(results['bytes'] / elapsed),
+            'latency_ms': histogram.summary_ms(),
+            'histogram_us': histogram.to_dict(),
+            'routes': {
+                url: {'requests': route.total,
+                      **{key: value for key, value in route.summary_ms().items() if key in ('p50', 'p95', 'p99')}}
+                for url, route in sorted(results['routes'].items(), key=lambda item: -item[1].percentile(95))
+            }
+        }
+
+
+class LoadTester:
+    """Runs load tests against the built site and stores the results."""
+
+    def __init__(self, project_path: str):
+        """Initialize the tester.
+
+        Args:
+            project_path: Root path of the project
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.history_dir = os.path.join(self.project_path, HISTORY_DIR)
+
+    def load_config(self) -> Dict[str, Any]:
+        """Settings from load-test.json over DEFAULT_CONFIG."""
+        config = dict(DEFAULT_CONFIG)
+        path = os.path.join(self.project_path, CONFIG_FILE)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                config.update(json.load(f))
+        return config
+
+    def run(self, target: Optional[str] = None, **overrides) -> Dict[str, Any]:
+        """Run a load test.
+
+        Args:
+            target: None to serve dist/ locally, 'preview' to start `astro
+                preview`, or the base URL of a running server
+            **overrides: Settings overriding load-test.json (concurrency,
+                duration, warmup, rate, timeout, mix)
+
+        Returns:
+            Dict[str, Any]: LoadGenerator results plus target, commit and settings
+        """
+        config = self.load_config()
+        config.update({key: value for key, value in overrides.items() if value is not None})
+        weights_analyzer = PageWeightAnalyzer(self.project_path)
+        site_root = weights_analyzer.site_root()
+        base = astro_base(self.project_path)
+        page_urls, asset_urls = site_urls(site_root, weights_analyzer.find_pages(site_root), base)
+        urls, weights = build_mix(config['mix'], page_urls, asset_urls)
+        if not urls:
+            raise ValueError(f"No URLs match the request mix in {os.path.relpath(site_root, self.project_path)}/")
+
+        def generate(base_url: str) -> Dict[str, Any]:
+            return LoadGenerator(base_url, urls, weights, concurrency=int(config['concurrency']),
+                                 duration=float(config['duration']), warmup=float(config['warmup']),
+                                 rate=config['rate'], timeout=float(config['timeout'])).run()
+
+        if target is None:
+            with StaticServer(site_root, base) as server:
+                result = generate(server.url)
+            target_name = 'static'
+        elif target == 'preview':
+            process = start_preview(self.project_path)
+            try:
+                result = generate('http://127.0.0.1:4321/')
+            finally:
+                process.terminate()
+                process.wait(10)
+            target_name = 'preview'
+        else:
+            check_target_url(target)
+            result = generate(target)
+            target_name = target
+
+        commit, dirty = current_commit(self.project_path)
+        result.update({'target': target_name, 'commit': commit, 'dirty': dirty, 'timestamp': time.time(),
+                       'mix': config['mix'], 'urls': len(urls)})
+        return result
+
+    def save(self, result: Dict[str, Any]) -> str:
+        """Store a result and record its latency percentiles in the benchmark history."""
+        os.makedirs(self.history_dir, exist_ok=True)
+        path = os.path.join(self.history_dir, f"{int(result['timestamp'])}-{result['commit'][:12]}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f, indent=2)
+        os.replace(tmp_path, path)
+        if result['requests']:
+            latency = result['latency_ms']
+            BenchmarkHistory(self.project_path).record({
+                f"load.{result['target']}.p50_ms": [latency['p50']],
+                f"load.{result['target']}.p95_ms": [latency['p95']],
+                f"load.{result['target']}.p99_ms": [latency['p99']]
+            }, commit=result['commit'])
+        return path
+
+    def previous_result(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Latest stored run with the same target, concurrency and rate, before this one."""
+        if not os.path.isdir(self.history_dir):
+            return None
+        for name in sorted(os.listdir(self.history_dir), reverse=True):
+            if not name.endswith('.json'):
+                continue
+            with open(os.path.join(self.history_dir, name), 'r') as f:
+                previous = json.load(f)
+            if previous['timestamp'] >= result['timestamp']:
+                continue
+            if all(previous.get(key) == result.get(key) for key in ('target', 'concurrency', 'rate')):
+                return previous
+        return None
+
+    @staticmethod
+    def compare(result: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, float]:
+        """Relative change of throughput and latency percentiles against an earlier run."""
+        changes = {}
+        if previous['throughput_rps']:
+            changes['throughput_rps'] = (result['throughput_rps'] - previous['throughput_rps']) / previous['throughput_rps']
+        for key in ('p50', 'p95', 'p99'):
+            before = previous['latency_ms'][key]
+            if before:
+                changes[f"{key}_ms"] = (result['latency_ms'][key] - before) / before
+        return changes
+
+
+def format_result(result: Dict[str, Any], previous: Optional[Dict[str, Any]] = None, routes: int = 5) -> List[str]:
+    """Printable summary of a load test result."""
+    latency = result['latency_ms']
+    errors = sum(result['errors'].values())
+    lines = [
+        f"{result['requests']} requests to {result['target']} ({result['urls']} URLs, "
+        f"{result['concurrency']} connections), {errors} errors",
+        f"Throughput: {result['throughput_rps']:.1f} req/s, {result['transfer_bps'] / 1024 / 1024:.1f}MB/s",
+        f"Latency ms: p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  p95 {latency['p95']:.2f}  "
+        f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}",
+        f"Status: {', '.join(f'{code}x{count}' for code, count in result['status'].items())}"
+    ]
+    if result['errors']:
+        lines.append(f"Errors: {', '.join(f'{name}x{count}' for name, count in result['errors'].items())}")
+    if previous:
+        changes = LoadTester.compare(result, previous)
+        lines.append(f"Since {previous['commit'][:8]}: " +
+                     ', '.join(f"{key} {value * 100:+.1f}%" for key, value in changes.items()))
+    lines.append('Slowest routes (p95):')
+    for url, route in list(result['routes'].items())[:routes]:
+        lines.append(f"{route['p95']:8.2f}ms  {url} ({route['requests']} requests)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: `load-test [target] [concurrency] [duration]`; exit 1 on errors."""
+    argv = argv or []
+    if argv and argv[0] in ('-h', '--help'):
+        print(USAGE)
+        return 0
+    target = argv[0] if argv and argv[0] not in ('', 'static') else None
+    try:
+        if target not in (None, 'preview'):
+            check_target_url(target)
+        concurrency = int(argv[1]) if len(argv) > 1 else None
+        duration = float(argv[2]) if len(argv) > 2 else None
+    except ValueError as e:
+        print(f"{e}\n{USAGE}", file=sys.stderr)
+        return 2
+    tester = LoadTester(os.getcwd())
+    result = tester.run(target, concurrency=concurrency, duration=duration)
+    # A run without a single response says nothing about the site; keep it out of the history
+    if result['requests']:
+        tester.save(result)
+    print('\n'.join(format_result(result, tester.previous_result(result))))
+    return 1 if result['errors'] or not result['requests'] else 0
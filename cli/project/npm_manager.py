@@ -5,6 +5,8 @@ import os
 import shutil
 import subprocess
 from typing import Dict, Optional
+from .build_profiler import BuildProfiler, format_profile, format_trends
+from .process_tracker import ProcessTreeTracker, format_stats, record_command_stats
 
 class NPMManager:
     """Handles NPM-related operations."""
@@ -12,6 +14,7 @@ class NPMManager:
         self.ui = ui
         self.project_root = "/Users/drunkonjava/Desktop/HelloWorldGitHub"
         self._npm_scripts = self._load_npm_scripts()
+        self.last_command_stats = {}
 
     def _load_npm_scripts(self) -> Dict[str, str]:
         """Load available npm scripts from package.json."""
@@ -23,6 +26,12 @@ class NPMManager:
             self.ui.status_bar.update(f"Failed to load npm scripts: {str(e)}", 5)
             return {}
 
+    def _record_command_stats(self, stats: Dict[str, any]) -> None:
+        """Keep and log the resource usage of the last command."""
+        self.last_command_stats = stats
+        record_command_stats(self.project_root, stats)
+        print(f"{self.ui.theme.COLORS['INFO']}{format_stats(stats)}{self.ui.theme.COLORS['ENDC']}")
+
     def _map_command(self, command: str) -> Optional[str]:
         """Map menu commands to actual npm scripts."""
         command_map = {
@@ -70,12 +79,14 @@ class NPMManager:
             )
 
             # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            with ProcessTreeTracker(process.pid, label="npm install") as tracker:
+                while True:
+                    output = process.stdout.readline()
+                    if output == '' and process.poll() is not None:
+                        break
+                    if output:
+                        print(output.strip())
+            self._record_command_stats(tracker.stats)
 
             if process.poll() == 0:
                 print(f"\n{self.ui.theme.COLORS['SUCCESS']}Clean build completed successfully!{self.ui.theme.COLORS['ENDC']}")
@@ -132,7 +143,9 @@ class NPMManager:
                 text=True
             )
 
-            stdout, stderr = process.communicate()
+            with ProcessTreeTracker(process.pid, label=f"npm run {npm_script}") as tracker:
+                stdout, stderr = process.communicate()
+            self._record_command_stats(tracker.stats)
 
             if process.returncode != 0:
                 print(f"\n{self.ui.theme.COLORS['ERROR']}Error running {npm_script}:\n{stderr}{self.ui.theme.COLORS['ENDC']}")
@@ -159,6 +172,39 @@ class NPMManager:
             input()
             return False
 
+    def profile_build(self) -> bool:
+        """Run the production build and report per-phase and per-route timings."""
+        try:
+            print(f"\n{self.ui.theme.COLORS['INFO']}Profiling build...{self.ui.theme.COLORS['ENDC']}\n")
+            profiler = BuildProfiler(self.project_root)
+            profile = profiler.run()
+            profiler.save(profile)
+            self._record_command_stats(profile['resources'])
+
+            if profile['returncode'] != 0:
+                print(f"\n{self.ui.theme.COLORS['ERROR']}Build failed with exit code {profile['returncode']}{self.ui.theme.COLORS['ENDC']}")
+                print(f"{self.ui.theme.COLORS['INFO']}Press Enter to continue...{self.ui.theme.COLORS['ENDC']}")
+                input()
+                return False
+
+            print()
+            for line in format_profile(profile):
+                print(line)
+            trend_lines = format_trends(profiler.trends())
+            if len(profiler.history(2)) > 1:
+                print(f"\n{self.ui.theme.COLORS['INFO']}Trend over recent builds:{self.ui.theme.COLORS['ENDC']}")
+                for line in trend_lines:
+                    print(line)
+            print(f"{self.ui.theme.COLORS['INFO']}Press Enter to continue...{self.ui.theme.COLORS['ENDC']}")
+            input()
+            return True
+
+        except Exception as e:
+            print(f"\n{self.ui.theme.COLORS['ERROR']}Failed to profile build: {str(e)}{self.ui.theme.COLORS['ENDC']}")
+            print(f"{self.ui.theme.COLORS['INFO']}Press Enter to continue...{self.ui.theme.COLORS['ENDC']}")
+            input()
+            return False
+
     def get_project_status(self) -> Dict[str, any]:
         """Get current project status and information."""
         try:
@@ -0,0 +1,378 @@
+"""Per-page transfer-size budgets.
+
+Every HTML page of the site is parsed for the stylesheets, scripts, images,
+fonts and icons it loads (including fonts and images pulled in by its CSS),
+and their raw and compressed sizes are summed. Reports are stored per commit
+under .perf-history/page-weight so totals can be compared over time.
+"""
+
+import gzip
+import json
+import os
+import re
+import subprocess
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .asset_cache import CACHE_DIR_NAME, AssetCache
+from .asset_references import astro_base
+from .asset_scanner import AssetScanner
+
+# Brotli is optional; without it only gzip sizes are reported
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+HISTORY_DIR = os.path.join('.perf-history', 'page-weight')
+BUDGET_FILE = 'performance-budget.json'
+
+# Compressed-size budgets in KB, per resource type or 'total'
+DEFAULT_BUDGETS_KB = {'total': 500}
+
+# Text types are compressed by the server; everything else ships as-is
+COMPRESSIBLE_TYPES = {'html', 'css', 'js', 'svg'}
+
+_TYPE_BY_EXTENSION = {
+    '.html': 'html', '.htm': 'html',
+    '.css': 'css',
+    '.js': 'js', '.mjs': 'js',
+    '.svg': 'svg',
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image', '.webp': 'image',
+    '.avif': 'image', '.ico': 'image',
+    '.woff': 'font', '.woff2': 'font', '.ttf': 'font', '.otf': 'font', '.eot': 'font'
+}
+
+_CSS_REFERENCE = re.compile(r"""url\(\s*(["']?)([^"')]+?)\1\s*\)|@import\s+(["'])([^"']+)\3""", re.IGNORECASE)
+
+# Bump when size computation changes to invalidate cached sizes
+SIZES_VERSION = 1
+
+
+def resource_type(path: str) -> str:
+    """Resource type of a file from its extension."""
+    return _TYPE_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), 'other')
+
+
+class _PageResources(HTMLParser):
+    """Collects the URLs a page loads on first render."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls: List[str] = []
+        self.inline_css: List[str] = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            if {'stylesheet', 'icon', 'preload', 'modulepreload'} & set(rel) and attrs.get('href'):
+                self.urls.append(attrs['href'])
+        elif tag == 'script' and attrs.get('src'):
+            self.urls.append(attrs['src'])
+        elif tag == 'img':
+            # The browser fetches one candidate; src is the baseline it falls back to
+            if attrs.get('src'):
+                self.urls.append(attrs['src'])
+            elif attrs.get('srcset'):
+                self.urls.append(attrs['srcset'].split(',')[0].split()[0])
+        elif tag == 'video' and attrs.get('poster'):
+            self.urls.append(attrs['poster'])
+        elif tag == 'style':
+            self._in_style = True
+        if attrs.get('style'):
+            self.inline_css.append(attrs['style'])
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.inline_css.append(data)
+
+
+def css_references(content: str) -> List[str]:
+    """URLs referenced by url() and @import in a stylesheet."""
+    return [m.group(2) or m.group(4) for m in _CSS_REFERENCE.finditer(content)]
+
+
+def current_commit(project_path: str) -> Tuple[str, bool]:
+    """HEAD commit and whether the working tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_path,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=project_path,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'working-tree', True
+
+
+class PageWeightAnalyzer:
+    """Computes per-page transfer sizes and checks them against budgets."""
+
+    def __init__(self, project_path: str, cache: Optional[AssetCache] = None):
+        """Initialize the analyzer.
+
+        Args:
+            project_path: Root path of the project
+            cache: Asset cache used to key compressed sizes by content hash
+        """
+        self.project_path = os.path.abspath(project_path)
+        self.cache = cache or AssetCache(self.project_path)
+        self.history_dir = os.path.join(self.project_path, HISTORY_DIR)
+        self.sizes_path = os.path.join(self.project_path, CACHE_DIR_NAME, 'compressed-sizes.json')
+        self._sizes: Optional[Dict[str, Dict[str, int]]] = None
+        # Site-absolute URLs carry the configured base path, which is not part of dist/
+        self.base = astro_base(self.project_path)
+
+    def site_root(self) -> str:
+        """Built output (dist/) if present, otherwise the static pages in the project root."""
+        dist = os.path.join(self.project_path, 'dist')
+        return dist if os.path.isdir(dist) else self.project_path
+
+    def find_pages(self, site_root: str) -> List[str]:
+        """HTML pages under the site root, skipping ignored trees."""
+        # dist/ gets its own scan index so it does not churn the project one
+        index_path = None
+        if site_root != self.project_path:
+            index_path = os.path.join(self.project_path, CACHE_DIR_NAME, 'dist-scan-index.json')
+        scanner = AssetScanner(site_root, index_path=index_path)
+        return [path for path in scanner.scan() if path.endswith(('.html', '.htm'))]
+
+    def resolve(self, site_root: str, referrer: str, url: str) -> Optional[str]:
+        """Resolve a URL found in a page or stylesheet to a local file.
+
+        Site-absolute URLs are looked up in the site root and then public/.
+
+        Returns:
+            Optional[str]: File path, or None if the URL is external or missing
+        """
+        parts = urlsplit(url.strip())
+        if parts.scheme or parts.netloc or not parts.path:
+            return None
+        path = unquote(parts.path)
+        if self.base and (path + '/').startswith(f"/{self.base}/"):
+            path = path[len(self.base) + 1:] or '/'
+        if path.startswith('/'):
+            candidates = [os.path.join(site_root, path.lstrip('/')),
+                          os.path.join(self.project_path, 'public', path.lstrip('/'))]
+        else:
+            candidates = [os.path.join(os.path.dirname(referrer), path)]
+        for candidate in candidates:
+            candidate = os.path.normpath(candidate)
+            if os.path.isdir(candidate):
+                candidate = os.path.join(candidate, 'index.html')
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def _load_sizes(self) -> Dict[str, Dict[str, int]]:
+        """Lazily load cached compressed sizes keyed by content hash."""
+        if self._sizes is None:
+            self._sizes = {}
+            try:
+                with open(self.sizes_path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == SIZES_VERSION:
+                    self._sizes = data['sizes']
+            except (OSError, ValueError, KeyError):
+                pass
+        return self._sizes
+
+    def _save_sizes(self) -> None:
+        """Persist cached compressed sizes."""
+        if self._sizes is None:
+            return
+        os.makedirs(os.path.dirname(self.sizes_path), exist_ok=True)
+        tmp_path = f"{self.sizes_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': SIZES_VERSION, 'sizes': self._sizes}, f)
+        os.replace(tmp_path, self.sizes_path)
+
+    def file_sizes(self, path: str) -> Dict[str, int]:
+        """Raw, gzip and (if available) brotli sizes of a file, cached by content hash."""
+        sizes = self._load_sizes()
+        digest = self.cache.file_hash(path)
+        if digest not in sizes:
+            with open(path, 'rb') as f:
+                data = f.read()
+            entry = {'raw': len(data), 'gzip': len(data)}
+            if BROTLI_AVAILABLE:
+                entry['brotli'] = len(data)
+            if resource_type(path) in COMPRESSIBLE_TYPES:
+                entry['gzip'] = len(gzip.compress(data, compresslevel=9, mtime=0))
+                if BROTLI_AVAILABLE:
+                    entry['brotli'] = len(brotli.compress(data))
+            sizes[digest] = entry
+        return sizes[digest]
+
+    def _collect(self, site_root: str, page: str) -> Tuple[Set[str], List[str], List[str]]:
+        """Local files a page loads, plus missing and external URLs."""
+        with open(page, 'r', encoding='utf-8', errors='ignore') as f:
+            parser = _PageResources()
+            parser.feed(f.read())
+
+        files, missing, external = {page}, [], []
+        pending = [(page, url) for url in parser.urls]
+        pending += [(page, url) for css in parser.inline_css for url in css_references(css)]
+        while pending:
+            referrer, url = pending.pop()
+            if url.startswith(('data:', '#')):
+                continue
+            parts = urlsplit(url)
+            if parts.scheme or parts.netloc:
+                external.append(url)
+                continue
+            path = self.resolve(site_root, referrer, url)
+            if path is None:
+                missing.append(url)
+                continue
+            if path in files:
+                continue
+            files.add(path)
+            if resource_type(path) == 'css':
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    pending.extend((path, ref) for ref in css_references(f.read()))
+        return files, sorted(set(missing)), sorted(set(external))
+
+    def load_budgets(self) -> Dict[str, float]:
+        """Budgets from performance-budget.json, falling back to DEFAULT_BUDGETS_KB."""
+        path = os.path.join(self.project_path, BUDGET_FILE)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return dict(DEFAULT_BUDGETS_KB)
+
+    def analyze(self, budgets: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Measure every page and check it against the budgets.
+
+        Args:
+            budgets: Compressed-size budgets in KB by resource type or 'total'
+                (defaults to load_budgets())
+
+        Returns:
+            Dict[str, Any]: Report with commit, budgets and one entry per page
+            (raw and compressed totals, per-type breakdown, budget violations,
+            missing and external URLs), heaviest page first
+        """
+        budgets = budgets if budgets is not None else self.load_budgets()
+        site_root = self.site_root()
+        compression = 'brotli' if BROTLI_AVAILABLE else 'gzip'
+        commit, dirty = current_commit(self.project_path)
+
+        pages = []
+        for page in self.find_pages(site_root):
+            files, missing, external = self._collect(site_root, page)
+            by_type: Dict[str, Dict[str, int]] = {}
+            for path in files:
+                sizes = self.file_sizes(path)
+                totals = by_type.setdefault(resource_type(path), {'files': 0, 'raw': 0, 'gzip': 0, 'compressed': 0})
+                totals['files'] += 1
+                totals['raw'] += sizes['raw']
+                totals['gzip'] += sizes['gzip']
+                totals['compressed'] += sizes[compression]
+
+            compressed = sum(t['compressed'] for t in by_type.values())
+            violations = []
+            for key, limit_kb in budgets.items():
+                actual = compressed if key == 'total' else by_type.get(key, {}).get('compressed', 0)
+                if actual > limit_kb * 1024:
+                    violations.append({'budget': key, 'limit_kb': limit_kb, 'actual_kb': round(actual / 1024, 1)})
+
+            pages.append({
+                'page': os.path.relpath(page, site_root).replace(os.sep, '/'),
+                'requests': len(files) + len(external),
+                'raw_bytes': sum(t['raw'] for t in by_type.values()),
+                'gzip_bytes': sum(t['gzip'] for t in by_type.values()),
+                'compressed_bytes': compressed,
+                'by_type': dict(sorted(by_type.items())),
+                'over_budget': violations,
+                'missing': missing,
+                'external': external
+            })
+
+        self._save_sizes()
+        self.cache.save()
+        pages.sort(key=lambda p: -p['compressed_bytes'])
+        return {
+            'commit': commit,
+            'dirty': dirty,
+            'generated': time.time(),
+            'site_root': os.path.relpath(site_root, self.project_path),
+            'compression': compression,
+            'budgets': budgets,
+            'pages': pages
+        }
+
+    def save(self, report: Dict[str, Any]) -> str:
+        """Store a report under its commit, replacing any earlier report for it."""
+        os.makedirs(self.history_dir, exist_ok=True)
+        path = os.path.join(self.history_dir, f"{report['commit']}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def previous_report(self, commit: str) -> Optional[Dict[str, Any]]:
+        """Latest stored report for an ancestor of commit (not commit itself)."""
+        if not os.path.isdir(self.history_dir):
+            return None
+        stored = {name[:-5] for name in os.listdir(self.history_dir) if name.endswith('.json')}
+        try:
+            ancestors = subprocess.run(['git', 'rev-list', '--max-count=500', commit], cwd=self.project_path,
+                                       capture_output=True, text=True, check=True).stdout.split()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        for ancestor in ancestors[1:] if ancestors and ancestors[0] == commit else ancestors:
+            if ancestor in stored:
+                with open(os.path.join(self.history_dir, f"{ancestor}.json"), 'r') as f:
+                    return json.load(f)
+        return None
+
+    @staticmethod
+    def compare(report: Dict[str, Any], previous: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Per-page change in compressed bytes against an earlier report.
+
+        Returns:
+            List[Dict[str, Any]]: page, before, after and delta bytes for pages
+            whose weight changed, largest increase first; new pages have before=None
+        """
+        before = {page['page']: page['compressed_bytes'] for page in previous['pages']}
+        changes = []
+        for page in report['pages']:
+            old = before.get(page['page'])
+            if old != page['compressed_bytes']:
+                changes.append({
+                    'page': page['page'],
+                    'before': old,
+                    'after': page['compressed_bytes'],
+                    'delta': page['compressed_bytes'] - (old or 0)
+                })
+        changes.sort(key=lambda change: -change['delta'])
+        return changes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: measure pages, store the report, exit 1 if any page is over budget."""
+    argv = argv or []
+    analyzer = PageWeightAnalyzer(argv[0] if argv else os.getcwd())
+    report = analyzer.analyze()
+    analyzer.save(report)
+
+    over = [page for page in report['pages'] if page['over_budget']]
+    for page in report['pages']:
+        marker = 'OVER' if page['over_budget'] else 'ok'
+        print(f"{marker:4} {page['compressed_bytes'] / 1024:8.1f}KB {page['raw_bytes'] / 1024:8.1f}KB raw  {page['page']}")
+    previous = analyzer.previous_report(report['commit'])
+    if previous:
+        for change in analyzer.compare(report, previous)[:10]:
+            print(f"{change['delta'] / 1024:+8.1f}KB since {previous['commit'][:8]}  {change['page']}")
+    print(f"{len(report['pages'])} pages, {len(over)} over budget ({report['compression']} sizes)")
+    return 1 if over else 0
@@ -3,40 +3,140 @@
 import os
 import time
 import json
+import shlex
+import shutil
 import psutil
 from typing import List, Dict, Any, Optional
-from PIL import Image
-import glob
-from pathlib import Path
+from .asset_manager import AssetManager
+from .baselines import DEFAULT_RUNS as DEFAULT_BASELINE_RUNS, BaselineStore
+from .benchmark_history import BenchmarkHistory, format_report
+from .chunk_analyzer import LARGE_CHUNK_BYTES, ChunkAnalyzer
+from .html_auditor import HTMLAuditor
+from .island_advisor import advise, format_candidates
+from .load_tester import LoadTester
+from .page_weight import PageWeightAnalyzer
+from .process_tracker import ProcessTreeTracker
+from .resource_sampler import ResourceSampler
+from .sampling_profiler import SamplingProfiler, format_top
 
 class PerformanceManager:
     """Handles performance profiling and analysis."""
     def __init__(self, ui):
         self.ui = ui
-        self.baseline_metrics = {}
+        self._baseline_metrics: Optional[Dict[str, float]] = None
         self.monitoring_active = False
-        self.monitoring_interval = 5  # seconds
-        self._load_baseline_metrics()
+        self.monitoring_interval = 1  # seconds between samples
+        self.sampler = ResourceSampler(interval=self.monitoring_interval)
 
-    def _load_baseline_metrics(self):
-        """Load baseline performance metrics if they exist."""
+    @property
+    def baseline_metrics(self) -> Dict[str, float]:
+        """Median metrics of the current branch's promoted baseline, loaded on first use."""
+        if self._baseline_metrics is None:
+            try:
+                self._baseline_metrics = BaselineStore(os.getcwd()).baseline_metrics()
+            except Exception as e:
+                self.ui.status_bar.update(f"Error loading baseline metrics: {str(e)}", 3)
+                return {}
+        return self._baseline_metrics
+
+    def capture_baseline(self, ref: Optional[str] = None, runs: int = DEFAULT_BASELINE_RUNS) -> Dict[str, Any]:
+        """Build and benchmark a commit and store the samples under it.
+
+        Args:
+            ref: Commit to build in a temporary worktree (None for the working tree)
+            runs: Builds to measure
+        """
         try:
-            if os.path.exists('performance_baseline.json'):
-                with open('performance_baseline.json', 'r') as f:
-                    self.baseline_metrics = json.load(f)
+            result = BaselineStore(os.getcwd()).capture(ref, runs)
+            self.ui.status_bar.update(f"Captured {len(result['samples'])} metrics for {result['commit'][:10]}", 3)
+            return result
         except Exception as e:
-            self.ui.status_bar.update(f"Error loading baseline metrics: {str(e)}", 3)
+            self.ui.status_bar.update(f"Baseline capture error: {str(e)}", 3)
+            return {}
 
-    def run_cpu_profiling(self, duration: int) -> bool:
-        """Run CPU profiling for specified duration."""
+    def promote_baseline(self, ref: str = 'HEAD', branch: Optional[str] = None) -> bool:
+        """Make a captured commit the baseline of a branch (defaults to the current one)."""
         try:
-            # Use Node.js --prof flag for CPU profiling
-            command = f"node --prof app.js & sleep {duration} && kill $!"
-            return self.ui.run_command(command)
+            entry = BaselineStore(os.getcwd()).promote(ref, branch)
+            self._baseline_metrics = None
+            self.ui.status_bar.update(f"Baseline for {entry['branch']} is now {entry['commit'][:10]}", 3)
+            return True
+        except Exception as e:
+            self.ui.status_bar.update(f"Baseline promotion error: {str(e)}", 3)
+            return False
+
+    def migrate_legacy_baseline(self) -> bool:
+        """Import performance_baseline.json as the fallback baseline."""
+        try:
+            imported = BaselineStore(os.getcwd()).migrate_legacy()
+            self._baseline_metrics = None
+            self.ui.status_bar.update("Imported performance_baseline.json" if imported else "Nothing to migrate", 3)
+            return imported
         except Exception as e:
-            self.ui.status_bar.update(f"CPU profiling error: {str(e)}", 3)
+            self.ui.status_bar.update(f"Baseline migration error: {str(e)}", 3)
             return False
 
+    def compare_baselines(self, base_ref: Optional[str] = None, head_ref: str = 'HEAD',
+                          build: bool = False, runs: int = DEFAULT_BASELINE_RUNS) -> Dict[str, Any]:
+        """Compare two commits' benchmarks.
+
+        Args:
+            base_ref: Base commit (defaults to the current branch's baseline;
+                required when building)
+            head_ref: Commit compared against the base
+            build: Build both refs now in side-by-side worktrees instead of
+                comparing stored samples
+            runs: Alternating build rounds when building
+        """
+        try:
+            store = BaselineStore(os.getcwd())
+            if build:
+                comparison = store.compare_worktrees(base_ref or store.require_baseline(), head_ref, runs)
+            else:
+                comparison = store.compare(base_ref, head_ref)
+            self.ui.status_bar.update(
+                f"{comparison['regressions']} regression(s) in {len(comparison['metrics'])} metrics", 3)
+            return comparison
+        except Exception as e:
+            self.ui.status_bar.update(f"Baseline comparison error: {str(e)}", 3)
+            return {}
+
+    def profile_command(self, command: str, clock: str = 'cpu') -> Dict[str, Any]:
+        """Run a headless CLI command in-process under the sampling profiler.
+
+        Args:
+            command: Headless command line, e.g. "page-budget" or "html-audit --json"
+            clock: 'cpu' for CPU hot paths, 'wall' to include time spent waiting
+
+        Returns:
+            Dict[str, Any]: exit_code, samples, hottest functions and the
+            speedscope/collapsed output paths
+        """
+        try:
+            # Imported here: the headless registry imports the project modules
+            from ..headless import HEADLESS_COMMANDS
+            argv = shlex.split(command)
+            func = HEADLESS_COMMANDS.get(argv[0]) if argv else None
+            if func is None:
+                self.ui.status_bar.update(f"Unknown command; choose from {', '.join(sorted(HEADLESS_COMMANDS))}", 3)
+                return {}
+
+            with SamplingProfiler(clock=clock) as profiler:
+                exit_code = func(argv[1:])
+            paths = profiler.save(os.getcwd(), argv[0])
+            for line in format_top(profiler):
+                print(line)
+            self.ui.status_bar.update(f"Profile written to {paths['speedscope']}", 3)
+            return {'exit_code': exit_code, 'samples': profiler.samples,
+                    'top': profiler.top_functions(), 'paths': paths}
+        except Exception as e:
+            self.ui.status_bar.update(f"Profiling error: {str(e)}", 3)
+            return {}
+
+    def run_cpu_profiling(self, command: str) -> bool:
+        """Profile the CPU time of a headless CLI command."""
+        return bool(self.profile_command(command, clock='cpu'))
+
     def run_memory_analysis(self) -> bool:
         """Run memory usage analysis."""
         try:
@@ -50,6 +150,9 @@ class PerformanceManager:
     def run_network_analysis(self, duration: int) -> bool:
         """Profile network requests."""
         try:
+            if not shutil.which('lighthouse'):
+                # Without Lighthouse/Chrome, fall back to the static audit of the built pages
+                return bool(self.audit_html_performance())
             # Use Chrome DevTools Protocol for network profiling
             command = f"lighthouse --only-categories=performance --output=json --output-path=./network-profile.json"
             return self.ui.run_command(command)
@@ -57,38 +160,74 @@ class PerformanceManager:
             self.ui.status_bar.update(f"Network analysis error: {str(e)}", 3)
             return False
 
-    def generate_flame_graph(self, duration: int) -> bool:
-        """Generate CPU flame graph."""
-        try:
-            # Use 0x for generating flame graphs
-            command = f"0x app.js -d {duration}"
-            return self.ui.run_command(command)
-        except Exception as e:
-            self.ui.status_bar.update(f"Flame graph generation error: {str(e)}", 3)
-            return False
+    def generate_flame_graph(self, command: str) -> bool:
+        """Write a wall-clock flame graph (speedscope and collapsed stacks) of a headless CLI command."""
+        profile = self.profile_command(command, clock='wall')
+        if profile:
+            print(f"Open {profile['paths']['speedscope']} at https://www.speedscope.app or feed "
+                  f"{profile['paths']['collapsed']} to flamegraph.pl")
+        return bool(profile)
 
     def track_web_vitals(self) -> bool:
         """Track Core Web Vitals metrics."""
         try:
+            if not shutil.which('lighthouse'):
+                return bool(self.audit_html_performance())
             command = "lighthouse --only-categories=performance --output=json --output-path=./web-vitals.json"
             return self.ui.run_command(command)
         except Exception as e:
             self.ui.status_bar.update(f"Web Vitals tracking error: {str(e)}", 3)
             return False
 
+    def audit_html_performance(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Audit the built pages for render-blocking resources, image, script and hint issues.
+
+        The report is stored per commit under .perf-history/html-audit.
+        """
+        try:
+            auditor = HTMLAuditor(os.getcwd())
+            report = auditor.audit(max_workers)
+            auditor.save(report)
+            severity = report['summary']['by_severity']
+            self.ui.status_bar.update(
+                f"HTML audit: {report['summary']['pages']} pages, {severity['error']} errors, "
+                f"{severity['warning']} warnings", 3)
+            return report
+        except Exception as e:
+            self.ui.status_bar.update(f"HTML audit error: {str(e)}", 3)
+            return {}
+
+    def run_load_test(self, target: Optional[str] = None, concurrency: Optional[int] = None,
+                      duration: Optional[float] = None, rate: Optional[float] = None) -> Dict[str, Any]:
+        """Load test the built site, store the result and compare it with the previous comparable run.
+
+        Args:
+            target: None to serve dist/ locally, 'preview' for `astro preview`,
+                or the base URL of a running server
+            concurrency: Connections (defaults to load-test.json)
+            duration: Seconds of measured load (defaults to load-test.json)
+            rate: Target requests per second (defaults to unthrottled)
+        """
+        try:
+            tester = LoadTester(os.getcwd())
+            result = tester.run(target, concurrency=concurrency, duration=duration, rate=rate)
+            if result['requests']:
+                tester.save(result)
+            previous = tester.previous_result(result)
+            result['previous'] = previous
+            self.ui.status_bar.update(
+                f"Load test: {result['throughput_rps']:.0f} req/s, p95 {result['latency_ms']['p95']:.1f}ms", 3)
+            return result
+        except Exception as e:
+            self.ui.status_bar.update(f"Load test error: {str(e)}", 3)
+            return {}
+
     def start_real_time_monitoring(self) -> bool:
-        """Start real-time performance monitoring."""
+        """Start sampling system resources in the background and return immediately."""
         try:
+            self.sampler.start()
             self.monitoring_active = True
-            while self.monitoring_active:
-                metrics = {
-                    'cpu_percent': psutil.cpu_percent(interval=1),
-                    'memory_percent': psutil.virtual_memory().percent,
-                    'disk_usage': psutil.disk_usage('/').percent,
-                    'network_io': psutil.net_io_counters()._asdict()
-                }
-                self.ui.status_bar.update(f"CPU: {metrics['cpu_percent']}% | RAM: {metrics['memory_percent']}%", 1)
-                time.sleep(self.monitoring_interval)
+            self.ui.status_bar.update(f"Monitoring started (sampling every {self.sampler.interval:g}s)", 1)
             return True
         except Exception as e:
             self.ui.status_bar.update(f"Real-time monitoring error: {str(e)}", 3)
@@ -96,92 +235,168 @@ class PerformanceManager:
 
     def stop_real_time_monitoring(self):
         """Stop real-time performance monitoring."""
+        self.sampler.stop()
         self.monitoring_active = False
 
-    def track_resource_usage(self, process_name: str) -> Dict[str, Any]:
-        """Track resource usage for a specific process."""
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                if process_name in proc.info['name']:
-                    return {
-                        'pid': proc.info['pid'],
-                        'cpu_percent': proc.info['cpu_percent'],
-                        'memory_percent': proc.info['memory_percent'],
-                        'threads': proc.num_threads(),
-                        'open_files': len(proc.open_files()),
-                        'connections': len(proc.connections())
-                    }
-            return {}
+    def get_monitoring_summary(self, window: Optional[int] = None) -> Dict[str, Any]:
+        """Rolling min/avg/p95 per metric plus sparklines of the recent samples."""
+        return {
+            'samples': len(self.sampler.buffer),
+            'stats': self.sampler.summary(window),
+            'sparklines': self.sampler.sparklines()
+        }
+
+    def export_monitoring_csv(self, path: str) -> int:
+        """Export the buffered monitoring samples to CSV, returning the row count."""
+        try:
+            rows = self.sampler.export_csv(path)
+            self.ui.status_bar.update(f"Exported {rows} samples to {path}", 3)
+            return rows
+        except Exception as e:
+            self.ui.status_bar.update(f"Monitoring export error: {str(e)}", 3)
+            return 0
+
+    def track_resource_usage(self, process_name: str, duration: float = 1.0) -> Dict[str, Any]:
+        """Track resource usage of the process trees whose root is named process_name.
+
+        Matches the executable name exactly (e.g. 'node'), keeps only the
+        topmost match of each tree, and samples for `duration` seconds so CPU
+        usage is measured over a real interval.
+        """
+        try:
+            matches = [proc for proc in psutil.process_iter(['pid', 'name', 'ppid'])
+                       if proc.info['name'] == process_name]
+            matched_pids = {proc.pid for proc in matches}
+            roots = [proc for proc in matches if proc.info['ppid'] not in matched_pids]
+            if not roots:
+                return {}
+
+            trackers = [ProcessTreeTracker(proc.pid, label=f"{process_name} ({proc.pid})").start() for proc in roots]
+            time.sleep(duration)
+            return {'process': process_name, 'trees': [tracker.stop() for tracker in trackers]}
         except Exception as e:
             self.ui.status_bar.update(f"Resource tracking error: {str(e)}", 3)
             return {}
 
     def detect_performance_regression(self, current_metrics: Dict[str, Any]) -> List[str]:
-        """Detect performance regressions by comparing with baseline."""
-        regressions = []
-        threshold = 1.1  # 10% degradation threshold
-
-        for metric, value in current_metrics.items():
-            if metric in self.baseline_metrics:
-                if value > self.baseline_metrics[metric] * threshold:
-                    regressions.append(f"{metric} degraded by {((value/self.baseline_metrics[metric])-1)*100:.1f}%")
-
-        return regressions
-
-    def optimize_images(self, directory: str, quality: int = 85) -> bool:
-        """Optimize images in the specified directory."""
-        try:
-            image_files = glob.glob(os.path.join(directory, "**/*.{jpg,jpeg,png}"), recursive=True)
-            for img_path in image_files:
-                with Image.open(img_path) as img:
-                    # Convert RGBA to RGB if necessary
-                    if img.mode == 'RGBA':
-                        img = img.convert('RGB')
-                    # Optimize and save
-                    img.save(img_path, optimize=True, quality=quality)
-            return True
+        """Record metric samples for this commit and report regressions still present.
+
+        Args:
+            current_metrics: Metric name to one value or a list of samples
+
+        Returns:
+            List[str]: One line per regression, naming the commit where it first appeared
+        """
+        try:
+            history = BenchmarkHistory(os.getcwd())
+            history.record({metric: value if isinstance(value, list) else [value]
+                            for metric, value in current_metrics.items()})
+            regressions = [r for r in history.detect_regressions() if r['present_at_head']]
+            return format_report(regressions)
+        except Exception as e:
+            self.ui.status_bar.update(f"Regression detection error: {str(e)}", 3)
+            return []
+
+    def regression_history(self) -> List[str]:
+        """Report every regression in the stored history, including recovered ones."""
+        return format_report(BenchmarkHistory(os.getcwd()).detect_regressions())
+
+    def optimize_images(self, directory: str, quality: int = 85) -> Dict[str, Any]:
+        """Optimize images in the specified directory using all CPU cores."""
+        try:
+            # Cache and scan index live at the project root (cwd), like .perf-history
+            asset_manager = AssetManager(os.getcwd())
+            image_files = [path for path in asset_manager.scan_project_assets(directory)['images']
+                           if path.lower().endswith(('.jpg', '.jpeg', '.png'))]
+
+            def report(done: int, total: int, result: Dict[str, Any]) -> None:
+                self.ui.status_bar.set_progress(f"Optimizing images: {done}/{total} ({os.path.basename(result['path'])})")
+
+            try:
+                summary = asset_manager.optimize_images_batch(image_files, quality, progress=report)
+            finally:
+                self.ui.status_bar.end_progress()
+            self.ui.status_bar.update(
+                f"Images: {summary['optimized']} optimized, {summary['skipped'] + summary['cached']} skipped, "
+                f"{len(summary['failed'])} failed, {summary['bytes_saved'] / 1024:.1f}KB saved", 3
+            )
+            return summary
         except Exception as e:
             self.ui.status_bar.update(f"Image optimization error: {str(e)}", 3)
-            return False
+            return {}
 
-    def analyze_code_splitting(self, build_stats_path: str) -> Dict[str, Any]:
-        """Analyze webpack/rollup build stats for code splitting opportunities."""
+    def check_page_budgets(self, budgets: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Measure per-page transfer sizes, store them for this commit and compare with the last run."""
         try:
-            with open(build_stats_path, 'r') as f:
-                stats = json.load(f)
+            analyzer = PageWeightAnalyzer(os.getcwd())
+            report = analyzer.analyze(budgets)
+            analyzer.save(report)
+            previous = analyzer.previous_report(report['commit'])
+            report['changes'] = analyzer.compare(report, previous) if previous else []
+            report['previous_commit'] = previous['commit'] if previous else None
+
+            over = sum(1 for page in report['pages'] if page['over_budget'])
+            self.ui.status_bar.update(f"Page weight: {len(report['pages'])} pages, {over} over budget", 3)
+            return report
+        except Exception as e:
+            self.ui.status_bar.update(f"Page budget error: {str(e)}", 3)
+            return {}
 
-            analysis = {
-                'large_chunks': [],
-                'duplicate_modules': [],
-                'splitting_opportunities': []
-            }
+    def analyze_code_splitting(self, build_stats_path: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze code splitting of the build.
 
-            # Analyze chunk sizes
-            if 'chunks' in stats:
-                for chunk in stats['chunks']:
-                    if chunk['size'] > 244000:  # > 244KB
-                        analysis['large_chunks'].append({
-                            'name': chunk['names'][0],
-                            'size': chunk['size']
-                        })
+        Args:
+            build_stats_path: A webpack stats.json file, or a project root whose
+                Vite/Astro build output is analyzed (defaults to the current directory)
+        """
+        try:
+            if build_stats_path and os.path.isfile(build_stats_path):
+                return self._analyze_webpack_stats(build_stats_path)
 
-            return analysis
+            report = ChunkAnalyzer(build_stats_path or os.getcwd()).analyze()
+            self.ui.status_bar.update(
+                f"Code splitting: {len(report['routes'])} routes, {len(report['chunks'])} chunks, "
+                f"{len(report['duplicate_modules'])} duplicated modules", 3)
+            return report
         except Exception as e:
             self.ui.status_bar.update(f"Code splitting analysis error: {str(e)}", 3)
             return {}
 
-    def suggest_lazy_loading(self, source_dir: str) -> List[str]:
-        """Analyze code and suggest components for lazy loading."""
-        suggestions = []
-        try:
-            react_files = glob.glob(os.path.join(source_dir, "**/*.{tsx,jsx}"), recursive=True)
-            for file_path in react_files:
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                    # Look for large component definitions
-                    if len(content.split('\n')) > 200:  # Suggest lazy loading for large components
-                        suggestions.append(f"Consider lazy loading {Path(file_path).stem} component")
-            return suggestions
+    def _analyze_webpack_stats(self, build_stats_path: str) -> Dict[str, Any]:
+        """Flag large chunks listed in a webpack stats.json file."""
+        with open(build_stats_path, 'r') as f:
+            stats = json.load(f)
+
+        analysis = {
+            'large_chunks': [],
+            'duplicate_modules': [],
+            'splitting_opportunities': []
+        }
+
+        # Analyze chunk sizes
+        if 'chunks' in stats:
+            for chunk in stats['chunks']:
+                if chunk['size'] > LARGE_CHUNK_BYTES:
+                    analysis['large_chunks'].append({
+                        'name': chunk['names'][0],
+                        'size': chunk['size']
+                    })
+
+        return analysis
+
+    def suggest_lazy_loading(self, source_dir: Optional[str] = None) -> List[str]:
+        """Rank hydrated islands and their dependencies as lazy-loading candidates.
+
+        Args:
+            source_dir: Project root containing src/pages (defaults to the current directory)
+        """
+        try:
+            report = advise(source_dir or os.getcwd())
+            islands = sum(len(page['islands']) for page in report['pages'])
+            self.ui.status_bar.update(
+                f"Lazy loading: {islands} islands on {report['stats']['pages']} pages, "
+                f"{report['stats']['parsed']} files parsed, {report['stats']['reused']} cached", 3)
+            return format_candidates(report)
         except Exception as e:
             self.ui.status_bar.update(f"Lazy loading analysis error: {str(e)}", 3)
             return []
@@ -0,0 +1,177 @@
+"""Resource accounting for spawned commands and their process trees.
+
+A tracker thread samples the whole tree under a PID (npm spawns node, which
+spawns workers...) and keeps per-process high-water marks, so the totals
+still include children that exited between samples.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+COMMAND_LOG = os.path.join('.perf-history', 'commands.jsonl')
+
+
+def _children_cpu_seconds() -> float:
+    """CPU seconds of all waited-for descendants of this process."""
+    if not RESOURCE_AVAILABLE:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class ProcessTreeTracker:
+    """Samples peak RSS, CPU seconds, I/O bytes and threads for a process tree.
+
+    Use as a context manager around the lifetime of a spawned process:
+
+        process = subprocess.Popen([...])
+        with ProcessTreeTracker(process.pid, label='npm run build') as tracker:
+            process.wait()
+        print(tracker.stats)
+    """
+
+    def __init__(self, pid: int, label: str = '', interval: float = 0.2):
+        """Initialize the tracker.
+
+        Args:
+            pid: Root process of the tree
+            label: Name of the command, kept in the stats
+            interval: Seconds between samples
+        """
+        self.pid = pid
+        self.label = label
+        self.interval = interval
+        self.stats: Dict[str, Any] = {}
+        self._cpu: Dict[int, float] = {}
+        self._cpu_first: Dict[int, float] = {}
+        self._io: Dict[int, Dict[str, int]] = {}
+        self._peak_rss = 0
+        self._peak_threads = 0
+        self._peak_processes = 0
+        self._processes: Dict[int, psutil.Process] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._rusage_start = 0.0
+        self._own_child = False
+
+    def _tree(self):
+        """Current processes in the tree, reusing Process objects so CPU times stay attributed."""
+        try:
+            root = self._processes.get(self.pid) or psutil.Process(self.pid)
+            members = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+        for proc in members:
+            self._processes.setdefault(proc.pid, proc)
+        return [self._processes[proc.pid] for proc in members]
+
+    def sample(self) -> None:
+        """Take one sample of the tree."""
+        rss = threads = count = 0
+        for proc in self._tree():
+            try:
+                with proc.oneshot():
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+                    cpu = proc.cpu_times()
+                    self._cpu[proc.pid] = cpu.user + cpu.system
+                    self._cpu_first.setdefault(proc.pid, cpu.user + cpu.system)
+                    if hasattr(proc, 'io_counters'):
+                        io = proc.io_counters()
+                        self._io[proc.pid] = {'read': io.read_bytes, 'write': io.write_bytes}
+                count += 1
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except psutil.AccessDenied:
+                count += 1
+        self._peak_rss = max(self._peak_rss, rss)
+        self._peak_threads = max(self._peak_threads, threads)
+        self._peak_processes = max(self._peak_processes, count)
+
+    def _run(self) -> None:
+        """Sampling loop; samples once more right after being stopped."""
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                return
+
+    def start(self) -> 'ProcessTreeTracker':
+        """Start sampling in the background."""
+        self._started = time.time()
+        self._rusage_start = _children_cpu_seconds()
+        try:
+            self._own_child = psutil.Process(self.pid).ppid() == os.getpid()
+        except psutil.Error:
+            self._own_child = False
+        self._thread = threading.Thread(target=self._run, name=f'process-tracker-{self.pid}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop sampling and compute the totals.
+
+        CPU seconds are lifetime totals: the larger of the sampled per-process
+        totals and, for trees this CLI spawned, the rusage of reaped children,
+        which also covers processes too short-lived to be sampled (but includes
+        anything else this CLI reaped meanwhile). cpu_percent only counts time
+        used while tracked.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        wall_seconds = time.time() - self._started
+        sampled_cpu = sum(self._cpu.values())
+        reaped_cpu = _children_cpu_seconds() - self._rusage_start if self._own_child else 0.0
+        # CPU used while tracked, for trees that were already running when tracking began
+        window_cpu = sum(self._cpu[pid] - self._cpu_first[pid] for pid in self._cpu)
+        self.stats = {
+            'command': self.label,
+            'pid': self.pid,
+            'started': self._started,
+            'wall_seconds': round(wall_seconds, 3),
+            'cpu_seconds': round(max(sampled_cpu, reaped_cpu), 3),
+            'cpu_percent': round(100 * window_cpu / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            'peak_rss_bytes': self._peak_rss,
+            'read_bytes': sum(io['read'] for io in self._io.values()),
+            'write_bytes': sum(io['write'] for io in self._io.values()),
+            'peak_threads': self._peak_threads,
+            'peak_processes': self._peak_processes
+        }
+        return self.stats
+
+    def __enter__(self) -> 'ProcessTreeTracker':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """One-line human summary of tracker stats."""
+    return (f"{stats['command']}: {stats['wall_seconds']:.1f}s wall, {stats['cpu_seconds']:.1f}s CPU, "
+            f"peak RSS {stats['peak_rss_bytes'] / 1024 / 1024:.0f}MB, "
+            f"I/O {stats['read_bytes'] / 1024 / 1024:.1f}MB read / {stats['write_bytes'] / 1024 / 1024:.1f}MB written, "
+            f"peak {stats['peak_threads']} threads in {stats['peak_processes']} processes")
+
+
+def record_command_stats(project_root: str, stats: Dict[str, Any]) -> None:
+    """Append tracker stats to the project's command log (.perf-history/commands.jsonl)."""
+    try:
+        path = os.path.join(project_root, COMMAND_LOG)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps(stats) + '\n')
+    except OSError:
+        pass
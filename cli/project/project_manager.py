@@ -49,6 +49,10 @@ class ProjectManager:
         """Clean build artifacts and node_modules."""
         return self.npm_manager.clean_build()
 
+    def profile_build(self) -> bool:
+        """Run the production build with phase and route timings."""
+        return self.npm_manager.profile_build()
+
     def get_project_status(self) -> Dict[str, Any]:
         """Get current project status and information."""
         return self.npm_manager.get_project_status()
@@ -137,10 +141,42 @@ class ProjectManager:
         """Validate compound data structure."""
         return self.compound_manager.validate_compound_data(compound)
 
+    def validate_all_compounds(self) -> Dict[str, Dict[str, List[str]]]:
+        """Validate all compounds in one pass."""
+        return self.compound_manager.validate_all_compounds()
+
     def generate_compound_page(self, compound_name: str) -> bool:
         """Generate or update compound page."""
         return self.compound_manager.generate_compound_page(compound_name)
 
+    def generate_all_pages(self, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """Generate all compound pages incrementally."""
+        return self.compound_manager.generate_all_pages(max_workers)
+
+    def build_interaction_graph(self) -> Dict[str, Any]:
+        """Build the compound interaction graph."""
+        return self.compound_manager.build_interaction_graph()
+
+    def find_interacting_compounds(self, names: List[str]) -> List[str]:
+        """Find compounds interacting with any of the given compounds."""
+        return self.compound_manager.find_interacting_compounds(names)
+
+    def compute_related_compounds(self, top_k: int = 3, force: bool = False) -> Optional[str]:
+        """Precompute related compounds for the site."""
+        return self.compound_manager.compute_related_compounds(top_k, force)
+
+    def get_compound_layout(self) -> str:
+        """Get the active compound data layout."""
+        return self.compound_manager.detect_layout()
+
+    def migrate_compound_layout(self, target_layout: str) -> bool:
+        """Migrate compound data between monolithic and sharded layouts."""
+        return self.compound_manager.migrate_layout(target_layout)
+
+    def export_interaction_map(self) -> Optional[str]:
+        """Export the interaction adjacency map for the site."""
+        return self.compound_manager.export_interaction_map()
+
     def get_compound_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get compound data by name."""
         return self.compound_manager.get_compound_by_name(name)
@@ -150,9 +186,9 @@ class ProjectManager:
         return self.compound_manager.get_compound_by_slug(slug)
 
     # Performance Management
-    def run_cpu_profiling(self, duration: int) -> bool:
-        """Run CPU profiling."""
-        return self.performance_manager.run_cpu_profiling(duration)
+    def run_cpu_profiling(self, command: str) -> bool:
+        """Profile the CPU time of a headless CLI command."""
+        return self.performance_manager.run_cpu_profiling(command)
 
     def run_memory_analysis(self) -> bool:
         """Run memory usage analysis."""
@@ -162,14 +198,36 @@ class ProjectManager:
         """Run network request profiling."""
         return self.performance_manager.run_network_analysis(duration)
 
-    def generate_flame_graph(self, duration: int) -> bool:
-        """Generate CPU flame graph."""
-        return self.performance_manager.generate_flame_graph(duration)
+    def generate_flame_graph(self, command: str) -> bool:
+        """Generate a flame graph of a headless CLI command."""
+        return self.performance_manager.generate_flame_graph(command)
 
     def track_web_vitals(self) -> bool:
         """Track Core Web Vitals metrics."""
         return self.performance_manager.track_web_vitals()
 
+    def capture_baseline(self, ref: Optional[str] = None, runs: int = 3) -> Dict[str, Any]:
+        """Build and benchmark a commit for its baseline samples."""
+        return self.performance_manager.capture_baseline(ref, runs)
+
+    def promote_baseline(self, ref: str = 'HEAD', branch: Optional[str] = None) -> bool:
+        """Make a captured commit the baseline of a branch."""
+        return self.performance_manager.promote_baseline(ref, branch)
+
+    def migrate_legacy_baseline(self) -> bool:
+        """Import performance_baseline.json as the fallback baseline."""
+        return self.performance_manager.migrate_legacy_baseline()
+
+    def compare_baselines(self, base_ref: Optional[str] = None, head_ref: str = 'HEAD',
+                          build: bool = False, runs: int = 3) -> Dict[str, Any]:
+        """Compare two commits' benchmarks."""
+        return self.performance_manager.compare_baselines(base_ref, head_ref, build, runs)
+
+    def run_load_test(self, target: Optional[str] = None, concurrency: Optional[int] = None,
+                      duration: Optional[float] = None, rate: Optional[float] = None) -> Dict[str, Any]:
+        """Load test the built site."""
+        return self.performance_manager.run_load_test(target, concurrency, duration, rate)
+
     # Bundle Management
     def analyze_bundle_size(self) -> bool:
         """Analyze bundle size and composition."""
@@ -0,0 +1,184 @@
+"""Background system resource sampler with a fixed-size time series.
+
+Samples are kept column-wise in preallocated ``array('d')`` ring buffers,
+so a long monitoring session uses constant memory and no per-sample dicts.
+"""
+
+import csv
+import math
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+import psutil
+
+SAMPLE_FIELDS = (
+    'timestamp',
+    'cpu_percent',
+    'memory_percent',
+    'disk_percent',
+    'disk_read_bps',
+    'disk_write_bps',
+    'net_sent_bps',
+    'net_recv_bps',
+)
+
+_SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+
+
+class RingBuffer:
+    """Fixed-capacity, column-oriented ring buffer of float samples."""
+
+    def __init__(self, fields: Sequence[str], capacity: int):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._columns = {field: array('d', bytes(8 * capacity)) for field in self.fields}
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, values: Sequence[float]) -> None:
+        """Append one sample (values in field order), overwriting the oldest when full."""
+        for field, value in zip(self.fields, values):
+            self._columns[field][self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def column(self, field: str) -> List[float]:
+        """Values of one field, oldest first."""
+        data = self._columns[field]
+        if self._size < self.capacity:
+            return data[:self._size].tolist()
+        return data[self._next:].tolist() + data[:self._next].tolist()
+
+    def rows(self) -> List[List[float]]:
+        """All samples, oldest first."""
+        return [list(row) for row in zip(*(self.column(field) for field in self.fields))]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def sparkline(values: List[float], width: int = 40, ceiling: Optional[float] = None) -> str:
+    """Render values as a one-line block sparkline, averaging into width buckets."""
+    if not values:
+        return ''
+    if len(values) > width:
+        bounds = [round(i * len(values) / width) for i in range(width + 1)]
+        values = [sum(values[start:end]) / (end - start) for start, end in zip(bounds, bounds[1:])]
+    top = ceiling if ceiling is not None else max(values)
+    if top <= 0:
+        return _SPARK_BLOCKS[0] * len(values)
+    last = len(_SPARK_BLOCKS) - 1
+    return ''.join(_SPARK_BLOCKS[min(last, int(value / top * last + 0.5))] for value in values)
+
+
+class ResourceSampler:
+    """Samples CPU, memory, disk and network usage on a daemon thread."""
+
+    def __init__(self, interval: float = 1.0, capacity: int = 3600, disk_path: str = '/'):
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            capacity: Samples kept before the oldest are overwritten
+            disk_path: Mount point whose usage is reported
+        """
+        self.interval = interval
+        self.disk_path = disk_path
+        self.buffer = RingBuffer(SAMPLE_FIELDS, capacity)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in the background (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop sampling; the thread wakes immediately instead of finishing its sleep."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.interval + 1)
+
+    def _run(self) -> None:
+        """Sampling loop; counters are turned into per-second rates between samples."""
+        # The first cpu_percent(None) call only primes the counter
+        psutil.cpu_percent(interval=None)
+        last_time = time.time()
+        last_disk = psutil.disk_io_counters()
+        last_net = psutil.net_io_counters()
+
+        while not self._stop_event.wait(self.interval):
+            now = time.time()
+            elapsed = max(now - last_time, 1e-6)
+            disk = psutil.disk_io_counters()
+            net = psutil.net_io_counters()
+            sample = (
+                now,
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory().percent,
+                psutil.disk_usage(self.disk_path).percent,
+                (disk.read_bytes - last_disk.read_bytes) / elapsed if disk and last_disk else 0.0,
+                (disk.write_bytes - last_disk.write_bytes) / elapsed if disk and last_disk else 0.0,
+                (net.bytes_sent - last_net.bytes_sent) / elapsed,
+                (net.bytes_recv - last_net.bytes_recv) / elapsed,
+            )
+            with self._lock:
+                self.buffer.append(sample)
+            last_time, last_disk, last_net = now, disk, net
+
+    def series(self, field: str, window: Optional[int] = None) -> List[float]:
+        """Values of one field, oldest first, optionally only the last `window` samples."""
+        with self._lock:
+            values = self.buffer.column(field)
+        return values[-window:] if window else values
+
+    def summary(self, window: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Rolling min/avg/p95/last per metric over the last `window` samples (default: all)."""
+        stats = {}
+        for field in SAMPLE_FIELDS[1:]:
+            values = self.series(field, window)
+            if not values:
+                continue
+            stats[field] = {
+                'min': min(values),
+                'avg': sum(values) / len(values),
+                'p95': percentile(values, 95),
+                'last': values[-1]
+            }
+        return stats
+
+    def sparklines(self, width: int = 40) -> Dict[str, str]:
+        """Sparkline per metric over the most recent samples; percentages share a 0-100 scale."""
+        return {field: sparkline(self.series(field, width), width,
+                                 100.0 if field.endswith('_percent') else None)
+                for field in SAMPLE_FIELDS[1:]}
+
+    def export_csv(self, path: str) -> int:
+        """Write all buffered samples to CSV and return the number of rows."""
+        with self._lock:
+            rows = self.buffer.rows()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(SAMPLE_FIELDS)
+            writer.writerows(rows)
+        return len(rows)
@@ -0,0 +1,206 @@
+"""Low-overhead sampling profiler for the CLI's own Python code.
+
+A profiling timer signal (SIGPROF on CPU time, or SIGALRM on wall time)
+interrupts the main thread every few milliseconds and the handler counts
+the interrupted call stack; nothing runs between samples, so the profiled
+code runs at nearly full speed. Where signals are unavailable (Windows, or
+when not started from the main thread) a background thread samples
+``sys._current_frames()`` instead. Results are written as speedscope JSON
+and as collapsed stacks for flamegraph.pl and similar tools.
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PROFILE_DIR = os.path.join('.perf-history', 'profiles')
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+# Timer and signal per clock: CPU time skips time spent waiting (prompts, subprocesses)
+_TIMERS = {
+    'cpu': ('ITIMER_PROF', 'SIGPROF'),
+    'wall': ('ITIMER_REAL', 'SIGALRM'),
+}
+
+
+class SamplingProfiler:
+    """Counts sampled call stacks; use as a context manager around the code to profile."""
+
+    def __init__(self, interval: float = 0.005, clock: str = 'cpu', all_threads: bool = False):
+        """Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+            clock: 'cpu' samples process CPU time, 'wall' samples elapsed time
+            all_threads: Also sample threads other than the main one (always
+                the case in thread mode)
+        """
+        if clock not in _TIMERS:
+            raise ValueError(f"Unknown clock {clock!r}; use one of {', '.join(_TIMERS)}")
+        self.interval = interval
+        self.clock = clock
+        self.all_threads = all_threads
+        self.mode: Optional[str] = None
+        self.samples = 0
+        self.elapsed = 0.0
+        self._counts: Dict[Tuple[int, Tuple[Any, ...]], int] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._started = 0.0
+        self._previous_handler = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _record(self, thread_id: int, frame) -> None:
+        """Count one stack, leaf first, keyed by code object."""
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        key = (thread_id, tuple(stack))
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.samples += 1
+
+    def _handle_signal(self, signum, frame) -> None:
+        """Signal handler: runs in the main thread between bytecodes."""
+        main_id = threading.main_thread().ident
+        self._record(main_id, frame)
+        if self.all_threads:
+            for thread_id, thread_frame in sys._current_frames().items():
+                if thread_id != main_id:
+                    self._record(thread_id, thread_frame)
+
+    def _run_thread(self) -> None:
+        """Thread-mode sampling loop over every other thread."""
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._record(thread_id, frame)
+
+    def start(self) -> 'SamplingProfiler':
+        """Start sampling."""
+        timer_name, signal_name = _TIMERS[self.clock]
+        self._started = time.perf_counter()
+        if hasattr(signal, timer_name) and threading.current_thread() is threading.main_thread():
+            self.mode = 'signal'
+            signum = getattr(signal, signal_name)
+            self._previous_handler = signal.signal(signum, self._handle_signal)
+            signal.setitimer(getattr(signal, timer_name), self.interval, self.interval)
+        else:
+            self.mode = 'thread'
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run_thread, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling and restore the previous signal handler."""
+        if self.mode == 'signal':
+            timer_name, signal_name = _TIMERS[self.clock]
+            signal.setitimer(getattr(signal, timer_name), 0)
+            signal.signal(getattr(signal, signal_name), self._previous_handler or signal.SIG_DFL)
+        elif self.mode == 'thread':
+            self._stop_event.set()
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+        self._thread_names.update({thread.ident: thread.name for thread in threading.enumerate()})
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    @staticmethod
+    def frame_name(code) -> str:
+        """Display name of a code object: function (file:line)."""
+        filename = code.co_filename
+        try:
+            relative = os.path.relpath(filename)
+            filename = filename if relative.startswith('..') else relative
+        except ValueError:  # different drive on Windows
+            pass
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def _thread_name(self, thread_id: int) -> str:
+        return self._thread_names.get(thread_id, f"thread-{thread_id}")
+
+    def collapsed(self) -> List[str]:
+        """Stacks in collapsed format ('thread;outer;...;inner count'), heaviest first."""
+        lines = []
+        for (thread_id, stack), count in sorted(self._counts.items(), key=lambda item: -item[1]):
+            frames = [self._thread_name(thread_id).replace(';', ':')]
+            frames += [self.frame_name(code).replace(';', ':') for code in reversed(stack)]
+            lines.append(f"{';'.join(frames)} {count}")
+        return lines
+
+    def speedscope(self, name: str = 'cli') -> Dict[str, Any]:
+        """Profile in speedscope's file format, one sampled profile per thread."""
+        frame_index: Dict[Any, int] = {}
+        frames: List[Dict[str, Any]] = []
+        profiles: Dict[int, Dict[str, Any]] = {}
+        for (thread_id, stack), count in self._counts.items():
+            indexes = []
+            for code in reversed(stack):
+                if code not in frame_index:
+                    frame_index[code] = len(frames)
+                    frames.append({'name': code.co_name, 'file': code.co_filename, 'line': code.co_firstlineno})
+                indexes.append(frame_index[code])
+            profile = profiles.setdefault(thread_id, {
+                'type': 'sampled', 'name': self._thread_name(thread_id), 'unit': 'seconds',
+                'startValue': 0, 'endValue': 0, 'samples': [], 'weights': []})
+            profile['samples'].append(indexes)
+            profile['weights'].append(count * self.interval)
+            profile['endValue'] += count * self.interval
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'cli sampling profiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': list(profiles.values())
+        }
+
+    def top_functions(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Functions by samples as the innermost frame (self) and anywhere on the stack (total)."""
+        own: Dict[Any, int] = {}
+        total: Dict[Any, int] = {}
+        for (_, stack), count in self._counts.items():
+            if stack:
+                own[stack[0]] = own.get(stack[0], 0) + count
+            for code in set(stack):
+                total[code] = total.get(code, 0) + count
+        samples = max(self.samples, 1)
+        ranked = sorted(total, key=lambda code: (-own.get(code, 0), -total[code]))[:limit]
+        return [{'function': self.frame_name(code),
+                 'self_percent': round(100 * own.get(code, 0) / samples, 1),
+                 'total_percent': round(100 * total[code] / samples, 1)} for code in ranked]
+
+    def save(self, project_root: str, label: str) -> Dict[str, str]:
+        """Write speedscope and collapsed-stack files under .perf-history/profiles.
+
+        Returns:
+            Dict[str, str]: Paths of the 'speedscope' and 'collapsed' files
+        """
+        directory = os.path.join(project_root, PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}")
+        paths = {'speedscope': f"{base}.speedscope.json", 'collapsed': f"{base}.collapsed.txt"}
+        with open(paths['speedscope'], 'w') as f:
+            json.dump(self.speedscope(label), f)
+        with open(paths['collapsed'], 'w') as f:
+            f.write('\n'.join(self.collapsed()) + '\n')
+        return paths
+
+
+def format_top(profiler: SamplingProfiler, limit: int = 15) -> List[str]:
+    """Printable table of the hottest functions."""
+    lines = [f"{profiler.samples} samples over {profiler.elapsed:.2f}s ({profiler.clock} clock, {profiler.mode} mode)",
+             f"{'self%':>6} {'total%':>7}  function"]
+    for row in profiler.top_functions(limit):
+        lines.append(f"{row['self_percent']:>6.1f} {row['total_percent']:>7.1f}  {row['function']}")
+    return lines
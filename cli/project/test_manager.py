@@ -6,6 +6,7 @@ import subprocess
 import yaml
 from typing import List, Dict, Optional
 from datetime import datetime
+from .process_tracker import ProcessTreeTracker, format_stats, record_command_stats
 
 class TestManager:
     """Handles testing operations including integration tests, test data, and reporting."""
@@ -15,12 +16,26 @@ class TestManager:
         self.test_data_dir = os.path.join(self.project_root, "test/data")
         self.fixtures_dir = os.path.join(self.test_data_dir, "fixtures")
         self.mocks_dir = os.path.join(self.test_data_dir, "mocks")
+        self.last_command_stats = {}
         self.reports_dir = os.path.join(self.project_root, "test/reports")
 
         # Create necessary directories
         for directory in [self.test_data_dir, self.fixtures_dir, self.mocks_dir, self.reports_dir]:
             os.makedirs(directory, exist_ok=True)
 
+    def _stream_output(self, process: subprocess.Popen, label: str) -> None:
+        """Stream a process's output in real time while tracking its process tree."""
+        with ProcessTreeTracker(process.pid, label=label) as tracker:
+            while True:
+                output = process.stdout.readline()
+                if output == '' and process.poll() is not None:
+                    break
+                if output:
+                    print(output.strip())
+        self.last_command_stats = tracker.stats
+        record_command_stats(self.project_root, tracker.stats)
+        print(f"{self.ui.theme.COLORS['INFO']}{format_stats(tracker.stats)}{self.ui.theme.COLORS['ENDC']}")
+
     def get_testable_components(self) -> List[str]:
         """Get list of components with test files."""
         try:
@@ -66,13 +81,7 @@ class TestManager:
                 text=True
             )
 
-            # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            self._stream_output(process, f"npx jest {test_path}")
 
             return process.poll() == 0
 
@@ -100,13 +109,7 @@ class TestManager:
                 text=True
             )
 
-            # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            self._stream_output(process, "npx playwright test --debug")
 
             return process.poll() == 0
 
@@ -137,12 +140,7 @@ class TestManager:
                 text=True
             )
 
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            self._stream_output(process, test_command.split(' && ', 1)[1])
 
             return process.poll() == 0
 
@@ -290,12 +288,7 @@ class TestManager:
                     text=True
                 )
 
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        print(output.strip())
+                self._stream_output(process, "npm run test:coverage")
 
                 if process.poll() != 0:
                     return False
@@ -358,13 +351,7 @@ class TestManager:
                 text=True
             )
 
-            # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            self._stream_output(process, command.split(' && ', 1)[1])
 
             return process.poll() == 0
 
@@ -397,13 +384,7 @@ class TestManager:
                 text=True
             )
 
-            # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    print(output.strip())
+            self._stream_output(process, command.split(' && ', 1)[1])
 
             return process.poll() == 0
 
@@ -0,0 +1,123 @@
+"""Conversion between TypeScript object literals and Python data."""
+
+import json
+import re
+from typing import Any
+
+# Tokens that can appear inside a plain data literal (no expressions or interpolation)
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`(?:[^`\\$]|\\.)*`)
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,])
+""", re.VERBOSE | re.DOTALL)
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_$][\w$]*$")
+
+
+def _string_to_json(token: str) -> str:
+    """Re-quote a single, double or backtick quoted TS string as a JSON string."""
+    if token[0] == '"':
+        return token
+    parts = []
+    for piece in re.findall(r'\\.|"|[^\\"]+', token[1:-1], re.DOTALL):
+        if piece in ("\\'", "\\`"):
+            parts.append(piece[1])
+        elif piece == '"':
+            parts.append('\\"')
+        else:
+            parts.append(piece.replace('\n', '\\n'))
+    return '"' + ''.join(parts) + '"'
+
+
+def ts_literal_to_json(source: str) -> str:
+    """Convert a TypeScript object/array literal to JSON text.
+
+    Handles unquoted keys, single-quoted and backtick strings, comments and
+    trailing commas. Anything else (spreads, calls, template interpolation)
+    raises ValueError.
+    """
+    out = []
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise ValueError(f"Unsupported syntax at offset {pos}: {source[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        token = match.group()
+
+        if kind in ('ws', 'comment'):
+            continue
+        if kind == 'string':
+            out.append(_string_to_json(token))
+        elif kind == 'ident':
+            if token in ('true', 'false', 'null'):
+                out.append(token)
+            elif token == 'undefined':
+                out.append('null')
+            else:
+                # Bare identifiers are only valid as object keys
+                out.append(json.dumps(token))
+        elif kind == 'punct' and token in '}]' and out and out[-1] == ',':
+            out[-1] = token
+        else:
+            out.append(token)
+    return ''.join(out)
+
+
+def parse_ts_literal(source: str) -> Any:
+    """Parse a TypeScript object/array literal into Python data."""
+    return json.loads(ts_literal_to_json(source))
+
+
+def find_literal_end(source: str, start: int) -> int:
+    """Find the index just past the bracketed literal opening at `start`."""
+    depth = 0
+    pos = start
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise ValueError(f"Unsupported syntax at offset {pos}: {source[pos:pos + 20]!r}")
+        pos = match.end()
+        if match.lastgroup == 'punct':
+            if match.group() in '{[':
+                depth += 1
+            elif match.group() in '}]':
+                depth -= 1
+                if depth == 0:
+                    return pos
+    raise ValueError("Unterminated literal")
+
+
+def _ts_key(key: str) -> str:
+    """Render an object key, quoting it only when it is not a valid identifier."""
+    return key if _IDENTIFIER_RE.match(key) else json.dumps(key)
+
+
+def to_ts_literal(value: Any, indent: int = 2, level: int = 0) -> str:
+    """Serialize Python data as a TypeScript literal in the style of src/data.
+
+    Keys are unquoted where possible, strings use double quotes, and small
+    objects of scalars stay on one line (e.g. dosage ranges).
+    """
+    pad = ' ' * (indent * (level + 1))
+    closing_pad = ' ' * (indent * level)
+
+    if isinstance(value, dict):
+        if not value:
+            return '{}'
+        if not any(isinstance(v, (dict, list)) for v in value.values()):
+            inline = '{ ' + ', '.join(f"{_ts_key(k)}: {to_ts_literal(v)}" for k, v in value.items()) + ' }'
+            if len(inline) + len(pad) <= 80:
+                return inline
+        items = [f"{pad}{_ts_key(k)}: {to_ts_literal(v, indent, level + 1)}" for k, v in value.items()]
+        return '{\n' + ',\n'.join(items) + f',\n{closing_pad}}}'
+    if isinstance(value, list):
+        if not value:
+            return '[]'
+        items = [f"{pad}{to_ts_literal(item, indent, level + 1)}" for item in value]
+        return '[\n' + ',\n'.join(items) + f',\n{closing_pad}]'
+    return json.dumps(value, ensure_ascii=False)
@@ -0,0 +1,60 @@
+"""Tests for regression detection in the benchmark history."""
+
+import subprocess
+import tempfile
+import unittest
+
+from cli.project.benchmark_history import (DEFAULT_TOLERANCE, BenchmarkHistory, compare_samples,
+                                           mann_whitney_greater)
+
+
+def _git(path, *args):
+    return subprocess.run(['git', *args], cwd=path, capture_output=True, text=True, check=True).stdout.strip()
+
+
+class CompareSamplesTest(unittest.TestCase):
+
+    def test_rank_test_cannot_reach_significance_with_one_sample(self):
+        self.assertGreater(mann_whitney_greater([1.0, 1.1, 1.2, 1.3, 1.4], [10.0]), 0.05)
+
+    def test_one_sample_per_commit_regression_is_flagged(self):
+        result = compare_samples([1.0, 1.1, 1.2, 1.3, 1.4], [10.0], DEFAULT_TOLERANCE)
+        self.assertEqual(result['method'], 'robust-z')
+        self.assertTrue(result['regression'])
+
+    def test_one_sample_within_baseline_noise_is_not_flagged(self):
+        result = compare_samples([1.0, 1.1, 1.2, 1.3, 1.4], [1.3], DEFAULT_TOLERANCE)
+        self.assertFalse(result['regression'])
+
+    def test_higher_is_better_drop_is_flagged(self):
+        tolerance = {'tolerance': 0.05, 'higher_is_better': True}
+        self.assertTrue(compare_samples([100, 101, 99, 100, 102], [50], tolerance)['regression'])
+        self.assertFalse(compare_samples([100, 101, 99, 100, 102], [150], tolerance)['regression'])
+
+    def test_many_samples_use_the_rank_test(self):
+        result = compare_samples([1.0, 1.1, 1.2, 1.3, 1.4] * 2, [2.0, 2.1, 2.2, 2.3, 2.4], DEFAULT_TOLERANCE)
+        self.assertEqual(result['method'], 'mann-whitney')
+        self.assertTrue(result['regression'])
+
+
+class DetectRegressionsTest(unittest.TestCase):
+
+    def test_single_sample_series_regression_found_at_its_commit(self):
+        with tempfile.TemporaryDirectory() as project:
+            _git(project, 'init', '-q')
+            _git(project, 'config', 'user.email', 'test@example.com')
+            _git(project, 'config', 'user.name', 'test')
+            history = BenchmarkHistory(project)
+            values = [10.0, 10.2, 9.9, 10.1, 10.0, 15.0]
+            for index, value in enumerate(values):
+                _git(project, 'commit', '-q', '--allow-empty', '-m', f"commit {index}")
+                history.record({'build.total_seconds': [value]}, commit=_git(project, 'rev-parse', 'HEAD'))
+
+            regressions = history.detect_regressions()
+            self.assertEqual(len(regressions), 1)
+            self.assertEqual(regressions[0]['first_commit'], _git(project, 'rev-parse', 'HEAD'))
+            self.assertTrue(regressions[0]['present_at_head'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ class StatusBar:
         self.ui = ui
         self.message_queue = queue.Queue()
         self.current_status = ""
+        self._progress_line = ""
         self.start_time = datetime.now()
         self._stop_event = threading.Event()
         self._thread = threading.Thread(target=self._update_loop, daemon=True)
@@ -20,6 +21,25 @@ class StatusBar:
         """Update status bar with a new message."""
         self.message_queue.put((message, duration))
 
+    def set_progress(self, message: str) -> None:
+        """Show a live progress message immediately, replacing the current one.
+
+        Unlike update(), nothing is queued, so per-item progress from long
+        batch jobs never backs up behind timed messages. The line is redrawn
+        in place; call end_progress() before printing anything else.
+        """
+        self.current_status = message
+        line = message[:max(self.ui.terminal_width - 1, 1)]
+        print(f"\r{self.ui.theme.COLORS['SECONDARY']}{line:<{len(self._progress_line)}}{self.ui.theme.COLORS['ENDC']}",
+              end='', flush=True)
+        self._progress_line = line
+
+    def end_progress(self) -> None:
+        """Finish the in-place progress line so later output starts on a new line."""
+        if self._progress_line:
+            print()
+            self._progress_line = ""
+
     def _update_loop(self) -> None:
         """Background loop for status updates."""
         while not self._stop_event.is_set():
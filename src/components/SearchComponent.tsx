@@ -1,5 +1,5 @@
 import React, { useState } from "react";
-import { compounds } from "../data/compounds";
+import { compoundIndex } from "../data/compounds";
 import { getPath } from "../utils/paths";
 
 interface Props {
@@ -25,7 +25,7 @@ function SearchComponent({ placeholder = "Search..." }: Props) {
     setSearchTerm(term);
     console.log('Search term:', term);
     if (term.length > 0) {
-      const results = compounds.filter((compound) =>
+      const results = compoundIndex.filter((compound) =>
         compound.name.toLowerCase().includes(term) ||
         compound.description.toLowerCase().includes(term)
       );
@@ -184,3 +184,13 @@ export const compounds: Compound[] = [
     ],
   },
 ];
+
+// Same API as the sharded src/data/compounds/index.ts, so pages work with either layout
+export type CompoundSummary = Pick<Compound, 'name' | 'slug' | 'category' | 'description' | 'halfLife' | 'detectionTime' | 'anabolicRating' | 'androgenicRating'>;
+
+export const compoundIndex: CompoundSummary[] = compounds;
+
+export function loadCompound(slug: string): Promise<Compound> | undefined {
+  const compound = compounds.find((c) => c.slug === slug);
+  return compound ? Promise.resolve(compound) : undefined;
+}